@@ -5,6 +5,8 @@ import json
 from datetime import datetime
 import os
 
+import roster
+
 # 페이지 설정
 st.set_page_config(
     page_title="사원 평가 시스템",
@@ -16,13 +18,17 @@ st.set_page_config(
 # 데이터 로드 함수
 @st.cache_data
 def load_data():
-    """데이터 로드 및 전처리"""
+    """데이터 로드 및 전처리 (roster 스냅샷 경유)"""
     try:
         # 기본 데이터 로드
-        base_data = pd.read_csv('basedata.csv', encoding='cp949')
+        base_data = roster.load_table('basedata.csv')
+        if base_data is None:
+            raise FileNotFoundError('basedata.csv')
         
         # 직급별 역할 정의 로드
-        jikkeup_data = pd.read_csv('Jikkeup.csv', encoding='cp949')
+        jikkeup_data = roster.get_jikkeup()
+        if jikkeup_data is None:
+            raise FileNotFoundError('Jikkeup.csv')
         
         return base_data, jikkeup_data
     except Exception as e:
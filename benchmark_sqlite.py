@@ -0,0 +1,94 @@
+"""SQLite 저장소 프로필별 동시 평가 저장(submit_evaluation) 처리량 비교
+
+Gunicorn 워커처럼 여러 프로세스가 같은 DB 파일에 임시저장/조회를 동시에 보내고,
+프로필(legacy: 롤백 저널, wal: WAL + busy_timeout)별 처리량과 실패 건수를 출력한다.
+운영 DB(evaluation.db)는 건드리지 않고 임시 디렉터리의 DB를 사용한다.
+
+    python benchmark_sqlite.py [워커 수=4] [워커당 저장 횟수=200]
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+PROFILES = ('legacy', 'wal')
+# 저장 사이사이에 끼워 넣는 조회 비율 (저장 N회마다 get_saved_evaluation 1회)
+READ_EVERY = 3
+
+
+def run_worker(worker_index, requests_count, start_at):
+    """한 워커 프로세스: 평가자 세션으로 submit_evaluation을 반복 호출"""
+    import eva
+
+    client = eva.app.test_client()
+    with client.session_transaction() as session:
+        session['user_type'] = '평가자(임원)'
+        session['user_data'] = {'id': f'bench{worker_index}'}
+
+    while time.time() < start_at:
+        time.sleep(0.001)
+
+    ok = 0
+    failed = 0
+    started = time.perf_counter()
+    for i in range(requests_count):
+        response = client.post('/submit_evaluation', json={
+            'evaluatee_id': str(i % 30),
+            'evaluation_type': 'manager',
+            'scores': {'score': i},
+            'comments': f'benchmark {worker_index}-{i}',
+        })
+        if response.status_code == 200 and response.get_json().get('success'):
+            ok += 1
+        else:
+            failed += 1
+        if i % READ_EVERY == 0:
+            client.get('/get_saved_evaluation/manager')
+    elapsed = time.perf_counter() - started
+    print(json.dumps({'ok': ok, 'failed': failed, 'elapsed': elapsed}))
+
+
+def run_profile(profile, workers, requests_count):
+    """임시 DB를 새로 만들고 프로필을 적용해 워커들을 동시에 실행"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        env = dict(os.environ, SQLITE_PATH=os.path.join(tmp_dir, 'benchmark.db'), SQLITE_PROFILE=profile)
+        env.pop('DATABASE_URL', None)
+        # 스키마 생성은 측정에서 제외
+        subprocess.run(
+            [sys.executable, '-c', 'import eva\nwith eva.app.app_context(): eva.init_db()'],
+            env=env, check=True, capture_output=True,
+        )
+        start_at = time.time() + 3
+        processes = [
+            subprocess.Popen(
+                [sys.executable, __file__, '--worker', str(index), str(requests_count), str(start_at)],
+                env=env, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True,
+            )
+            for index in range(workers)
+        ]
+        results = []
+        for process in processes:
+            output = process.communicate()[0].strip().splitlines()
+            results.append(json.loads(output[-1]) if output else {'ok': 0, 'failed': requests_count, 'elapsed': 0})
+
+    ok = sum(result['ok'] for result in results)
+    failed = sum(result['failed'] for result in results)
+    wall = max(result['elapsed'] for result in results) or 1
+    print(f"{profile:>6}: 저장 {ok}건 성공 / {failed}건 실패, {wall:.2f}초, {ok / wall:.0f}건/초")
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == '--worker':
+        run_worker(int(sys.argv[2]), int(sys.argv[3]), float(sys.argv[4]))
+        return
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    requests_count = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    print(f"워커 {workers}개 x 저장 {requests_count}회 (저장 {READ_EVERY}회마다 조회 1회)")
+    for profile in PROFILES:
+        run_profile(profile, workers, requests_count)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,143 @@
+"""평가 주기(cycle) 관리와 지난 주기 보관(archive)
+
+evaluation_data / evaluation_scores / performance_data에는 활성 주기의 행만 둔다.
+새 주기를 시작하면 한 트랜잭션 안에서 현재 주기의 행을 *_archive 테이블로 옮기고
+주기를 archived로 닫은 뒤 새 주기를 active로 등록한다. 그래서 요청 처리 중의 조회는
+주기 조건 없이도 활성 주기만 보고, 작업 테이블 크기는 한 주기 분량으로 유지된다.
+지난 주기는 보관 테이블에서 주기별로 조회한다 (/admin/cycles, ?cycle=).
+평가 데이터 초기화도 지우기 전에 활성 주기의 평가를 별도 보관 주기로 옮겨 이력을 남긴다.
+
+    flask --app eva start-cycle 2026
+
+    EVALUATION_CYCLE   첫 주기 이름 (마이그레이션 시 기존 행에 기록, 기본값: 올해 연도)
+"""
+import os
+from datetime import datetime
+
+import queries
+
+
+def initial_cycle_name():
+    """첫 주기 이름"""
+    return os.environ.get('EVALUATION_CYCLE') or str(datetime.now().year)
+
+
+def active_cycle(cursor):
+    """활성 주기 이름 (없으면 None)"""
+    queries.execute(cursor, 'cycle_active')
+    row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def is_archived(cursor, cycle):
+    """보관된 지난 주기인지 여부"""
+    queries.execute(cursor, 'cycle_by_name', (cycle,))
+    row = cursor.fetchone()
+    return row is not None and row[0] == 'archived'
+
+
+def _begin(conn, cursor, postgresql):
+    """주기 테이블과 작업 테이블에 쓰기를 막고 트랜잭션 시작 (읽기는 허용)"""
+    if postgresql:
+        conn.autocommit = False
+        cursor.execute('LOCK TABLE evaluation_cycles, evaluation_data, evaluation_scores, performance_data IN EXCLUSIVE MODE')
+    else:
+        conn.isolation_level = None
+        cursor.execute('BEGIN IMMEDIATE')
+
+
+def start_cycle(conn, postgresql, new_cycle):
+    """현재 주기를 보관 테이블로 옮기고 new_cycle을 활성 주기로 시작. (닫은 주기, 옮긴 평가 수, 옮긴 실적 수) 반환"""
+    new_cycle = str(new_cycle).strip()
+    if not new_cycle:
+        raise ValueError('주기 이름이 비어 있습니다.')
+    cursor = conn.cursor()
+    # 보관 중에 이전 주기로 저장되는 행이 없도록 한다
+    _begin(conn, cursor, postgresql)
+    try:
+        queries.execute(cursor, 'cycle_by_name', (new_cycle,))
+        if cursor.fetchone() is not None:
+            raise ValueError(f'이미 있는 주기입니다: {new_cycle}')
+        closing_cycle = active_cycle(cursor)
+        evaluation_count = performance_count = 0
+        if closing_cycle is not None:
+            queries.execute(cursor, 'cycle_archive_evaluations', (closing_cycle,))
+            evaluation_count = cursor.rowcount
+            queries.execute(cursor, 'cycle_archive_scores')
+            queries.execute(cursor, 'cycle_archive_performance', (closing_cycle,))
+            performance_count = cursor.rowcount
+            queries.execute(cursor, 'evaluation_scores_clear')
+            queries.execute(cursor, 'evaluation_clear')
+            queries.execute(cursor, 'performance_clear')
+            queries.execute(cursor, 'cycle_close', (closing_cycle,))
+        queries.execute(cursor, 'cycle_insert', (new_cycle,))
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        if not postgresql:
+            conn.isolation_level = ''
+    print(f"평가 주기 시작: {new_cycle} (보관: {closing_cycle or '없음'}, 평가 {evaluation_count}건, 실적 {performance_count}건)")
+    return closing_cycle, evaluation_count, performance_count
+
+
+def reset_evaluations(conn, postgresql):
+    """활성 주기의 평가(항목별 점수 포함)를 '{주기} 초기화 {일시}'라는 보관 주기로 옮긴 뒤 비운다.
+    활성 주기와 실적 데이터는 그대로 두고, 옮긴 평가는 지난 주기처럼 조회/내보내기할 수 있다.
+    (보관 주기 이름, 옮긴 평가 수) 반환"""
+    cursor = conn.cursor()
+    _begin(conn, cursor, postgresql)
+    try:
+        current = active_cycle(cursor) or initial_cycle_name()
+        snapshot = f"{current} 초기화 {datetime.now().strftime('%Y%m%d-%H%M%S')}"
+        queries.execute(cursor, 'cycle_by_name', (snapshot,))
+        if cursor.fetchone() is not None:
+            raise ValueError(f'이미 있는 주기입니다: {snapshot}')
+        queries.execute(cursor, 'cycle_insert_archived', (snapshot,))
+        queries.execute(cursor, 'cycle_snapshot_evaluations', (snapshot,))
+        evaluation_count = cursor.rowcount
+        queries.execute(cursor, 'cycle_archive_scores')
+        queries.execute(cursor, 'evaluation_scores_clear')
+        queries.execute(cursor, 'evaluation_clear')
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        if not postgresql:
+            conn.isolation_level = ''
+    print(f"평가 데이터 초기화: {current} (보관: {snapshot}, 평가 {evaluation_count}건)")
+    return snapshot, evaluation_count
+
+
+def _summary(row):
+    count, final_count, average, performance_count = row
+    return {
+        'evaluation_count': count or 0,
+        'final_count': final_count or 0,
+        'average_score': round(float(average), 2) if average is not None else None,
+        'performance_count': performance_count or 0,
+    }
+
+
+def list_cycles(cursor):
+    """주기 목록과 주기별 평가/실적 건수, 평균 점수 (연도별 비교용)"""
+    queries.execute(cursor, 'cycle_all')
+    cycles = [{
+        'cycle': cycle,
+        'status': status,
+        'started_at': str(started_at) if started_at is not None else None,
+        'closed_at': str(closed_at) if closed_at is not None else None,
+    } for cycle, status, started_at, closed_at in cursor.fetchall()]
+
+    queries.execute(cursor, 'cycle_archive_summary')
+    archived = {row[0]: _summary(row[1:]) for row in cursor.fetchall()}
+    queries.execute(cursor, 'cycle_active_summary')
+    active = _summary(cursor.fetchone())
+    for item in cycles:
+        if item['status'] == 'active':
+            item.update(active)
+        else:
+            item.update(archived.get(item['cycle'], _summary((0, 0, None, 0))))
+    return cycles
@@ -0,0 +1,254 @@
+"""DB 연결 풀 (PostgreSQL: 크기 제한 풀, SQLite: 스레드별 상시 연결)
+
+get_db_connection()이 요청마다 새로 연결(PostgreSQL은 TLS/인증 포함)하던 비용을 없앤다.
+반환되는 PooledConnection은 원래 연결과 같은 방식으로 쓰고 close()하면 되며,
+close()는 연결을 닫지 않고 커밋되지 않은 작업을 롤백한 뒤 풀에 돌려준다.
+cursor()는 실행 시간을 집계하는 query_stats.InstrumentedCursor를 반환한다.
+
+Gunicorn 워커가 fork되면 부모 프로세스의 연결은 자식에서 쓰지 않고 새로 연결한다.
+
+SQLite 연결은 만들 때 저장소 프로필(PRAGMA 묶음)을 적용한다. 기본 'wal' 프로필은
+WAL 저널로 읽기와 쓰기가 서로 막지 않게 하고, busy_timeout 동안 잠금을 기다려
+여러 워커가 동시에 저장해도 "database is locked" 오류가 나지 않도록 한다.
+
+    DB_POOL_SIZE      PostgreSQL 워커당 최대 연결 수 (기본값: 5)
+    DB_POOL_TIMEOUT   연결이 모두 사용 중일 때 대기 시간(초, 기본값: 30)
+    SQLITE_PROFILE    SQLite 저장소 프로필: wal(기본) / legacy(롤백 저널, 이전 동작)
+    SQLITE_JOURNAL_MODE, SQLITE_BUSY_TIMEOUT_MS, SQLITE_SYNCHRONOUS,
+    SQLITE_MMAP_SIZE, SQLITE_CACHE_SIZE    프로필 값 개별 지정
+"""
+import os
+import sqlite3
+import threading
+
+import query_stats
+
+POOL_SIZE = max(1, int(os.environ.get('DB_POOL_SIZE', '5')))
+POOL_TIMEOUT = float(os.environ.get('DB_POOL_TIMEOUT', '30'))
+
+# SQLite 저장소 프로필 (None이면 해당 PRAGMA를 건드리지 않음)
+SQLITE_PROFILES = {
+    'wal': {
+        'journal_mode': 'WAL',
+        'busy_timeout_ms': 10000,
+        # WAL에서는 NORMAL이어도 커밋 순서가 보장되고 전원 장애 시 마지막 커밋만 잃을 수 있다
+        'synchronous': 'NORMAL',
+        'mmap_size': 256 * 1024 * 1024,
+        # 음수는 KiB 단위 (16MB)
+        'cache_size': -16000,
+    },
+    'legacy': {
+        'journal_mode': 'DELETE',
+        # sqlite3.connect 기본 대기 시간(5초)과 같다
+        'busy_timeout_ms': 5000,
+        'synchronous': None,
+        'mmap_size': None,
+        'cache_size': None,
+    },
+}
+
+
+def sqlite_profile():
+    """SQLITE_PROFILE과 개별 환경변수를 합친 SQLite 저장소 설정"""
+    name = os.environ.get('SQLITE_PROFILE', 'wal').lower()
+    profile = dict(SQLITE_PROFILES.get(name, SQLITE_PROFILES['wal']))
+    overrides = {
+        'journal_mode': os.environ.get('SQLITE_JOURNAL_MODE'),
+        'busy_timeout_ms': os.environ.get('SQLITE_BUSY_TIMEOUT_MS'),
+        'synchronous': os.environ.get('SQLITE_SYNCHRONOUS'),
+        'mmap_size': os.environ.get('SQLITE_MMAP_SIZE'),
+        'cache_size': os.environ.get('SQLITE_CACHE_SIZE'),
+    }
+    for key, value in overrides.items():
+        if value:
+            profile[key] = value if key in ('journal_mode', 'synchronous') else int(value)
+    return profile
+
+
+def _connect_sqlite(path):
+    """저장소 프로필을 적용한 SQLite 연결"""
+    profile = sqlite_profile()
+    conn = sqlite3.connect(path, timeout=profile['busy_timeout_ms'] / 1000)
+    # journal_mode는 DB 파일에 기록되므로 다른 워커가 이미 바꿨어도 같은 값을 다시 설정하면 된다
+    if profile['journal_mode']:
+        conn.execute(f"PRAGMA journal_mode = {profile['journal_mode']}")
+    if profile['synchronous']:
+        conn.execute(f"PRAGMA synchronous = {profile['synchronous']}")
+    if profile['mmap_size'] is not None:
+        conn.execute(f"PRAGMA mmap_size = {int(profile['mmap_size'])}")
+    if profile['cache_size'] is not None:
+        conn.execute(f"PRAGMA cache_size = {int(profile['cache_size'])}")
+    return conn
+
+
+class PooledConnection:
+    """풀에서 빌려온 연결. close() 시 풀에 반납하고 나머지 속성은 원래 연결에 위임"""
+    __slots__ = ('_conn', '_release')
+
+    def __init__(self, conn, release):
+        object.__setattr__(self, '_conn', conn)
+        object.__setattr__(self, '_release', release)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def __setattr__(self, name, value):
+        # conn.autocommit = False 같은 설정은 원래 연결에 적용 (반납 시 기본값으로 되돌린다)
+        setattr(self._conn, name, value)
+
+    def cursor(self, *args, **kwargs):
+        return query_stats.InstrumentedCursor(self._conn.cursor(*args, **kwargs))
+
+    @property
+    def closed(self):
+        """반납했으면 True"""
+        return self._release is None
+
+    def close(self):
+        release = self._release
+        if release is None:
+            return
+        object.__setattr__(self, '_release', None)
+        release(self._conn)
+
+
+_lock = threading.Lock()
+_pid = os.getpid()
+# PostgreSQL 풀
+_idle = []
+_slots = threading.BoundedSemaphore(POOL_SIZE)
+# SQLite 스레드별 연결: {'conn', 'path', 'depth'}
+_local = threading.local()
+# fork 전에 부모가 열어 둔 연결. 자식에서 해제되며 부모 연결이 종료되지 않도록 참조만 유지
+_inherited = []
+_stats = {
+    'postgresql_created': 0,
+    'postgresql_reused': 0,
+    'postgresql_discarded': 0,
+    'postgresql_wait_timeouts': 0,
+    'postgresql_in_use': 0,
+    'sqlite_created': 0,
+    'sqlite_reused': 0,
+}
+
+
+def _reset_after_fork():
+    """fork된 자식 프로세스에서 풀 상태를 초기화"""
+    global _lock, _pid, _slots, _local
+    _inherited.extend(_idle)
+    sqlite_state = getattr(_local, 'state', None)
+    if sqlite_state is not None:
+        _inherited.append(sqlite_state['conn'])
+    _idle.clear()
+    _lock = threading.Lock()
+    _pid = os.getpid()
+    _slots = threading.BoundedSemaphore(POOL_SIZE)
+    _local = threading.local()
+    for key in _stats:
+        _stats[key] = 0
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def _check_pid():
+    # register_at_fork를 지원하지 않는 환경 대비
+    if os.getpid() != _pid:
+        _reset_after_fork()
+
+
+def postgresql_connection(connect):
+    """PostgreSQL 풀에서 연결을 빌린다. 유휴 연결이 없으면 connect()로 새로 연결.
+    연결이 POOL_SIZE개 모두 사용 중이면 POOL_TIMEOUT초까지 기다린다."""
+    _check_pid()
+    slots = _slots
+    if not slots.acquire(timeout=POOL_TIMEOUT):
+        with _lock:
+            _stats['postgresql_wait_timeouts'] += 1
+        raise RuntimeError(f'DB 연결 풀 대기 시간 초과 ({POOL_SIZE}개 모두 사용 중)')
+    conn = None
+    try:
+        with _lock:
+            while _idle and conn is None:
+                candidate = _idle.pop()
+                if candidate.closed:
+                    _stats['postgresql_discarded'] += 1
+                else:
+                    conn = candidate
+            if conn is not None:
+                _stats['postgresql_reused'] += 1
+        if conn is None:
+            conn = connect()
+            with _lock:
+                _stats['postgresql_created'] += 1
+    except Exception:
+        slots.release()
+        raise
+    with _lock:
+        _stats['postgresql_in_use'] += 1
+    return PooledConnection(conn, lambda raw: _release_postgresql(raw, slots))
+
+
+def _release_postgresql(conn, slots):
+    if slots is not _slots:
+        # fork 이전에 빌린 연결은 이 프로세스의 풀에 돌려주지 않는다
+        return
+    reusable = not conn.closed
+    if reusable:
+        try:
+            # 커밋되지 않은 트랜잭션을 정리하고 autocommit 기본값으로 되돌린다
+            if not conn.autocommit:
+                conn.rollback()
+                conn.autocommit = True
+        except Exception:
+            reusable = False
+    with _lock:
+        _stats['postgresql_in_use'] -= 1
+        if reusable:
+            _idle.append(conn)
+        else:
+            _stats['postgresql_discarded'] += 1
+    if not reusable:
+        try:
+            conn.close()
+        except Exception:
+            pass
+    slots.release()
+
+
+def sqlite_connection(path):
+    """현재 스레드의 SQLite 연결을 빌린다 (스레드마다 한 번만 연결).
+    같은 스레드 안에서 중첩해서 빌리면 같은 연결을 공유하고, 마지막 반납 시에만 롤백한다."""
+    _check_pid()
+    state = getattr(_local, 'state', None)
+    if state is None or state['path'] != path:
+        if state is not None:
+            state['conn'].close()
+        state = {'conn': _connect_sqlite(path), 'path': path, 'depth': 0}
+        _local.state = state
+        with _lock:
+            _stats['sqlite_created'] += 1
+    else:
+        with _lock:
+            _stats['sqlite_reused'] += 1
+    state['depth'] += 1
+    return PooledConnection(state['conn'], lambda raw: _release_sqlite(raw, state))
+
+
+def _release_sqlite(conn, state):
+    state['depth'] -= 1
+    if state['depth'] == 0 and conn.in_transaction:
+        # 커밋하지 않고 닫은 작업은 기존처럼 버린다
+        conn.rollback()
+
+
+def stats():
+    """풀 사용 현황"""
+    with _lock:
+        result = dict(_stats)
+        result['postgresql_idle'] = len(_idle)
+    result['postgresql_max'] = POOL_SIZE
+    result['sqlite_profile'] = sqlite_profile()
+    result['pid'] = os.getpid()
+    return result
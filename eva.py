@@ -1,84 +1,98 @@
-from flask import Flask, render_template, request, redirect, url_for, session, flash, jsonify, make_response
-import pandas as pd
+# 기동 시간 측정 기준점을 잡기 위해 가장 먼저 import
+import startup
+
+import click
+from flask import Flask, render_template, request, redirect, url_for, session, flash, jsonify, send_file, g, has_app_context
 import json
 import os
+import time
 from datetime import datetime
-import sqlite3
-import io
 
-# Heroku PostgreSQL 지원
-try:
-    import psycopg2
-    from psycopg2.extras import RealDictCursor
-    HEROKU_MODE = True
-except ImportError:
-    HEROKU_MODE = False
+# pandas / psycopg2 / openpyxl은 필요한 라우트가 처음 실행될 때 startup.lazy_import로 불러온다
+import cycles
+import db_pool
+import excel_export
+import export_jobs
+import migrations
+import queries
+import query_stats
+import roster
+import runtime_config
+import scoring
+import write_queue
 
 app = Flask(__name__)
 app.secret_key = 'your-secret-key-here'
 
-def get_excluded_evaluatee_ids():
-    """환경변수 EXCLUDED_EVALUATEE_IDS(콤마 구분)에서 제외할 피평가자 ID 집합을 반환"""
-    raw = os.environ.get('EXCLUDED_EVALUATEE_IDS', '')
-    excluded_ids = set()
-    if raw:
-        for part in raw.split(','):
-            part = part.strip()
-            if not part:
-                continue
-            try:
-                excluded_ids.add(int(part))
-            except Exception:
-                # 잘못된 값은 무시
-                pass
-    return excluded_ids
-
-def get_all_excluded_evaluatee_ids():
-    """코드에 박힌 기본 제외 + 환경변수 설정 제외를 합쳐 반환"""
-    default_excluded = {11160147, 11960038, 12140051}
-    return default_excluded | get_excluded_evaluatee_ids()
-
-def get_excluded_evaluatee_names():
-    """환경변수 EXCLUDED_EVALUATEE_NAMES(콤마 구분)에서 제외할 피평가자 이름 집합을 반환"""
-    raw = os.environ.get('EXCLUDED_EVALUATEE_NAMES', '')
-    excluded_names = set()
-    if not raw:
-        return excluded_names
-    for part in raw.split(','):
-        name = part.strip()
-        if name:
-            excluded_names.add(name)
-    return excluded_names
+# 피평가자 제외 목록 등 런타임 설정: 기동 시 한 번 해석하고, SIGHUP 또는 /admin/reload_config로 다시 읽는다
+runtime_config.get_config()
+runtime_config.install_reload_signal()
 
-def get_db_connection():
-    """데이터베이스 연결 (Railway PostgreSQL 또는 로컬 SQLite)"""
-    if HEROKU_MODE and os.environ.get('DATABASE_URL'):
-        # Railway PostgreSQL
-        DATABASE_URL = os.environ.get('DATABASE_URL')
-        if DATABASE_URL.startswith('postgres://'):
-            DATABASE_URL = DATABASE_URL.replace('postgres://', 'postgresql://', 1)
-        conn = psycopg2.connect(DATABASE_URL)
-        # Postgres에서는 DDL이 반영되도록 autocommit 활성화
+@app.before_request
+def _bind_runtime_config():
+    # 한 요청 안에서는 같은 설정 스냅샷을 사용
+    g.runtime_config = runtime_config.get_config()
+
+# 로컬 SQLite 파일 경로 (저장소 PRAGMA 프로필은 db_pool.SQLITE_PROFILES / SQLITE_PROFILE 참고)
+SQLITE_PATH = os.environ.get('SQLITE_PATH', 'evaluation.db')
+
+# Heroku PostgreSQL 지원: DATABASE_URL이 있을 때 처음 연결하면서 드라이버를 불러온다
+_psycopg2_module = None
+
+def _psycopg2():
+    """psycopg2 모듈 (설치되어 있지 않으면 None)"""
+    global _psycopg2_module
+    if _psycopg2_module is None:
         try:
-            conn.autocommit = True
-        except Exception:
-            pass
-        return conn
+            _psycopg2_module = startup.lazy_import('psycopg2')
+        except ImportError:
+            _psycopg2_module = False
+    return _psycopg2_module or None
+
+def _connect_postgresql():
+    """Railway PostgreSQL 새 연결 (연결 풀이 부족할 때만 호출)"""
+    DATABASE_URL = os.environ.get('DATABASE_URL')
+    if DATABASE_URL.startswith('postgres://'):
+        DATABASE_URL = DATABASE_URL.replace('postgres://', 'postgresql://', 1)
+    conn = _psycopg2().connect(DATABASE_URL)
+    # Postgres에서는 DDL이 반영되도록 autocommit 활성화
+    try:
+        conn.autocommit = True
+    except Exception:
+        pass
+    return conn
+
+def get_db_connection():
+    """데이터베이스 연결 (Railway PostgreSQL 또는 로컬 SQLite).
+    연결 풀에서 빌려오며 conn.close()하면 풀에 반납된다."""
+    if is_postgresql():
+        conn = db_pool.postgresql_connection(_connect_postgresql)
     else:
         # 로컬 SQLite
-        return sqlite3.connect('evaluation.db')
+        conn = db_pool.sqlite_connection(SQLITE_PATH)
+    # 예외 등으로 close()하지 못한 연결은 요청이 끝날 때 반납
+    if has_app_context():
+        g.setdefault('db_connections', []).append(conn)
+    return conn
+
+@app.teardown_appcontext
+def _release_db_connections(exc):
+    for conn in g.pop('db_connections', ()):
+        conn.close()
+
+@app.before_request
+def _begin_query_stats():
+    # 이 요청에서 실행하는 쿼리를 라우트별로 집계 (/admin/query_stats)
+    query_stats.begin_request(request.endpoint)
+
+@app.teardown_request
+def _end_query_stats(exc):
+    query_stats.end_request()
 
 def is_postgresql():
     """PostgreSQL 사용 여부 확인"""
-    return HEROKU_MODE and os.environ.get('DATABASE_URL')
-
-def adapt_query(query: str) -> str:
-    """DB 드라이버별 플레이스홀더 변환.
-    SQLite: '?', PostgreSQL(psycopg2): '%s'
-    """
-    if is_postgresql():
-        return query.replace('?', '%s')
-    return query
+    # DATABASE_URL이 없으면 psycopg2를 import하지 않는다
+    return bool(os.environ.get('DATABASE_URL')) and _psycopg2() is not None
 
 def commit_db(conn):
     """데이터베이스 커밋"""
@@ -88,344 +102,262 @@ def commit_db(conn):
         # autocommit일 때는 commit이 필요 없음
         pass
 
-# 안전 초기화 도우미
-def safe_init_db():
-    try:
-        init_db()
-    except Exception as e:
-        print(f"safe_init_db error: {e}")
+# 스키마 마이그레이션은 배포/기동 시 한 번 실행한다 (gunicorn_config.on_starting, flask migrate, python eva.py).
+# Gunicorn 마스터가 이미 실행했으면 워커는 확인하지 않고, 그 외 실행 방식에서는 워커당 첫 요청에서 한 번 실행
+_db_initialized = os.environ.get('SCHEMA_MIGRATED') == '1'
+# 마이그레이션이 실패하면 이 시간(초)이 지난 뒤의 요청에서 다시 시도한다 (요청마다 DB에 부담을 주지 않도록)
+DB_INIT_RETRY_SECONDS = float(os.environ.get('DB_INIT_RETRY_SECONDS', '10'))
+_db_init_retry_at = 0.0
 
-# Flask 2.3+에서는 before_first_request가 deprecated되었으므로
-# 앱 시작 시 직접 초기화하거나 첫 요청 시 초기화
-_db_initialized = False
+# DB 초기화 없이 응답하는 엔드포인트 (Railway 헬스체크가 기동 직후 바로 성공하도록)
+HEALTH_ENDPOINTS = {'health_check', 'startup_report'}
 
 @app.before_request
 def _ensure_db_initialized():
-    global _db_initialized
+    global _db_initialized, _db_init_retry_at
     # 헬스체크는 DB 초기화 없이 통과
-    if request.endpoint == 'health_check':
+    if request.endpoint in HEALTH_ENDPOINTS:
         return
     
-    # 최초 한 번만 실행되도록 플래그 사용
-    if not _db_initialized:
+    # 성공할 때까지 실행 (실패하면 DB_INIT_RETRY_SECONDS 뒤의 요청에서 재시도)
+    if not _db_initialized and time.monotonic() >= _db_init_retry_at:
         try:
-            init_db()
+            with startup.timed('스키마 마이그레이션'):
+                init_db()
             _db_initialized = True
             print("Database initialized successfully")
         except Exception as e:
-            # 초기화 실패 시에도 앱이 죽지 않도록 로그만 남김
-            print(f"DB init error: {e}")
-            _db_initialized = True  # 실패해도 재시도 방지
-
-# 앱 로드 시 DB 초기화 시도 (Gunicorn preload 시에도 작동)
-# 하지만 실패해도 앱은 시작되도록 함
-try:
-    safe_init_db()
-    print("Database pre-initialized on app load")
-except Exception as e:
-    print(f"Pre-init DB error (will retry on first request): {e}")
-
-# 데이터 로드 함수들
+            # 초기화 실패 시에도 앱이 죽지 않도록 로그만 남기고, 잠시 뒤 다시 시도
+            _db_init_retry_at = time.monotonic() + DB_INIT_RETRY_SECONDS
+            print(f"DB init error: {e} ({DB_INIT_RETRY_SECONDS:g}초 뒤 재시도)")
+
+# 데이터 로드 함수들 (roster 모듈의 프로세스 공용 캐시 사용)
 def load_backdata():
     """backdata.csv 파일 로드"""
-    try:
-        df = pd.read_csv('backdata.csv', encoding='utf-8')
-        return df
-    except:
-        try:
-            df = pd.read_csv('backdata.csv', encoding='cp949')
-            return df
-        except Exception as e:
-            print(f"backdata 로드 오류: {e}")
-            # Railway 배포 시 CSV 파일이 없을 경우 빈 DataFrame 반환
-            return pd.DataFrame(columns=['id', 'password', 'name', 'team', 'position', 'grade'])
+    return roster.get_backdata()
 
 def load_evaluation_mappings():
     """평가자-피평가자 매핑 데이터 로드"""
-    mappings = {}
-    
-    # 평가자(팀장)_사원.csv
-    try:
-        df = pd.read_csv('평가자(팀장)_사원.csv', encoding='utf-8')
-        mappings['team_leader_employee'] = df
-    except:
-        try:
-            df = pd.read_csv('평가자(팀장)_사원.csv', encoding='cp949')
-            mappings['team_leader_employee'] = df
-        except:
-            mappings['team_leader_employee'] = pd.DataFrame(columns=['evaluaterid', 'evaluateeid'])
-    
-    # 평가자(팀장)_대리이상.csv
-    try:
-        df = pd.read_csv('평가자(팀장)_대리이상.csv', encoding='utf-8')
-        mappings['team_leader_manager'] = df
-    except:
-        try:
-            df = pd.read_csv('평가자(팀장)_대리이상.csv', encoding='cp949')
-            mappings['team_leader_manager'] = df
-        except:
-            mappings['team_leader_manager'] = pd.DataFrame(columns=['evaluaterid', 'evaluateeid'])
-    
-    # 평가자(팀장)_일반직.csv
-    try:
-        df = pd.read_csv('평가자(팀장)_일반직.csv', encoding='utf-8')
-        mappings['team_leader_general'] = df
-    except:
-        try:
-            df = pd.read_csv('평가자(팀장)_일반직.csv', encoding='cp949')
-            mappings['team_leader_general'] = df
-        except:
-            mappings['team_leader_general'] = pd.DataFrame(columns=['evaluaterid', 'evaluateeid'])
-    
-    # 평가자(임원)_팀장.csv
-    try:
-        df = pd.read_csv('평가자(임원)_팀장.csv', encoding='utf-8')
-        mappings['executive_team_leader'] = df
-    except:
-        try:
-            df = pd.read_csv('평가자(임원)_팀장.csv', encoding='cp949')
-            mappings['executive_team_leader'] = df
-        except:
-            mappings['executive_team_leader'] = pd.DataFrame(columns=['evaluaterid', 'evaluateeid'])
-    
-    # 평가자(임원)_팀원 관리직.csv
-    try:
-        df = pd.read_csv('평가자(임원)_팀원 관리직.csv', encoding='utf-8')
-        mappings['executive_manager'] = df
-    except:
-        try:
-            df = pd.read_csv('평가자(임원)_팀원 관리직.csv', encoding='cp949')
-            mappings['executive_manager'] = df
-        except:
-            mappings['executive_manager'] = pd.DataFrame(columns=['evaluaterid', 'evaluateeid'])
-    
-    # 평가자(임원)_팀원 일반직.csv
-    try:
-        df = pd.read_csv('평가자(임원)_팀원 일반직.csv', encoding='utf-8')
-        mappings['executive_general'] = df
-    except:
-        try:
-            df = pd.read_csv('평가자(임원)_팀원 일반직.csv', encoding='cp949')
-            mappings['executive_general'] = df
-        except:
-            mappings['executive_general'] = pd.DataFrame(columns=['evaluaterid', 'evaluateeid'])
-    
-    return mappings
+    return roster.get_evaluation_mappings()
 
 def load_jikkeup():
     """직급별 역할 정의 로드"""
-    try:
-        df = pd.read_csv('Jikkeup.csv', encoding='utf-8')
-        return df
-    except:
-        try:
-            df = pd.read_csv('Jikkeup.csv', encoding='cp949')
-            return df
-        except Exception as e:
-            print(f"Jikkeup 로드 오류: {e}")
-            return None
+    return roster.get_jikkeup()
+
+# 명단 조회 소스: 'csv'(기본, roster 캐시) 또는 'db'(import-roster로 적재한 employees/evaluation_assignments 테이블)
+ROSTER_SOURCE = os.environ.get('ROSTER_SOURCE', 'csv').lower()
+
+def _employee_from_db_row(row):
+    """employees 테이블 행을 직원 레코드로 변환 (CSV 명단과 같은 roster.Employee)"""
+    return roster.Employee(row[0], row[1], row[2], row[3], row[4], row[5], row[6])
+
+def find_employee(employee_id):
+    """사번으로 직원 조회 (없으면 None)"""
+    if ROSTER_SOURCE == 'db':
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        queries.execute(cursor, 'employee_by_id', (roster.normalize_id(employee_id),))
+        row = cursor.fetchone()
+        conn.close()
+        return _employee_from_db_row(row) if row else None
+    return roster.get_employee(employee_id)
+
+def find_evaluatees(mapping_key, evaluator_id):
+    """평가자에게 배정된 피평가자 직원 목록 (배정 순서 유지, 명단에 없는 사번은 제외)"""
+    if ROSTER_SOURCE == 'db':
+        # 배정 필터링과 이름/소속 보강을 인덱스 조인 한 번으로 처리
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        queries.execute(cursor, 'evaluatees_for_evaluator', (mapping_key, roster.normalize_id(evaluator_id)))
+        rows = cursor.fetchall()
+        conn.close()
+        return [_employee_from_db_row(row) for row in rows]
+    return roster.get_evaluatees(mapping_key, evaluator_id)
+
+def find_evaluator_ids(mapping_key, evaluatee_id):
+    """피평가자에게 배정된 평가자 사번 목록"""
+    if ROSTER_SOURCE == 'db':
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        queries.execute(cursor, 'evaluators_for_evaluatee', (mapping_key, roster.normalize_id(evaluatee_id)))
+        evaluator_ids = [row[0] for row in cursor.fetchall()]
+        conn.close()
+        return evaluator_ids
+    return list(roster.get_evaluator_ids(mapping_key, evaluatee_id))
+
+def enrich_employees(df, id_columns):
+    """df의 사번 컬럼마다 직원 이름/소속/직위/직급 컬럼을 붙인다 (roster.enrich 참고).
+    CSV 명단은 캐시된 직원 DataFrame과, DB 명단은 필요한 사번만 한 번에 조회해 merge한다"""
+    if ROSTER_SOURCE != 'db':
+        return roster.enrich(df, id_columns)
+    employee_ids = set()
+    for column in id_columns:
+        employee_ids.update(roster.normalize_id(employee_id) for employee_id in df[column].unique())
+    rows = []
+    if employee_ids:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        queries.execute(cursor, 'employees_by_ids', in_values=sorted(employee_ids))
+        rows = cursor.fetchall()
+        conn.close()
+    return roster.enrich(df, id_columns, roster.employee_frame(_employee_from_db_row(row) for row in rows))
+
+def find_team_member_ids(team):
+    """소속(팀)이 team인 직원 사번 목록"""
+    if ROSTER_SOURCE == 'db':
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        queries.execute(cursor, 'employee_ids_by_team', (team,))
+        member_ids = [str(row[0]) for row in cursor.fetchall()]
+        conn.close()
+        return member_ids
+    return [employee.id for employee in roster.get_employees() if str(employee.team) == team]
+
+def find_teams():
+    """전체 소속(팀) 이름 목록 (정렬)"""
+    if ROSTER_SOURCE == 'db':
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        queries.execute(cursor, 'employee_teams')
+        teams = [str(row[0]) for row in cursor.fetchall()]
+        conn.close()
+        return teams
+    return sorted({str(employee.team) for employee in roster.get_employees() if employee.team})
 
 # 데이터베이스 초기화
 def init_db():
-    """데이터베이스 초기화 (PostgreSQL 또는 SQLite)"""
+    """적용되지 않은 스키마 마이그레이션 실행 (PostgreSQL 또는 SQLite). 적용한 버전 목록 반환"""
     conn = get_db_connection()
+    try:
+        return migrations.migrate(conn, is_postgresql())
+    finally:
+        conn.close()
+
+def import_roster_to_db():
+    """backdata.csv와 평가자 매핑 CSV를 employees / evaluation_assignments 테이블로 일괄 적재 (기존 내용 교체)"""
+    employees = []
+    seen_ids = set()
+    for order, employee in enumerate(roster.get_employees()):
+        # 중복 사번은 첫 행만 사용 (CSV 조회와 동일)
+        if employee.id in seen_ids:
+            continue
+        seen_ids.add(employee.id)
+        employees.append((
+            employee.id, employee.password, employee.name, employee.team,
+            employee.position, employee.grade, employee.before_point, order
+        ))
+    if not employees:
+        raise ValueError('backdata.csv에 직원 데이터가 없어 가져오기를 중단합니다.')
     
-    if HEROKU_MODE and os.environ.get('DATABASE_URL'):
-        # PostgreSQL
-        cursor = conn.cursor()
-        
-        # 실적 데이터 테이블 (최대 10개 실적 지원)
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS performance_data (
-                id SERIAL PRIMARY KEY,
-                employee_id TEXT NOT NULL,
-                performance_order INTEGER NOT NULL,
-                project_name TEXT NOT NULL,
-                performance TEXT NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                is_finalized BOOLEAN DEFAULT FALSE,
-                UNIQUE(employee_id, performance_order)
-            )
-        ''')
-        
-        # 평가 데이터 테이블
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS evaluation_data (
-                id SERIAL PRIMARY KEY,
-                evaluator_id TEXT NOT NULL,
-                evaluatee_id TEXT NOT NULL,
-                evaluation_type TEXT NOT NULL,
-                scores TEXT,
-                comments TEXT,
-                is_final INTEGER DEFAULT 0,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        # 기존 테이블에 is_final 컬럼 추가 (없는 경우에만)
-        try:
-            cursor.execute('ALTER TABLE evaluation_data ADD COLUMN is_final INTEGER DEFAULT 0')
-        except psycopg2.errors.DuplicateColumn:
-            # 컬럼이 이미 존재하는 경우 무시
-            pass
-        
-        # 조직도 관련 테이블
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS departments (
-                id SERIAL PRIMARY KEY,
-                name TEXT NOT NULL,
-                leader_position TEXT,
-                parent_id INTEGER,
-                display_order INTEGER DEFAULT 0,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS department_employees (
-                id SERIAL PRIMARY KEY,
-                department_id INTEGER NOT NULL,
-                employee_id TEXT NOT NULL,
-                position TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (department_id) REFERENCES departments(id) ON DELETE CASCADE,
-                UNIQUE(department_id, employee_id)
-            )
-        ''')
-        
-        commit_db(conn)
+    assignments = []
+    for mapping_key in roster.MAPPING_FILES:
+        for order, (evaluator_id, evaluatee_id) in enumerate(roster.get_assignments(mapping_key)):
+            assignments.append((mapping_key, evaluator_id, evaluatee_id, order))
+    
+    conn = get_db_connection()
+    # 전체 교체를 하나의 트랜잭션으로 처리
+    if is_postgresql():
+        conn.autocommit = False
+    cursor = conn.cursor()
+    try:
+        queries.execute(cursor, 'roster_clear_assignments')
+        queries.execute(cursor, 'roster_clear_employees')
+        queries.executemany(cursor, 'roster_insert_employee', employees)
+        queries.executemany(cursor, 'roster_insert_assignment', assignments)
+        queries.execute(cursor, 'roster_insert_import', (len(employees), len(assignments)))
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
         conn.close()
-    else:
-        # SQLite
-        cursor = conn.cursor()
-        
-        # 실적 데이터 테이블 (최대 10개 실적 지원)
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS performance_data (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                employee_id TEXT NOT NULL,
-                performance_order INTEGER NOT NULL,  -- 실적 순서 (1-10)
-                project_name TEXT NOT NULL,
-                performance TEXT NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                is_finalized BOOLEAN DEFAULT FALSE,
-                UNIQUE(employee_id, performance_order)
-            )
-        ''')
-        
-        # 평가 데이터 테이블
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS evaluation_data (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                evaluator_id TEXT NOT NULL,
-                evaluatee_id TEXT NOT NULL,
-                evaluation_type TEXT NOT NULL,
-                scores TEXT,
-                comments TEXT,
-                is_final INTEGER DEFAULT 0,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        # 기존 테이블에 is_final 컬럼 추가 (없는 경우에만)
-        try:
-            cursor.execute('ALTER TABLE evaluation_data ADD COLUMN is_final INTEGER DEFAULT 0')
-        except sqlite3.OperationalError:
-            # 컬럼이 이미 존재하는 경우 무시
-            pass
-        
-        # 조직도 관련 테이블
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS departments (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL,
-                leader_position TEXT,
-                parent_id INTEGER,
-                display_order INTEGER DEFAULT 0,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (parent_id) REFERENCES departments(id) ON DELETE SET NULL
-            )
-        ''')
-        
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS department_employees (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                department_id INTEGER NOT NULL,
-                employee_id TEXT NOT NULL,
-                position TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (department_id) REFERENCES departments(id) ON DELETE CASCADE,
-                UNIQUE(department_id, employee_id)
-            )
-        ''')
-        
-        commit_db(conn)
-        commit_db(conn)
-    conn.close()
+    return len(employees), len(assignments)
 
-# 모듈 로드 시 DB 초기화는 지연시킨다. 실제 요청 시 또는 앱 시작 후에 준비됨
-print("Deferred DB init: will initialize on first request/startup")
+@app.cli.command('migrate')
+def migrate_command():
+    """스키마 마이그레이션 실행: flask --app eva migrate"""
+    applied = init_db()
+    print(f"스키마 버전 {migrations.LATEST_VERSION} (이번에 적용: {applied or '없음'})")
+
+@app.cli.command('import-roster')
+def import_roster_command():
+    """명단/평가자 배정 CSV를 DB로 가져오기: flask --app eva import-roster"""
+    init_db()
+    employee_count, assignment_count = import_roster_to_db()
+    print(f"직원 {employee_count}명, 평가자 배정 {assignment_count}건을 가져왔습니다.")
+
+def start_evaluation_cycle(new_cycle):
+    """현재 주기의 평가/실적을 보관 테이블로 옮기고 새 평가 주기 시작 (쓰기 큐에 남은 저장을 먼저 기록)"""
+    write_queue.flush()
+    conn = get_db_connection()
+    try:
+        return cycles.start_cycle(conn, is_postgresql(), new_cycle)
+    finally:
+        conn.close()
+
+@app.cli.command('start-cycle')
+@click.argument('cycle')
+def start_cycle_command(cycle):
+    """새 평가 주기 시작 (현재 주기는 보관): flask --app eva start-cycle 2026"""
+    init_db()
+    start_evaluation_cycle(cycle)
+
+# 모듈 로드 시에는 DB에 접속하지 않는다. 스키마는 기동 시(또는 워커의 첫 요청에서) 마이그레이션
+print("Deferred DB init: schema migrations run at startup or on first request")
 
 # 로그인 처리
 def authenticate_user(user_type, user_id, password):
     """사용자 인증"""
-    backdata = load_backdata()
-    if backdata is None:
-        return False, None
+    # 사번 인덱스(또는 employees 기본키)로 한 번만 조회
+    record = find_employee(user_id)
     
     # 피평가자 로그인 (A열: ID, B열: PW)
     if user_type == "피평가자":
-        user_data = backdata[backdata.iloc[:, 0] == int(user_id)]
-        if not user_data.empty and str(user_data.iloc[0, 1]) == password:
+        if record is not None and record.password == password:
             # 피평가자 로그인 제외: 기본 + 환경변수 설정
-            if int(user_id) in get_all_excluded_evaluatee_ids():
+            if int(user_id) in g.runtime_config.excluded_evaluatee_ids:
                 return False, None
             return True, {
                 'id': user_id,
-                'name': user_data.iloc[0, 2],
-                'team': user_data.iloc[0, 3],
-                'position': user_data.iloc[0, 4],
-                'grade': user_data.iloc[0, 5]
+                'name': record.name,
+                'team': record.team,
+                'position': record.position,
+                'grade': record.grade
             }
     
     # 평가자(팀장) 로그인
     elif user_type == "평가자(팀장)":
-        user_data = backdata[backdata.iloc[:, 0] == int(user_id)]
-        if not user_data.empty and str(user_data.iloc[0, 1]) == password:
+        if record is not None and record.password == password:
             return True, {
                 'id': user_id,
-                'name': user_data.iloc[0, 2],
-                'team': user_data.iloc[0, 3],
-                'position': user_data.iloc[0, 4],
-                'grade': user_data.iloc[0, 5]
+                'name': record.name,
+                'team': record.team,
+                'position': record.position,
+                'grade': record.grade
             }
     
     # 평가자(임원) 로그인
     elif user_type == "평가자(임원)":
-        user_data = backdata[backdata.iloc[:, 0] == int(user_id)]
-        if not user_data.empty and str(user_data.iloc[0, 1]) == password:
+        if record is not None and record.password == password:
             return True, {
                 'id': user_id,
-                'name': user_data.iloc[0, 2],
-                'team': user_data.iloc[0, 3],
-                'position': user_data.iloc[0, 4],
-                'grade': user_data.iloc[0, 5]
+                'name': record.name,
+                'team': record.team,
+                'position': record.position,
+                'grade': record.grade
             }
     
     # 관리자 로그인
     elif user_type == "관리자(인사담당자)":
         # 11210110 계정에 관리자 권한 부여
         if user_id == "11210110":
-            user_data = backdata[backdata.iloc[:, 0] == int(user_id)]
-            if not user_data.empty and str(user_data.iloc[0, 1]) == password:
+            if record is not None and record.password == password:
                 return True, {
                     'id': str(user_id),
-                    'name': str(user_data.iloc[0, 2]),
-                    'team': str(user_data.iloc[0, 3]),
-                    'position': str(user_data.iloc[0, 4]),
-                    'grade': str(user_data.iloc[0, 5])
+                    'name': str(record.name),
+                    'team': str(record.team),
+                    'position': str(record.position),
+                    'grade': str(record.grade)
                 }
         # 기존 admin 계정도 유지
         elif user_id == "admin" and password == "admin123":
@@ -475,9 +407,6 @@ def dashboard():
     """대시보드"""
     if 'user_type' not in session:
         return redirect(url_for('login'))
-    # 일부 환경에서 초기화 타이밍 이슈를 방지
-    safe_init_db()
-    
     user_type = session['user_type']
     user_data = session['user_data']
     
@@ -488,101 +417,12 @@ def dashboard():
     elif user_type == "평가자(임원)":
         return render_template('executive_dashboard.html', user_data=user_data)
     elif user_type == "관리자(인사담당자)":
-        # 관리자는 모든 평가 데이터 조회
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        # 모든 평가 데이터 조회
-        cursor.execute('''
-            SELECT ed.evaluator_id, ed.evaluatee_id, ed.evaluation_type, ed.scores, ed.comments, ed.created_at
-            FROM evaluation_data ed
-            ORDER BY ed.created_at DESC
-        ''')
-        
-        evaluations = cursor.fetchall()
-        
-        # 모든 실적 데이터 조회
-        cursor.execute('''
-            SELECT pd.employee_id, pd.performance_order, pd.project_name, pd.performance, pd.created_at, pd.is_finalized
-            FROM performance_data pd
-            ORDER BY pd.employee_id, pd.performance_order
-        ''')
-        
-        performance_data = cursor.fetchall()
-        
-        # 평가자별로 그룹화 (사용자 정보는 평가 데이터에서 직접 처리)
-        evaluator_stats = {}
-        for eval_data in evaluations:
-            evaluator_id = eval_data[0]
-            evaluatee_id = eval_data[1]
-            eval_type = eval_data[2]
-            scores = eval_data[3]
-            comments = eval_data[4]
-            created_at = eval_data[5]
-            
-            if evaluator_id not in evaluator_stats:
-                evaluator_stats[evaluator_id] = {
-                    'info': {
-                        'name': f'평가자 {evaluator_id}',
-                        'team': 'Unknown',
-                        'position': 'Unknown',
-                        'grade': 'Unknown'
-                    },
-                    'evaluations': {}
-                }
-            
-            if eval_type not in evaluator_stats[evaluator_id]['evaluations']:
-                evaluator_stats[evaluator_id]['evaluations'][eval_type] = []
-            
-            # 피평가자 정보를 더 자세히 표시 (실제 이름이 있다면 사용, 없으면 사번만)
-            evaluatee_name = f'사번 {evaluatee_id}'
-            # 실제 사용자 데이터가 있다면 이름을 가져올 수 있도록 확장 가능
-            
-            evaluator_stats[evaluator_id]['evaluations'][eval_type].append({
-                'evaluatee_id': evaluatee_id,
-                'evaluatee_name': evaluatee_name,
-                'evaluatee_team': 'Unknown',
-                'evaluatee_position': 'Unknown',
-                'scores': scores,
-                'comments': comments,
-                'created_at': created_at
-            })
-        
-        # 실적 데이터를 피평가자별로 그룹화
-        performance_stats = {}
-        for perf_data in performance_data:
-            employee_id = perf_data[0]
-            performance_order = perf_data[1]
-            project_name = perf_data[2]
-            performance = perf_data[3]
-            created_at = perf_data[4]
-            is_finalized = perf_data[5]
-            
-            if employee_id not in performance_stats:
-                performance_stats[employee_id] = {
-                    'info': {
-                        'name': f'피평가자 {employee_id}',
-                        'team': 'Unknown',
-                        'position': 'Unknown'
-                    },
-                    'performances': []
-                }
-            
-            performance_stats[employee_id]['performances'].append({
-                'order': performance_order,
-                'project_name': project_name,
-                'performance': performance,
-                'created_at': created_at,
-                'is_finalized': is_finalized
-            })
-        
-        commit_db(conn)
-        conn.close()
-        
-    return render_template('admin_dashboard.html', 
-                         user_data=user_data, 
-                         evaluator_stats=evaluator_stats,
-                         performance_stats=performance_stats)
+        # 평가/실적 목록은 페이지에서 /api/admin/evaluations, /api/admin/performances로 필요한 만큼 불러온다
+        return render_template('admin_dashboard.html',
+                             user_data=user_data,
+                             teams=find_teams(),
+                             evaluation_types=sorted(EVALUATION_TYPES))
+    return redirect(url_for('login'))
 
 @app.route('/performance', methods=['GET', 'POST'])
 def performance():
@@ -596,8 +436,7 @@ def performance():
         # 기존 실적 데이터 가져오기
         conn = get_db_connection()
         cursor = conn.cursor()
-        cursor.execute(adapt_query('SELECT performance_order FROM performance_data WHERE employee_id = ? AND is_finalized = FALSE'), 
-                      (user_data['id'],))
+        queries.execute(cursor, 'performance_draft_orders', (user_data['id'],))
         existing_orders = [row[0] for row in cursor.fetchall()]
         
         # 폼 데이터 처리
@@ -608,17 +447,10 @@ def performance():
             if project_name and performance:  # 둘 다 입력된 경우만 저장
                 if i in existing_orders:
                     # 기존 실적 업데이트
-                    cursor.execute(adapt_query('''
-                        UPDATE performance_data 
-                        SET project_name = ?, performance = ?, created_at = CURRENT_TIMESTAMP
-                        WHERE employee_id = ? AND performance_order = ? AND is_finalized = FALSE
-                    '''), (project_name, performance, user_data['id'], i))
+                    queries.execute(cursor, 'performance_update_draft', (project_name, performance, user_data['id'], i))
                 else:
                     # 새 실적 등록
-                    cursor.execute(adapt_query('''
-                        INSERT INTO performance_data (employee_id, performance_order, project_name, performance)
-                        VALUES (?, ?, ?, ?)
-                    '''), (user_data['id'], i, project_name, performance))
+                    queries.execute(cursor, 'performance_insert', (user_data['id'], i, project_name, performance))
         
         commit_db(conn)
         conn.close()
@@ -629,12 +461,7 @@ def performance():
     # 기존 실적 조회
     conn = get_db_connection()
     cursor = conn.cursor()
-    cursor.execute(adapt_query('''
-        SELECT performance_order, project_name, performance, created_at, is_finalized 
-        FROM performance_data 
-        WHERE employee_id = ? 
-        ORDER BY performance_order
-    '''), (user_data['id'],))
+    queries.execute(cursor, 'performance_by_employee', (user_data['id'],))
     performance_data = cursor.fetchall()
     commit_db(conn)
     conn.close()
@@ -668,8 +495,7 @@ def finalize_performance():
     cursor = conn.cursor()
     
     # 최소 1개 이상의 실적이 있는지 확인
-    cursor.execute(adapt_query('SELECT COUNT(*) FROM performance_data WHERE employee_id = ? AND is_finalized = FALSE'), 
-                  (user_data['id'],))
+    queries.execute(cursor, 'performance_draft_count', (user_data['id'],))
     count = cursor.fetchone()[0]
     
     if count == 0:
@@ -677,106 +503,62 @@ def finalize_performance():
         conn.close()
         return jsonify({'success': False, 'message': '최소 1개 이상의 실적을 작성해주세요.'})
     
-    cursor.execute(adapt_query('''
-        UPDATE performance_data 
-        SET is_finalized = TRUE
-        WHERE employee_id = ? AND is_finalized = FALSE
-    '''), (user_data['id'],))
+    queries.execute(cursor, 'performance_finalize', (user_data['id'],))
     
     commit_db(conn)
     conn.close()
     
     return jsonify({'success': True, 'message': '실적이 최종 등록되었습니다.'})
 
-@app.route('/evaluate/<evaluation_type>')
-def evaluate(evaluation_type):
-    """평가 페이지"""
-    if 'user_type' not in session or session['user_type'] not in ["평가자(팀장)", "평가자(임원)"]:
-        return redirect(url_for('login'))
-    
-    user_data = session['user_data']
-    mappings = load_evaluation_mappings()
-    backdata = load_backdata()
-    jikkeup = load_jikkeup()
+# (로그인 유형, 평가 유형) -> 평가자-피평가자 매핑 키
+EVALUATION_MAPPING_KEYS = {
+    ("평가자(팀장)", "employee"): 'team_leader_employee',
+    ("평가자(팀장)", "manager"): 'team_leader_manager',
+    ("평가자(팀장)", "general"): 'team_leader_general',
+    ("평가자(임원)", "team_leader"): 'executive_team_leader',
+    ("평가자(임원)", "manager"): 'executive_manager',
+    ("평가자(임원)", "general"): 'executive_general',
+}
+
+# (평가자 ID, 로그인 유형, 평가 유형) -> (버전, 평가 대상 목록)
+_worklist_cache = {}
+
+def get_roster_version():
+    """명단 버전 (CSV 모드: 원본 파일 시그니처, DB 모드: 마지막 import-roster 번호)"""
+    if ROSTER_SOURCE == 'db':
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        queries.execute(cursor, 'roster_version')
+        version = cursor.fetchone()[0]
+        conn.close()
+        return version
+    return roster.get_version()
+
+def _build_evaluation_worklist(evaluator_id, user_type, evaluation_type, mapping_key, config):
+    """평가 대상자 목록과 직급별 그룹을 만든다 (명단/제외 설정에만 의존)"""
+    excluded_ids = config.excluded_evaluatee_ids
+    # 이름 기반 제외도 지원
+    excluded_names = config.excluded_evaluatee_names
     
-    # 평가 대상자 목록 가져오기
     evaluatees = []
-    
-    if session['user_type'] == "평가자(팀장)":
-        if evaluation_type == "employee":
-            mapping_data = mappings['team_leader_employee']
-        elif evaluation_type == "manager":
-            mapping_data = mappings['team_leader_manager']
-        elif evaluation_type == "general":
-            mapping_data = mappings['team_leader_general']
-        else:
-            return redirect(url_for('dashboard'))
-    else:  # 평가자(임원)
-        if evaluation_type == "team_leader":
-            mapping_data = mappings['executive_team_leader']
-        elif evaluation_type == "manager":
-            mapping_data = mappings['executive_manager']
-        elif evaluation_type == "general":
-            mapping_data = mappings['executive_general']
-        else:
-            return redirect(url_for('dashboard'))
-    
-    # 평가 대상자 정보 가져오기
-    for _, row in mapping_data.iterrows():
-        if str(row['evaluaterid']) == str(user_data['id']):
-            evaluatee_id = int(row['evaluateeid'])  # Int64를 int로 변환
-            # 제외 대상이면 스킵
-            if evaluatee_id in get_all_excluded_evaluatee_ids():
-                continue
-            evaluatee_data = backdata[backdata.iloc[:, 0] == evaluatee_id]
-            if not evaluatee_data.empty:
-                # 직전 평가 점수 가져오기
-                before_point = 0
-                # 이름 기반 제외도 지원
-                excluded_names = get_excluded_evaluatee_names()
-                evaluatee_name_str = str(evaluatee_data.iloc[0, 2])
-                if evaluatee_name_str in excluded_names:
-                    continue
-                
-                # 평가자(임원)의 팀원 평가(관리직)인 경우, 팀장 평가 점수를 가져오기
-                if session['user_type'] == "평가자(임원)" and evaluation_type == "manager":
-                    # 팀장의 평가자 ID들 (평가자(팀장)_대리이상.csv에서 가져온 ID들)
-                    team_leader_ids = [11050121, 11980036, 11040086, 11080043, 11040050, 11010060]
-                    
-                    # 데이터베이스에서 팀장이 해당 직원에 대해 manager 평가 타입으로 제출한 점수 조회
-                    conn = get_db_connection()
-                    cursor = conn.cursor()
-                    cursor.execute(adapt_query('''
-                        SELECT scores FROM evaluation_data 
-                        WHERE evaluatee_id = ? AND evaluation_type = 'manager' 
-                        AND evaluator_id IN ({})
-                        ORDER BY created_at DESC LIMIT 1
-                    '''.format(','.join(map(str, team_leader_ids)))), (evaluatee_id,))
-                    result = cursor.fetchone()
-                    commit_db(conn)
-                    conn.close()
-                    
-                    if result:
-                        try:
-                            scores_data = json.loads(result[0])
-                            before_point = scores_data.get('score', 0)
-                        except:
-                            before_point = 0
-                else:
-                    # 기존 방식: backdata의 I열에서 직전 점수 가져오기
-                    try:
-                        before_point = int(evaluatee_data.iloc[0, 8])  # I열(인덱스 8)에서 직전 점수 가져오기
-                    except:
-                        before_point = 0
-                
-                evaluatees.append({
-                    'id': str(evaluatee_id),  # 문자열로 변환
-                    'name': evaluatee_name_str,  # 문자열로 변환
-                    'team': str(evaluatee_data.iloc[0, 3]),  # 문자열로 변환
-                    'position': str(evaluatee_data.iloc[0, 4]),  # 문자열로 변환
-                    'grade': str(evaluatee_data.iloc[0, 5]),  # 문자열로 변환
-                    'before_point': before_point
-                })
+    # 평가 대상자 정보 가져오기 (평가자 -> 피평가자 역색인 또는 배정 테이블 조인)
+    for evaluatee in find_evaluatees(mapping_key, evaluator_id):
+        # 제외 대상이면 스킵 (제외 목록은 int 사번)
+        if int(evaluatee.id) in excluded_ids:
+            continue
+        if evaluatee.name in excluded_names:
+            continue
+        
+        # 레코드 필드는 명단 적재 시 이미 문자열로 변환되어 있다
+        evaluatees.append({
+            'id': evaluatee.id,
+            'name': evaluatee.name,
+            'team': evaluatee.team,
+            'position': evaluatee.position,
+            'grade': evaluatee.grade,
+            # backdata의 I열 직전 점수 (임원의 관리직 평가는 요청 시 팀장 점수로 대체)
+            'before_point': evaluatee.before_point or 0
+        })
     
     # 직급별로 그룹화
     grade_groups = {}
@@ -788,7 +570,7 @@ def evaluate(evaluation_type):
                 grade_groups[grade] = []
             grade_groups[grade].append(evaluatee)
     # 상대평가는 임원만 직급별 그룹화
-    elif session['user_type'] == "평가자(임원)":
+    elif user_type == "평가자(임원)":
         for evaluatee in evaluatees:
             grade = evaluatee['grade']
             if grade not in grade_groups:
@@ -812,6 +594,80 @@ def evaluate(evaluation_type):
                     new_grade_groups[grade] = grade_groups[grade]
             
             grade_groups = new_grade_groups
+    
+    return evaluatees, grade_groups
+
+def get_evaluation_worklist(evaluator_id, user_type, evaluation_type, mapping_key, config):
+    """평가 대상 목록 메모이즈. 명단 또는 제외 설정이 바뀌면 다시 만든다 (반환값은 수정 금지)"""
+    key = (str(evaluator_id), user_type, evaluation_type)
+    version = (get_roster_version(), config.version)
+    cached = _worklist_cache.get(key)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    worklist = _build_evaluation_worklist(evaluator_id, user_type, evaluation_type, mapping_key, config)
+    _worklist_cache[key] = (version, worklist)
+    return worklist
+
+def fetch_team_leader_scores(evaluatee_ids):
+    """피평가자별로 담당 팀장이 manager 평가 타입으로 제출한 최신 점수를 한 번의 쿼리로 조회"""
+    if not evaluatee_ids:
+        return {}
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    if ROSTER_SOURCE == 'db':
+        # 담당 팀장 여부를 배정 테이블 조인으로 판별
+        queries.execute(cursor, 'team_leader_scores_assigned', in_values=evaluatee_ids)
+    else:
+        queries.execute(cursor, 'team_leader_scores', in_values=evaluatee_ids)
+    rows = cursor.fetchall()
+    commit_db(conn)
+    conn.close()
+    
+    scores = {}
+    team_leader_ids = {}
+    for evaluatee_id, evaluator_id, score in rows:
+        if evaluatee_id in scores:
+            continue
+        if ROSTER_SOURCE != 'db':
+            # 이 직원을 평가하는 팀장 ID들 (평가자(팀장)_대리이상 배정의 피평가자 -> 평가자 역방향 조회)
+            if evaluatee_id not in team_leader_ids:
+                team_leader_ids[evaluatee_id] = set(find_evaluator_ids('team_leader_manager', evaluatee_id))
+            if evaluator_id not in team_leader_ids[evaluatee_id]:
+                continue
+        scores[evaluatee_id] = scoring.to_number(score) or 0
+    return scores
+
+@app.route('/evaluate/<evaluation_type>')
+def evaluate(evaluation_type):
+    """평가 페이지"""
+    if 'user_type' not in session or session['user_type'] not in ["평가자(팀장)", "평가자(임원)"]:
+        return redirect(url_for('login'))
+    
+    user_data = session['user_data']
+    user_type = session['user_type']
+    jikkeup = load_jikkeup()
+    
+    mapping_key = EVALUATION_MAPPING_KEYS.get((user_type, evaluation_type))
+    if mapping_key is None:
+        return redirect(url_for('dashboard'))
+    
+    # 평가 대상자 목록 (명단/제외 설정이 바뀌지 않았으면 캐시 재사용)
+    evaluatees, grade_groups = get_evaluation_worklist(user_data['id'], user_type, evaluation_type, mapping_key,
+                                                       g.runtime_config)
+    
+    # 평가자(임원)의 팀원 평가(관리직)인 경우, 팀장 평가 점수를 가져오기
+    # 팀장 점수는 수시로 바뀌므로 캐시된 목록의 복사본에 매 요청 반영한다
+    if user_type == "평가자(임원)" and evaluation_type == "manager":
+        team_leader_scores = fetch_team_leader_scores([evaluatee['id'] for evaluatee in evaluatees])
+        scored = {
+            evaluatee['id']: dict(evaluatee, before_point=team_leader_scores.get(evaluatee['id'], 0))
+            for evaluatee in evaluatees
+        }
+        evaluatees = [scored[evaluatee['id']] for evaluatee in evaluatees]
+        grade_groups = {
+            grade: [scored[evaluatee['id']] for evaluatee in group]
+            for grade, group in grade_groups.items()
+        }
  
     return render_template('evaluate.html', 
                          user_data=user_data, 
@@ -820,46 +676,91 @@ def evaluate(evaluation_type):
                          evaluation_type=evaluation_type,
                          jikkeup=jikkeup if jikkeup is not None else None)
 
+# 임시저장 UPSERT: (평가자, 피평가자, 평가 유형) UNIQUE 인덱스 기준으로 덮어쓰고 is_final을 0으로 되돌린다
+def _replace_criterion_scores(cursor, criteria_by_key):
+    """방금 저장한 평가 행의 항목별 점수(evaluation_scores)를 교체. criteria_by_key: (평가자, 피평가자, 평가 유형) -> {항목: 점수}"""
+    groups = {}
+    for evaluator_id, evaluatee_id, evaluation_type in criteria_by_key:
+        groups.setdefault((evaluator_id, evaluation_type), []).append(evaluatee_id)
+    
+    evaluation_ids = []
+    criteria_rows = []
+    for (evaluator_id, evaluation_type), evaluatee_ids in groups.items():
+        queries.execute(cursor, 'evaluation_ids_for_evaluatees', (evaluator_id, evaluation_type), in_values=evaluatee_ids)
+        for evaluation_id, evaluatee_id in cursor.fetchall():
+            evaluation_ids.append(evaluation_id)
+            criteria = criteria_by_key[(evaluator_id, str(evaluatee_id), evaluation_type)]
+            criteria_rows.extend((evaluation_id, criterion, value) for criterion, value in criteria.items())
+    
+    if evaluation_ids:
+        queries.execute(cursor, 'evaluation_scores_delete', in_values=evaluation_ids)
+    if criteria_rows:
+        queries.executemany(cursor, 'evaluation_scores_insert', criteria_rows)
+
+def save_evaluations(rows):
+    """(평가자, 피평가자, 평가 유형, scores dict, comments) 목록을 한 트랜잭션에서 executemany로 임시저장.
+    원본 JSON과 함께 대표 점수(score)와 항목별 점수(evaluation_scores)를 저장한다"""
+    params = []
+    criteria_by_key = {}
+    for evaluator_id, evaluatee_id, evaluation_type, scores, comments in rows:
+        evaluator_id, evaluatee_id = str(evaluator_id), str(evaluatee_id)
+        score, criteria = scoring.normalize_scores(scores, evaluatee_id)
+        params.append((evaluator_id, evaluatee_id, evaluation_type,
+                       json.dumps(scores, ensure_ascii=False), score, comments))
+        criteria_by_key[(evaluator_id, evaluatee_id, evaluation_type)] = criteria
+    if not params:
+        return 0
+    conn = get_db_connection()
+    if is_postgresql():
+        # 행마다 커밋되지 않도록 트랜잭션으로 묶는다 (풀 반납 시 autocommit 복원)
+        conn.autocommit = False
+    cursor = conn.cursor()
+    try:
+        queries.executemany(cursor, 'evaluation_upsert', params)
+        _replace_criterion_scores(cursor, criteria_by_key)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+    return len(params)
+
+# 임시저장은 EVALUATION_WRITE_MODE에 따라 바로 저장하거나 쓰기 큐에서 묶어 저장 (write_queue 참고)
+write_queue.configure(save_evaluations)
+
+# 저장할 수 있는 평가 유형
+EVALUATION_TYPES = frozenset(evaluation_type for _, evaluation_type in EVALUATION_MAPPING_KEYS)
+
+def validate_evaluation(evaluatee_id, evaluation_type, scores):
+    """임시저장 요청 검증 (큐에 넣기 전에 확인). 문제가 있으면 오류 메시지, 없으면 None"""
+    if not evaluatee_id:
+        return '피평가자 정보가 없습니다.'
+    if evaluation_type not in EVALUATION_TYPES:
+        return '알 수 없는 평가 유형입니다.'
+    if scores is not None and not isinstance(scores, dict):
+        return '점수 형식이 올바르지 않습니다.'
+    return None
+
 @app.route('/submit_evaluation', methods=['POST'])
 def submit_evaluation():
     """평가 제출"""
     if 'user_type' not in session or session['user_type'] not in ["평가자(팀장)", "평가자(임원)"]:
         return jsonify({'success': False, 'message': '권한이 없습니다.'})
     
-    data = request.get_json()
+    data = request.get_json() or {}
     evaluator_id = session['user_data']['id']
-    evaluatee_id = data['evaluatee_id']
-    evaluation_type = data['evaluation_type']
+    evaluatee_id = data.get('evaluatee_id')
+    evaluation_type = data.get('evaluation_type')
     scores = data.get('scores', {})
     comments = data.get('comments', '')
     
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
-    # 기존 평가가 있는지 확인
-    cursor.execute(adapt_query('''
-        SELECT * FROM evaluation_data 
-        WHERE evaluator_id = ? AND evaluatee_id = ? AND evaluation_type = ?
-    '''), (evaluator_id, evaluatee_id, evaluation_type))
-    
-    existing = cursor.fetchone()
-    
-    if existing:
-        # 기존 평가 업데이트 (임시저장이므로 is_final=0)
-        cursor.execute(adapt_query('''
-            UPDATE evaluation_data 
-            SET scores = ?, comments = ?, is_final = 0, created_at = CURRENT_TIMESTAMP
-            WHERE evaluator_id = ? AND evaluatee_id = ? AND evaluation_type = ?
-        '''), (json.dumps(scores, ensure_ascii=False), comments, evaluator_id, evaluatee_id, evaluation_type))
-    else:
-        # 새 평가 등록 (임시저장이므로 is_final=0)
-        cursor.execute(adapt_query('''
-            INSERT INTO evaluation_data (evaluator_id, evaluatee_id, evaluation_type, scores, comments, is_final)
-            VALUES (?, ?, ?, ?, ?, 0)
-        '''), (evaluator_id, evaluatee_id, evaluation_type, json.dumps(scores, ensure_ascii=False), comments))
+    error = validate_evaluation(evaluatee_id, evaluation_type, scores)
+    if error:
+        return jsonify({'success': False, 'message': error})
     
-    commit_db(conn)
-    conn.close()
+    # 기존 평가가 있으면 덮어쓰고 없으면 등록 (임시저장이므로 is_final=0)
+    write_queue.submit([(evaluator_id, evaluatee_id, evaluation_type, scores or {}, comments)])
     
     return jsonify({'success': True, 'message': '평가가 제출되었습니다.'})
 
@@ -877,36 +778,17 @@ def submit_evaluations_bulk():
     if evaluation_type is None or not evaluations:
         return jsonify({'success': False, 'message': '평가 데이터가 비어 있습니다.'})
     
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
+    rows = []
     for item in evaluations:
-        evaluatee_id = item.get('evaluatee_id')
-        scores = item.get('scores', {})
-        comments = item.get('comments', '')
-        if not evaluatee_id:
+        if not item.get('evaluatee_id'):
             continue
-        
-        # upsert
-        cursor.execute(adapt_query('''
-            SELECT id FROM evaluation_data
-            WHERE evaluator_id = ? AND evaluatee_id = ? AND evaluation_type = ?
-        '''), (evaluator_id, evaluatee_id, evaluation_type))
-        row = cursor.fetchone()
-        if row:
-            cursor.execute(adapt_query('''
-                UPDATE evaluation_data
-                SET scores = ?, comments = ?, is_final = 0, created_at = CURRENT_TIMESTAMP
-                WHERE id = ?
-            '''), (json.dumps(scores, ensure_ascii=False), comments, row[0]))
-        else:
-            cursor.execute(adapt_query('''
-                INSERT INTO evaluation_data (evaluator_id, evaluatee_id, evaluation_type, scores, comments, is_final)
-                VALUES (?, ?, ?, ?, ?, 0)
-            '''), (evaluator_id, evaluatee_id, evaluation_type, json.dumps(scores, ensure_ascii=False), comments))
+        error = validate_evaluation(item.get('evaluatee_id'), evaluation_type, item.get('scores', {}))
+        if error:
+            return jsonify({'success': False, 'message': error})
+        rows.append((evaluator_id, item.get('evaluatee_id'), evaluation_type, item.get('scores') or {}, item.get('comments', '')))
     
-    commit_db(conn)
-    conn.close()
+    # 전체 명단을 한 번의 executemany UPSERT / 한 번의 커밋으로 저장
+    write_queue.submit(rows)
     return jsonify({'success': True, 'count': len(evaluations)})
 
 @app.route('/finalize_evaluation', methods=['POST'])
@@ -921,15 +803,14 @@ def finalize_evaluation():
     
     print(f"Finalizing evaluation: evaluator_id={evaluator_id}, evaluation_type={evaluation_type}")
     
+    # 쓰기 큐에 남은 임시저장이 최종제출 뒤에 기록되어 is_final을 되돌리지 않도록 먼저 기록
+    write_queue.flush()
+    
     conn = get_db_connection()
     cursor = conn.cursor()
     
     # 해당 평가자의 해당 평가 유형의 모든 임시저장 데이터를 최종제출로 변경
-    cursor.execute(adapt_query('''
-        UPDATE evaluation_data 
-        SET is_final = 1, created_at = CURRENT_TIMESTAMP
-        WHERE evaluator_id = ? AND evaluation_type = ? AND is_final = 0
-    '''), (evaluator_id, evaluation_type))
+    queries.execute(cursor, 'evaluation_finalize', (evaluator_id, evaluation_type))
     
     updated_count = cursor.rowcount
     print(f"Updated {updated_count} records to final")
@@ -951,10 +832,7 @@ def check_final_submit_status(evaluation_type):
     cursor = conn.cursor()
     
     # 최종제출 상태 확인 (is_final=1인 데이터가 있으면 최종제출된 것으로 간주)
-    cursor.execute(adapt_query('''
-        SELECT COUNT(*) FROM evaluation_data 
-        WHERE evaluator_id = ? AND evaluation_type = ? AND is_final = 1
-    '''), (evaluator_id, evaluation_type))
+    queries.execute(cursor, 'evaluation_final_count', (evaluator_id, evaluation_type))
     
     count = cursor.fetchone()[0]
     commit_db(conn)
@@ -976,33 +854,28 @@ def get_saved_evaluation(evaluation_type):
     
     evaluator_id = session['user_data']['id']
     
+    # 방금 저장한 평가가 쓰기 큐에 남아 있으면 먼저 기록
+    write_queue.flush()
+    
     conn = get_db_connection()
     cursor = conn.cursor()
-    cursor.execute(adapt_query('''
-        SELECT evaluatee_id, scores, comments, created_at 
-        FROM evaluation_data 
-        WHERE evaluator_id = ? AND evaluation_type = ?
-        ORDER BY created_at DESC
-    '''), (evaluator_id, evaluation_type))
+    # 항목별 점수를 조인해 JSON 파싱 없이 scores dict를 만든다
+    queries.execute(cursor, 'evaluation_saved', (evaluator_id, evaluation_type))
     saved_evaluations = cursor.fetchall()
     commit_db(conn)
     conn.close()
     
     evaluations = {}
-    for row in saved_evaluations:
-        evaluatee_id = str(row[0])
-        try:
-            scores = json.loads(row[1]) if row[1] else {}
-        except:
-            scores = {}
-        comments = row[2] or ''
-        created_at = row[3]
-        
-        evaluations[evaluatee_id] = {
-            'scores': scores,
-            'comments': comments,
-            'created_at': created_at
-        }
+    for evaluatee_id, comments, created_at, criterion, value in saved_evaluations:
+        evaluatee_id = str(evaluatee_id)
+        if evaluatee_id not in evaluations:
+            evaluations[evaluatee_id] = {
+                'scores': {},
+                'comments': comments or '',
+                'created_at': created_at
+            }
+        if criterion is not None:
+            evaluations[evaluatee_id]['scores'][criterion] = scoring.to_number(value)
     
     return jsonify({'success': True, 'data': evaluations})
 
@@ -1016,12 +889,7 @@ def get_performance(employee_id):
     
     conn = get_db_connection()
     cursor = conn.cursor()
-    cursor.execute(adapt_query('''
-        SELECT performance_order, project_name, performance, created_at 
-        FROM performance_data 
-        WHERE employee_id = ? AND is_finalized = TRUE
-        ORDER BY performance_order
-    '''), (employee_id,))
+    queries.execute(cursor, 'performance_final_by_employee', (employee_id,))
     performance_data = cursor.fetchall()
     commit_db(conn)
     conn.close()
@@ -1045,109 +913,387 @@ def get_performance(employee_id):
         print(f"반환할 결과: {result}")
         return jsonify(result)
 
+def _export_request(cycle):
+    """?cycle= 값 -> (작업 id, 내보낼 지난 주기 또는 None, 파일명, 평가 건수).
+    작업 id는 평가/점수 집계와 주기, 명단 버전으로 정해지므로 데이터가 같으면 같은 파일을 재사용한다"""
+    # 방금 저장한 평가가 쓰기 큐에 남아 있으면 먼저 기록
+    write_queue.flush()
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    # ?cycle=로 지난 주기를 지정하면 보관 테이블에서 조회 (기본: 활성 주기)
+    archived = bool(cycle) and cycles.is_archived(cursor, cycle)
+    if archived:
+        queries.execute(cursor, 'archive_evaluation_export_version', (cycle,))
+    else:
+        cycle = cycles.active_cycle(cursor)
+        queries.execute(cursor, 'evaluation_export_version')
+    version = tuple(cursor.fetchone())
+    conn.close()
+    
+    job_id = export_jobs.job_id_for((cycle, archived, version, ROSTER_SOURCE, get_roster_version()))
+    # 파일명에 현재 날짜 포함
+    current_date = datetime.now().strftime('%Y%m%d_%H%M%S')
+    filename = f'evaluation_data_{cycle}_{current_date}.xlsx' if archived else f'evaluation_data_{current_date}.xlsx'
+    return job_id, cycle if archived else None, filename, version[0] or 0
+
+def build_export(cycle, output, progress):
+    """엑셀 파일 생성 (export_jobs 작업 스레드 또는 요청 스레드에서 호출)"""
+    conn = get_db_connection()
+    try:
+        # 평가 행을 청크 단위로 읽어 write-only 워크시트에 바로 쓴다 (excel_export 참고)
+        excel_export.build_evaluation_workbook(conn, is_postgresql(), enrich_employees, cycle,
+                                               output=output, progress=progress)
+    finally:
+        conn.close()
+
+export_jobs.configure(build_export)
+
+def _send_export(job):
+    """완성된 내보내기 파일 응답. 같은 데이터면 ETag가 같으므로 If-None-Match 요청에는 304"""
+    path = export_jobs.artifact_path(job['job_id'])
+    if path is None:
+        return None
+    response = send_file(path, mimetype=excel_export.CONTENT_TYPE, as_attachment=True,
+                         download_name=job['filename'], etag=job['job_id'], conditional=True)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
 @app.route('/download_excel')
 def download_excel():
-    """평가 데이터를 엑셀 파일로 다운로드"""
+    """평가 데이터를 엑셀 파일로 다운로드. 데이터가 바뀌지 않았으면 만들어 둔 파일을 바로 보내고,
+    없으면 백그라운드 작업을 시작해 EXPORT_WAIT_SECONDS까지만 기다린다.
+    그 안에 끝나지 않으면 202와 작업 상태/다운로드 주소를 돌려준다 (워커 timeout 안에 응답)"""
     if 'user_type' not in session or session['user_type'] != "관리자(인사담당자)":
         return redirect(url_for('login'))
     
-    conn = get_db_connection()
-    cursor = conn.cursor()
+    started = export_jobs.start(*_export_request(request.args.get('cycle')))
+    job = export_jobs.wait(started['job_id'])
+    
+    if job is None or job['status'] in ('queued', 'running'):
+        # 다른 워커가 맡아 작업 파일을 아직 쓰지 않았으면 시작할 때의 상태를 알려준다
+        job = job or started
+        response = jsonify({'success': True, 'job': job,
+                            'status_url': url_for('export_job_status', job_id=job['job_id']),
+                            'download_url': url_for('download_export', job_id=job['job_id'])})
+        response.status_code = 202
+        response.headers['Location'] = url_for('export_job_status', job_id=job['job_id'])
+        response.headers['Retry-After'] = '2'
+        return response
+    response = _send_export(job) if job is not None and job['status'] == 'done' else None
+    if response is None:
+        flash('엑셀 파일을 만들지 못했습니다. 잠시 후 다시 시도해주세요.', 'error')
+        return redirect(url_for('dashboard'))
+    return response
+
+@app.route('/admin/exports', methods=['GET', 'POST'])
+def export_jobs_view():
+    """엑셀 내보내기 작업 (관리자만 가능). POST {cycle}: 백그라운드 작업 시작, GET: 작업 현황"""
+    if 'user_type' not in session or session['user_type'] != "관리자(인사담당자)":
+        return jsonify({'success': False, 'message': '권한이 없습니다.'})
     
-    # 모든 평가 데이터 조회
-    cursor.execute('''
-        SELECT ed.evaluator_id, ed.evaluatee_id, ed.evaluation_type, ed.scores, ed.comments, ed.created_at
-        FROM evaluation_data ed
-        ORDER BY ed.created_at DESC
-    ''')
+    if request.method == 'GET':
+        return jsonify({'success': True, 'exports': export_jobs.stats()})
     
-    evaluations = cursor.fetchall()
-    commit_db(conn)
+    cycle = ((request.get_json(silent=True) or {}).get('cycle') or '').strip()
+    job = export_jobs.start(*_export_request(cycle))
+    return jsonify({'success': True, 'job': job,
+                    'download_url': url_for('download_export', job_id=job['job_id'])})
+
+@app.route('/admin/exports/<job_id>')
+def export_job_status(job_id):
+    """내보내기 작업 상태와 진행률 (관리자만 가능)"""
+    if 'user_type' not in session or session['user_type'] != "관리자(인사담당자)":
+        return jsonify({'success': False, 'message': '권한이 없습니다.'})
+    
+    job = export_jobs.status(job_id)
+    if job is None:
+        return jsonify({'success': False, 'message': '내보내기 작업이 없습니다.'}), 404
+    return jsonify({'success': True, 'job': job,
+                    'download_url': url_for('download_export', job_id=job_id)})
+
+@app.route('/admin/exports/<job_id>/download')
+def download_export(job_id):
+    """완성된 내보내기 파일 다운로드 (관리자만 가능)"""
+    if 'user_type' not in session or session['user_type'] != "관리자(인사담당자)":
+        return redirect(url_for('login'))
+    
+    job = export_jobs.status(job_id)
+    response = _send_export(job) if job is not None and job['status'] == 'done' else None
+    if response is None:
+        return jsonify({'success': False, 'message': '내보내기 파일이 없습니다.'}), 404
+    return response
+
+@app.route('/admin/reload_config', methods=['POST'])
+def reload_runtime_config():
+    """런타임 설정(피평가자 제외 목록 등) 다시 읽기 (관리자만 가능, 요청을 처리한 워커에 적용)"""
+    if 'user_type' not in session or session['user_type'] != "관리자(인사담당자)":
+        return jsonify({'success': False, 'message': '권한이 없습니다.'})
+    
+    config = runtime_config.reload_config()
+    return jsonify({
+        'success': True,
+        'version': config.version,
+        'loaded_at': config.loaded_at,
+        'excluded_evaluatee_ids': sorted(config.excluded_evaluatee_ids),
+        'excluded_evaluatee_names': sorted(config.excluded_evaluatee_names)
+    })
+
+@app.route('/admin/score_summary')
+def score_summary():
+    """평가 유형별 점수 집계 (관리자만 가능). 정규화된 score 컬럼으로 DB에서 집계, ?cycle=로 지난 주기 조회"""
+    if 'user_type' not in session or session['user_type'] != "관리자(인사담당자)":
+        return jsonify({'success': False, 'message': '권한이 없습니다.'})
+    
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cycle = request.args.get('cycle')
+    if cycle and cycles.is_archived(cursor, cycle):
+        queries.execute(cursor, 'archive_evaluation_score_summary', (cycle,))
+    else:
+        cycle = cycles.active_cycle(cursor)
+        queries.execute(cursor, 'evaluation_score_summary')
+    summary = [{
+        'evaluation_type': row[0],
+        'count': row[1],
+        'final_count': row[2] or 0,
+        'scored_count': row[3],
+        'average': round(float(row[4]), 2) if row[4] is not None else None,
+        'min': scoring.to_number(row[5]),
+        'max': scoring.to_number(row[6])
+    } for row in cursor.fetchall()]
     conn.close()
     
-    # 데이터를 DataFrame으로 변환
-    data = []
-    for eval_data in evaluations:
-        evaluator_id = eval_data[0]
-        evaluatee_id = eval_data[1]
-        eval_type = eval_data[2]
-        scores = eval_data[3]
-        comments = eval_data[4]
-        created_at = eval_data[5]
-        
-        # 평가 유형 한글 변환
-        eval_type_korean = {
-            'employee': '사원 평가',
-            'manager': '관리직 평가',
-            'general': '일반직 평가',
-            'team_leader': '팀장 평가'
-        }.get(eval_type, eval_type)
-        
-        # 점수 파싱 (JSON 문자열인 경우)
+    return jsonify({'success': True, 'cycle': cycle, 'summary': summary})
+
+@app.route('/admin/cycles', methods=['GET', 'POST'])
+def evaluation_cycles():
+    """평가 주기 목록과 주기별 집계 (관리자만 가능). POST {cycle}: 현재 주기를 보관하고 새 주기 시작"""
+    if 'user_type' not in session or session['user_type'] != "관리자(인사담당자)":
+        return jsonify({'success': False, 'message': '권한이 없습니다.'})
+    
+    if request.method == 'POST':
+        new_cycle = ((request.get_json(silent=True) or {}).get('cycle') or '').strip()
         try:
-            if scores:
-                scores_dict = json.loads(scores) if isinstance(scores, str) else scores
-                if eval_type == 'employee':
-                    # 사원 평가는 합계만 표시
-                    if isinstance(scores_dict, dict) and 'total' in scores_dict:
-                        scores_str = f"합계: {scores_dict['total']}"
-                    else:
-                        scores_str = f"합계: {scores}"
-                else:
-                    # 다른 평가는 전체 점수 표시
-                    scores_str = ', '.join([f"{k}: {v}" for k, v in scores_dict.items()])
-            else:
-                scores_str = "점수 없음"
-        except:
-            scores_str = str(scores) if scores else "점수 없음"
-        
-        data.append({
-            '평가자 ID': evaluator_id,
-            '평가자명': f'평가자 {evaluator_id}',
-            '피평가자 ID': evaluatee_id,
-            '피평가자명': f'피평가자 {evaluatee_id}',
-            '평가 유형': eval_type_korean,
-            '평가 점수': scores_str,
-            '평가 코멘트': comments if comments else '',
-            '평가 일시': created_at
+            closed_cycle, evaluation_count, performance_count = start_evaluation_cycle(new_cycle)
+        except ValueError as e:
+            return jsonify({'success': False, 'message': str(e)})
+        return jsonify({
+            'success': True,
+            'cycle': new_cycle,
+            'archived_cycle': closed_cycle,
+            'archived_evaluations': evaluation_count,
+            'archived_performances': performance_count
         })
     
-    # DataFrame 생성
-    df = pd.DataFrame(data)
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    result = cycles.list_cycles(cursor)
+    conn.close()
+    return jsonify({'success': True, 'cycles': result})
+
+@app.route('/admin/db_pool')
+def db_pool_stats():
+    """DB 연결 풀 / 임시저장 쓰기 큐 사용 현황 (관리자만 가능, 요청을 처리한 워커 기준)"""
+    if 'user_type' not in session or session['user_type'] != "관리자(인사담당자)":
+        return jsonify({'success': False, 'message': '권한이 없습니다.'})
     
-    # 엑셀 파일 생성
-    output = io.BytesIO()
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-        df.to_excel(writer, sheet_name='평가데이터', index=False)
+    return jsonify({'success': True, 'pool': db_pool.stats(), 'write_queue': write_queue.stats()})
+
+@app.route('/admin/query_stats', methods=['GET', 'DELETE'])
+def query_stats_report():
+    """문장별/라우트별 쿼리 실행 시간 집계 (관리자만 가능, 요청을 처리한 워커 기준). DELETE는 집계 초기화"""
+    if 'user_type' not in session or session['user_type'] != "관리자(인사담당자)":
+        return jsonify({'success': False, 'message': '권한이 없습니다.'})
     
-    output.seek(0)
+    if request.method == 'DELETE':
+        query_stats.reset()
+        return jsonify({'success': True})
+    return jsonify({'success': True, 'queries': query_stats.stats()})
+
+# 관리자 목록 API 한 페이지의 기본/최대 행 수
+ADMIN_PAGE_SIZE = 50
+ADMIN_PAGE_SIZE_MAX = 200
+
+def _admin_page_args():
+    """limit, after(이전 페이지의 next_cursor) 파라미터. 잘못된 값이면 ValueError"""
+    limit = int(request.args.get('limit') or ADMIN_PAGE_SIZE)
+    if limit < 1:
+        raise ValueError('limit 값이 올바르지 않습니다.')
+    after = request.args.get('after')
+    if after not in (None, ''):
+        after = int(after)
+    else:
+        after = None
+    return min(limit, ADMIN_PAGE_SIZE_MAX), after
+
+def _bool_arg(name):
+    """'1'/'true' -> True, '0'/'false' -> False, 없으면 None"""
+    value = request.args.get(name)
+    if value in (None, ''):
+        return None
+    return value.lower() in ('1', 'true', 'y', 'yes')
+
+def _employee_columns(rows, roles):
+    """rows의 사번 열(roles: {역할: 열 번호})을 직원 정보 dict 목록으로 (enrich_employees 한 번)"""
+    pd = startup.lazy_import('pandas')
+    df = pd.DataFrame({role: [str(row[index]) for row in rows] for role, index in roles.items()}, dtype=object)
+    df = enrich_employees(df, {role: role + '_' for role in roles})
+    return {
+        role: [
+            {'id': employee_id, 'name': name, 'team': team, 'position': position, 'grade': grade}
+            for employee_id, name, team, position, grade in zip(
+                df[role], *(df[f'{role}_{field}'] for field in roster.EMPLOYEE_FIELDS))
+        ]
+        for role in roles
+    }
+
+@app.route('/api/admin/evaluations')
+def admin_evaluations():
+    """평가 목록 한 페이지 (관리자만 가능, 최신순).
+    필터: evaluator_id, evaluatee_id, evaluation_type, is_final, team(피평가자 소속) / 페이지: limit, after"""
+    if 'user_type' not in session or session['user_type'] != "관리자(인사담당자)":
+        return jsonify({'success': False, 'message': '권한이 없습니다.'})
     
-    # 파일명에 현재 날짜 포함
-    current_date = datetime.now().strftime('%Y%m%d_%H%M%S')
-    filename = f'evaluation_data_{current_date}.xlsx'
+    try:
+        limit, after = _admin_page_args()
+    except ValueError:
+        return jsonify({'success': False, 'message': '페이지 파라미터가 올바르지 않습니다.'}), 400
+    is_final = _bool_arg('is_final')
+    team = request.args.get('team') or None
+    filters = {
+        'evaluator_id': request.args.get('evaluator_id') or None,
+        'evaluatee_id': request.args.get('evaluatee_id') or None,
+        'evaluation_type': request.args.get('evaluation_type') or None,
+        'is_final': None if is_final is None else int(is_final),
+        'evaluatee_ids': find_team_member_ids(team) if team else None,
+        'before_id': after,
+    }
+    
+    # 방금 저장한 평가가 쓰기 큐에 남아 있으면 먼저 기록
+    write_queue.flush()
     
-    response = make_response(output.getvalue())
-    response.headers['Content-Type'] = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-    response.headers['Content-Disposition'] = f'attachment; filename={filename}'
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    # 다음 페이지가 있는지 알 수 있도록 한 행 더 읽는다
+    queries.execute(cursor, 'admin_evaluations_page', (limit + 1,), filters=filters)
+    rows = cursor.fetchall()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    criteria = {}
+    if rows:
+        queries.execute(cursor, 'evaluation_scores_for_ids', in_values=[row[0] for row in rows])
+        for evaluation_id, criterion, value in cursor.fetchall():
+            criteria.setdefault(evaluation_id, {})[criterion] = scoring.to_number(value)
+    conn.close()
     
-    return response
+    # 페이지 전체의 평가자/피평가자 정보를 한 번에 붙인다
+    people = _employee_columns(rows, {'evaluator': 1, 'evaluatee': 2})
+    items = [{
+        'id': evaluation_id,
+        'evaluator': evaluator,
+        'evaluatee': evaluatee,
+        'evaluation_type': evaluation_type,
+        'score': scoring.to_number(score),
+        'criteria': criteria.get(evaluation_id, {}),
+        'is_final': bool(final),
+        'created_at': str(created_at) if created_at is not None else None
+    } for (evaluation_id, evaluator_id, evaluatee_id, evaluation_type, score, final, created_at), evaluator, evaluatee
+      in zip(rows, people['evaluator'], people['evaluatee'])]
+    
+    return jsonify({
+        'success': True,
+        'items': items,
+        'next_cursor': items[-1]['id'] if has_more else None
+    })
 
-@app.route('/reset_evaluations')
-def reset_evaluations():
-    """평가 데이터 초기화 (관리자만 가능)"""
+@app.route('/api/admin/performances')
+def admin_performances():
+    """실적 목록 한 페이지 (관리자만 가능, 최신순, 실적 내용은 앞 200자).
+    필터: employee_id, is_finalized, team / 페이지: limit, after"""
     if 'user_type' not in session or session['user_type'] != "관리자(인사담당자)":
-        return redirect(url_for('login'))
+        return jsonify({'success': False, 'message': '권한이 없습니다.'})
+    
+    try:
+        limit, after = _admin_page_args()
+    except ValueError:
+        return jsonify({'success': False, 'message': '페이지 파라미터가 올바르지 않습니다.'}), 400
+    team = request.args.get('team') or None
+    filters = {
+        'employee_id': request.args.get('employee_id') or None,
+        'is_finalized': _bool_arg('is_finalized'),
+        'employee_ids': find_team_member_ids(team) if team else None,
+        'before_id': after,
+    }
     
     conn = get_db_connection()
     cursor = conn.cursor()
+    queries.execute(cursor, 'admin_performances_page', (limit + 1,), filters=filters)
+    rows = cursor.fetchall()
+    conn.close()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    
+    people = _employee_columns(rows, {'employee': 1})
+    items = [{
+        'id': performance_id,
+        'employee': employee,
+        'order': order,
+        'project_name': project_name,
+        'performance': preview,
+        'truncated': (length or 0) > len(preview or ''),
+        'created_at': str(created_at) if created_at is not None else None,
+        'is_finalized': bool(is_finalized)
+    } for (performance_id, employee_id, order, project_name, preview, length, created_at, is_finalized), employee
+      in zip(rows, people['employee'])]
     
-    # 모든 평가 데이터 삭제
-    cursor.execute('DELETE FROM evaluation_data')
+    return jsonify({
+        'success': True,
+        'items': items,
+        'next_cursor': items[-1]['id'] if has_more else None
+    })
+
+@app.route('/api/admin/performances/<int:performance_id>')
+def admin_performance_detail(performance_id):
+    """실적 한 건의 전체 내용 (관리자만 가능)"""
+    if 'user_type' not in session or session['user_type'] != "관리자(인사담당자)":
+        return jsonify({'success': False, 'message': '권한이 없습니다.'})
     
-    commit_db(conn)
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    queries.execute(cursor, 'performance_by_id', (performance_id,))
+    row = cursor.fetchone()
     conn.close()
+    if row is None:
+        return jsonify({'success': False, 'message': '실적 데이터가 없습니다.'}), 404
+    
+    return jsonify({'success': True, 'data': {
+        'id': row[0],
+        'employee_id': str(row[1]),
+        'order': row[2],
+        'project_name': row[3],
+        'performance': row[4],
+        'created_at': str(row[5]) if row[5] is not None else None,
+        'is_finalized': bool(row[6])
+    }})
+
+@app.route('/reset_evaluations')
+def reset_evaluations():
+    """평가 데이터 초기화 (관리자만 가능, 지운 평가는 보관 주기로 남긴다)"""
+    if 'user_type' not in session or session['user_type'] != "관리자(인사담당자)":
+        return redirect(url_for('login'))
     
-    flash('모든 평가 데이터가 초기화되었습니다.', 'success')
+    write_queue.flush()
+    conn = get_db_connection()
+    try:
+        # 지우기 전에 활성 주기의 평가를 보관 주기로 옮긴다 (항목별 점수 포함)
+        snapshot, evaluation_count = cycles.reset_evaluations(conn, is_postgresql())
+    except ValueError as e:
+        flash(str(e), 'error')
+        return redirect(url_for('dashboard'))
+    finally:
+        conn.close()
+    
+    flash(f'평가 데이터 {evaluation_count}건을 보관 주기 "{snapshot}"로 옮기고 초기화했습니다.', 'success')
     return redirect(url_for('dashboard'))
 
 @app.route('/reset_evaluator/<evaluator_id>')
@@ -1156,11 +1302,13 @@ def reset_evaluator(evaluator_id):
     if 'user_type' not in session or session['user_type'] != "관리자(인사담당자)":
         return redirect(url_for('login'))
     
+    write_queue.flush()
     conn = get_db_connection()
     cursor = conn.cursor()
     
-    # 특정 평가자의 평가 데이터 삭제
-    cursor.execute(adapt_query('DELETE FROM evaluation_data WHERE evaluator_id = ?'), (evaluator_id,))
+    # 특정 평가자의 평가 데이터 삭제 (항목별 점수 포함)
+    queries.execute(cursor, 'evaluation_scores_delete_by_evaluator', (evaluator_id,))
+    queries.execute(cursor, 'evaluation_delete_by_evaluator', (evaluator_id,))
     deleted_count = cursor.rowcount
     
     commit_db(conn)
@@ -1179,7 +1327,7 @@ def reset_performance(employee_id):
     cursor = conn.cursor()
     
     # 특정 피평가자의 실적 데이터 삭제
-    cursor.execute(adapt_query('DELETE FROM performance_data WHERE employee_id = ?'), (employee_id,))
+    queries.execute(cursor, 'performance_delete_by_employee', (employee_id,))
     deleted_count = cursor.rowcount
     
     commit_db(conn)
@@ -1194,6 +1342,11 @@ def health_check():
     """Railway 헬스체크용 엔드포인트"""
     return 'OK', 200
 
+@app.route('/health/startup')
+def startup_report():
+    """워커 기동 시간 보고서 (모듈 로드, DB 초기화, 지연 import 소요 시간)"""
+    return jsonify(startup.report())
+
 # 간단한 진단용 엔드포인트: 배포 환경에서 backdata 내용 확인
 @app.route('/debug/backdata_find')
 def debug_backdata_find():
@@ -1227,20 +1380,20 @@ def debug_backdata_row(employee_id):
         if df.empty:
             return jsonify({'success': True, 'found': False, 'reason': 'empty'}), 200
         # 첫 번째 컬럼이 사번
-        subset = df[df.iloc[:, 0].astype(str) == str(employee_id)]
-        if subset.empty:
+        record = roster.get_employee(employee_id)
+        if record is None:
             return jsonify({'success': True, 'found': False}), 200
-        row = subset.iloc[0]
+        row = df.iloc[record.row_index].tolist()
         return jsonify({
             'success': True,
             'found': True,
-            'employee_id': str(row.iloc[0]),
-            'password': str(row.iloc[1]),
-            'name': str(row.iloc[2]),
-            'team': str(row.iloc[3]),
-            'position': str(row.iloc[4]),
-            'grade': str(row.iloc[5]),
-            'raw': [str(x) for x in row.tolist()]
+            'employee_id': str(row[0]),
+            'password': str(row[1]),
+            'name': str(row[2]),
+            'team': str(row[3]),
+            'position': str(row[4]),
+            'grade': str(row[5]),
+            'raw': [str(x) for x in row]
         })
     except Exception as e:
         return jsonify({'success': False, 'error': str(e), 'employee_id': employee_id})
@@ -1252,7 +1405,6 @@ def organization():
     if 'user_type' not in session:
         return redirect(url_for('login'))
     
-    safe_init_db()
     return render_template('organization.html')
 
 @app.route('/api/organization/departments', methods=['GET'])
@@ -1262,11 +1414,7 @@ def get_departments():
         conn = get_db_connection()
         cursor = conn.cursor()
         
-        cursor.execute(adapt_query('''
-            SELECT id, name, leader_position, parent_id, display_order
-            FROM departments
-            ORDER BY display_order, name
-        '''))
+        queries.execute(cursor, 'department_all')
         
         departments = []
         for row in cursor.fetchall():
@@ -1291,22 +1439,15 @@ def create_department():
         conn = get_db_connection()
         cursor = conn.cursor()
         
-        cursor.execute(adapt_query('''
-            INSERT INTO departments (name, leader_position, parent_id, display_order)
-            VALUES (?, ?, ?, ?)
-        '''), (
+        queries.execute(cursor, 'department_insert', (
             data.get('name'),
             data.get('leader_position'),
             data.get('parent_id'),
             data.get('display_order', 0)
         ))
         
+        department_id = queries.last_insert_id(cursor)
         commit_db(conn)
-        if is_postgresql():
-            cursor.execute('SELECT LASTVAL()')
-            department_id = cursor.fetchone()[0]
-        else:
-            department_id = cursor.lastrowid
         conn.close()
         
         return jsonify({'success': True, 'id': department_id})
@@ -1321,11 +1462,7 @@ def update_department(dept_id):
         conn = get_db_connection()
         cursor = conn.cursor()
         
-        cursor.execute(adapt_query('''
-            UPDATE departments
-            SET name = ?, leader_position = ?, parent_id = ?, display_order = ?, updated_at = CURRENT_TIMESTAMP
-            WHERE id = ?
-        '''), (
+        queries.execute(cursor, 'department_update', (
             data.get('name'),
             data.get('leader_position'),
             data.get('parent_id'),
@@ -1347,7 +1484,7 @@ def delete_department(dept_id):
         conn = get_db_connection()
         cursor = conn.cursor()
         
-        cursor.execute(adapt_query('DELETE FROM departments WHERE id = ?'), (dept_id,))
+        queries.execute(cursor, 'department_delete', (dept_id,))
         
         commit_db(conn)
         conn.close()
@@ -1363,48 +1500,30 @@ def get_department_employees():
         dept_id = request.args.get('department_id')
         conn = get_db_connection()
         cursor = conn.cursor()
-        backdata = load_backdata()
         
         if dept_id:
-            cursor.execute(adapt_query('''
-                SELECT id, employee_id, position
-                FROM department_employees
-                WHERE department_id = ?
-            '''), (dept_id,))
+            queries.execute(cursor, 'department_employees_by_department', (dept_id,))
         else:
-            cursor.execute(adapt_query('''
-                SELECT id, department_id, employee_id, position
-                FROM department_employees
-            '''))
+            queries.execute(cursor, 'department_employees')
+        rows = cursor.fetchall()
+        conn.close()
         
-        employees = []
-        for row in cursor.fetchall():
-            employee_id = str(row[1]) if dept_id else str(row[2])
-            # backdata에서 직원 정보 찾기
-            emp_data = backdata[backdata.iloc[:, 0].astype(str) == employee_id]
-            if not emp_data.empty:
-                emp_info = {
-                    'id': row[0],
-                    'employee_id': employee_id,
-                    'name': str(emp_data.iloc[0, 2]),
-                    'team': str(emp_data.iloc[0, 3]),
-                    'position': str(emp_data.iloc[0, 4]),
-                    'grade': str(emp_data.iloc[0, 5]),
-                    'department_position': row[2] if dept_id else row[3]
-                }
-            else:
-                emp_info = {
-                    'id': row[0],
-                    'employee_id': employee_id,
-                    'name': f'사번 {employee_id}',
-                    'team': 'Unknown',
-                    'position': 'Unknown',
-                    'grade': 'Unknown',
-                    'department_position': row[2] if dept_id else row[3]
-                }
-            employees.append(emp_info)
+        # 직원 정보는 사번 기준 merge 한 번으로 붙인다 (명단에 없으면 '사번 {id}' / 'Unknown')
+        pd = startup.lazy_import('pandas')
+        df = pd.DataFrame([(row[0], str(row[1]), row[2]) for row in rows], columns=['id', 'employee_id', 'department_position'])
+        df = enrich_employees(df, {'employee_id': ''})
+        employees = [{
+            'id': int(dept_employee_id),
+            'employee_id': employee_id,
+            'name': name,
+            'team': team,
+            'position': position,
+            'grade': grade,
+            'department_position': department_position
+        } for dept_employee_id, employee_id, department_position, name, team, position, grade in zip(
+            df['id'], df['employee_id'], df['department_position'],
+            *(df[field] for field in roster.EMPLOYEE_FIELDS))]
         
-        conn.close()
         return jsonify({'success': True, 'employees': employees})
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
@@ -1418,15 +1537,10 @@ def assign_employee():
         cursor = conn.cursor()
         
         # 기존 배정이 있으면 삭제
-        cursor.execute(adapt_query('''
-            DELETE FROM department_employees WHERE employee_id = ?
-        '''), (data.get('employee_id'),))
+        queries.execute(cursor, 'department_employee_unassign', (data.get('employee_id'),))
         
         # 새로 배정
-        cursor.execute(adapt_query('''
-            INSERT INTO department_employees (department_id, employee_id, position)
-            VALUES (?, ?, ?)
-        '''), (
+        queries.execute(cursor, 'department_employee_assign', (
             data.get('department_id'),
             data.get('employee_id'),
             data.get('position')
@@ -1446,7 +1560,7 @@ def remove_employee(emp_id):
         conn = get_db_connection()
         cursor = conn.cursor()
         
-        cursor.execute(adapt_query('DELETE FROM department_employees WHERE id = ?'), (emp_id,))
+        queries.execute(cursor, 'department_employee_delete', (emp_id,))
         
         commit_db(conn)
         conn.close()
@@ -1467,6 +1581,7 @@ def upload_organization():
             return jsonify({'success': False, 'error': '파일이 선택되지 않았습니다.'}), 400
         
         # CSV 파일 읽기
+        pd = startup.lazy_import('pandas')
         try:
             df = pd.read_csv(file, encoding='utf-8')
         except:
@@ -1483,8 +1598,8 @@ def upload_organization():
         
         # 기존 조직 삭제 (선택사항)
         if request.form.get('clear_existing') == 'true':
-            cursor.execute('DELETE FROM department_employees')
-            cursor.execute('DELETE FROM departments')
+            queries.execute(cursor, 'department_employees_clear')
+            queries.execute(cursor, 'department_clear')
         
         # 조직 데이터 삽입
         dept_map = {}  # 조직명 -> ID 매핑
@@ -1495,22 +1610,15 @@ def upload_organization():
             parent_name = str(row.get('상위 조직', '')).strip() if pd.notna(row.get('상위 조직')) else None
             
             # 조직이 이미 있으면 스킵
-            cursor.execute(adapt_query('SELECT id FROM departments WHERE name = ?'), (dept_name,))
+            queries.execute(cursor, 'department_id_by_name', (dept_name,))
             existing = cursor.fetchone()
             
             if existing:
                 dept_id = existing[0]
             else:
                 parent_id = dept_map.get(parent_name) if parent_name else None
-                cursor.execute(adapt_query('''
-                    INSERT INTO departments (name, leader_position, parent_id, display_order)
-                    VALUES (?, ?, ?, ?)
-                '''), (dept_name, leader_position, parent_id, idx))
-                if is_postgresql():
-                    cursor.execute('SELECT LASTVAL()')
-                    dept_id = cursor.fetchone()[0]
-                else:
-                    dept_id = cursor.lastrowid
+                queries.execute(cursor, 'department_insert', (dept_name, leader_position, parent_id, idx))
+                dept_id = queries.last_insert_id(cursor)
             
             dept_map[dept_name] = dept_id
         
@@ -1525,37 +1633,59 @@ def upload_organization():
 def get_all_employees():
     """모든 직원 목록 조회 (조직 배정되지 않은 직원 포함)"""
     try:
-        backdata = load_backdata()
-        if backdata is None or backdata.empty:
+        if ROSTER_SOURCE == 'db':
+            # 배정 여부까지 한 번의 쿼리로 조회 (department_employees.employee_id 인덱스 사용)
+            conn = get_db_connection()
+            cursor = conn.cursor()
+            queries.execute(cursor, 'employees_with_assignment')
+            employees = [{
+                'id': str(row[0]),
+                'name': str(row[1]),
+                'team': str(row[2]),
+                'position': str(row[3]),
+                'grade': str(row[4]),
+                'assigned': bool(row[5])
+            } for row in cursor.fetchall()]
+            conn.close()
+            return jsonify({'success': True, 'employees': employees})
+        
+        backdata = roster.get_employees()
+        if not backdata:
             return jsonify({'success': True, 'employees': []})
         
         # 이미 배정된 직원 ID 조회
         conn = get_db_connection()
         cursor = conn.cursor()
-        cursor.execute(adapt_query('SELECT DISTINCT employee_id FROM department_employees'))
+        queries.execute(cursor, 'department_assigned_employee_ids')
         assigned_ids = set(str(row[0]) for row in cursor.fetchall())
         conn.close()
         
-        employees = []
-        for idx, row in backdata.iterrows():
-            emp_id = str(row.iloc[0])
-            employees.append({
-                'id': emp_id,
-                'name': str(row.iloc[2]),
-                'team': str(row.iloc[3]),
-                'position': str(row.iloc[4]),
-                'grade': str(row.iloc[5]),
-                'assigned': emp_id in assigned_ids
-            })
+        employees = [{
+            'id': employee.id,
+            'name': employee.name,
+            'team': employee.team,
+            'position': employee.position,
+            'grade': employee.grade,
+            'assigned': employee.id in assigned_ids
+        } for employee in backdata]
         
         return jsonify({'success': True, 'employees': employees})
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
+startup.record('eva 모듈 로드', startup.elapsed_ms())
+
 if __name__ == '__main__':
-    # 서버를 먼저 시작하여 헬스체크가 즉시 응답하도록 하고,
-    # DB 스키마 준비는 before_first_request 훅에서 수행한다.
+    # 개발 서버는 시작 전에 스키마 마이그레이션을 실행한다 (실패하면 첫 요청에서 재시도)
     port = int(os.environ.get('PORT', 5000))
+    try:
+        with startup.timed('스키마 마이그레이션'):
+            init_db()
+        os.environ['SCHEMA_MIGRATED'] = '1'
+        _db_initialized = True
+    except Exception as e:
+        # 실패하면 첫 요청에서 다시 시도
+        print(f"DB migration error: {e}")
     debug_mode = os.environ.get('FLASK_DEBUG', 'False').lower() == 'true'
     app.run(debug=debug_mode, host='0.0.0.0', port=port)
 
@@ -0,0 +1,209 @@
+"""평가 데이터 엑셀 내보내기 (스트리밍)
+
+평가 행을 EXPORT_CHUNK_SIZE건씩 읽어(PostgreSQL은 서버 측 named cursor, SQLite는 fetchmany)
+청크마다 직원 정보를 붙이고 항목별 점수를 조회한 뒤 openpyxl write-only 워크시트에 바로 쓴다.
+파일은 요약 시트와 평가 유형별 시트로 나뉘며, 유형별 시트는 항목마다 숫자 컬럼 하나를 둔다.
+결과 파일은 SpooledTemporaryFile(EXPORT_SPOOL_MAX_BYTES를 넘으면 디스크로 넘김)에 저장하고
+응답은 파일을 그대로 흘려보내므로 전체 결과를 메모리에 올리지 않는다.
+
+    EXPORT_CHUNK_SIZE        한 번에 읽는 평가 행 수 (기본값: 2000)
+    EXPORT_SPOOL_MAX_BYTES   임시 파일을 메모리에 두는 최대 크기 (기본값: 8MB)
+"""
+import itertools
+import os
+import tempfile
+
+import queries
+import scoring
+import startup
+
+CHUNK_SIZE = max(1, int(os.environ.get('EXPORT_CHUNK_SIZE', '2000')))
+SPOOL_MAX_BYTES = int(os.environ.get('EXPORT_SPOOL_MAX_BYTES', str(8 * 1024 * 1024)))
+
+CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+# 평가 유형 한글 표시
+EVALUATION_TYPE_LABELS = {
+    'employee': '사원 평가',
+    'manager': '관리직 평가',
+    'general': '일반직 평가',
+    'team_leader': '팀장 평가'
+}
+
+# 평가 유형 시트의 앞/뒤 공통 컬럼 (사이에 대표 점수와 항목별 점수 컬럼이 들어간다)
+LEADING_COLUMNS = [
+    '평가자 ID', '평가자명', '평가자 소속', '평가자 직위',
+    '피평가자 ID', '피평가자명', '피평가자 소속', '피평가자 직위', '피평가자 직급'
+]
+TRAILING_COLUMNS = ['최종제출', '평가 코멘트', '평가 일시']
+SUMMARY_SHEET = '요약'
+# 엑셀 시트의 최대 컬럼 수
+MAX_COLUMNS = 16384
+
+# 서버 측 커서 이름 (연결마다 한 번에 하나만 연다)
+_cursor_names = itertools.count(1)
+
+
+def iter_chunks(conn, postgresql, name, params=(), chunk_size=CHUNK_SIZE):
+    """이름으로 등록된 조회 문장의 결과를 chunk_size건씩 내준다.
+    PostgreSQL은 named cursor로 서버에서 나눠 받으므로 트랜잭션 안에서 호출해야 한다 (conn.autocommit = False)"""
+    if postgresql:
+        # named cursor는 PREPARE/EXECUTE를 쓸 수 없어 변환된 SQL을 그대로 실행한다
+        cursor = conn.cursor(name=f'eva_export_{next(_cursor_names)}')
+        cursor.itersize = chunk_size
+        cursor.execute(queries.statement(name, 'postgresql').sql, tuple(params))
+    else:
+        cursor = conn.cursor()
+        queries.execute(cursor, name, params)
+    try:
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                return
+            yield rows
+    finally:
+        cursor.close()
+
+
+def _criterion_order(criterion):
+    # 숫자 항목은 숫자 순서(1, 2, 10), 나머지는 이름 순서
+    return (0, int(criterion), '') if criterion.isdigit() else (1, 0, criterion)
+
+
+def _export_criteria(cursor, cycle):
+    """평가 유형 -> 시트에 넣을 항목 목록 (대표 점수 컬럼과 겹치는 scoring.PRIMARY_CRITERIA는 뺀다).
+    항목 이름은 저장할 때 정규화되어 있다 (사번 접미사 없이 attitude_1 등, scoring.normalize_scores 참고)"""
+    if cycle is not None:
+        queries.execute(cursor, 'archive_evaluation_export_criteria', (cycle,))
+    else:
+        queries.execute(cursor, 'evaluation_export_criteria')
+    criteria = {}
+    for evaluation_type, criterion in cursor.fetchall():
+        if criterion in scoring.PRIMARY_CRITERIA:
+            continue
+        criteria.setdefault(evaluation_type, []).append(str(criterion))
+    return {evaluation_type: sorted(names, key=_criterion_order) for evaluation_type, names in criteria.items()}
+
+
+def _criteria_frame(pd, cursor, evaluation_ids, archived):
+    """청크의 항목별 점수를 평가 id x 항목 표로 (pivot 한 번)"""
+    queries.execute(cursor, 'archive_evaluation_scores_for_ids' if archived else 'evaluation_scores_for_ids',
+                    in_values=evaluation_ids)
+    scores = pd.DataFrame(cursor.fetchall(), columns=['evaluation_id', 'criterion', 'value'])
+    scores['value'] = scores['value'].map(scoring.to_number)
+    return scores.pivot(index='evaluation_id', columns='criterion', values='value')
+
+
+class _TypeSheet:
+    """평가 유형 시트 하나와 요약 집계"""
+
+    def __init__(self, workbook, evaluation_type, criteria):
+        self.label = EVALUATION_TYPE_LABELS.get(evaluation_type, evaluation_type)
+        self.criteria = criteria
+        width = len(LEADING_COLUMNS) + 1 + len(criteria) + len(TRAILING_COLUMNS)
+        if width > MAX_COLUMNS:
+            raise ValueError(f'{self.label} 시트의 항목 컬럼이 너무 많습니다 ({width}개, 최대 {MAX_COLUMNS}개)')
+        # 엑셀 시트 이름은 31자까지
+        self.sheet = workbook.create_sheet(self.label[:31])
+        self.sheet.append(LEADING_COLUMNS + ['대표 점수'] + criteria + TRAILING_COLUMNS)
+        self.count = 0
+        self.final_count = 0
+        # 대표 점수 [입력 건수, 합계, 최저, 최고]
+        self.score_stats = [0, 0, None, None]
+        # 항목 -> [입력 건수, 합계]
+        self.criterion_totals = {criterion: [0, 0] for criterion in criteria}
+
+    def add_score(self, score):
+        stats = self.score_stats
+        stats[0] += 1
+        stats[1] += score
+        stats[2] = score if stats[2] is None else min(stats[2], score)
+        stats[3] = score if stats[3] is None else max(stats[3], score)
+
+    def summary_row(self):
+        count, total, lowest, highest = self.score_stats
+        return [self.label, self.count, self.final_count, count,
+                round(total / count, 2) if count else None, lowest, highest]
+
+
+def build_evaluation_workbook(conn, postgresql, enrich, cycle=None, output=None, progress=None):
+    """평가 데이터 엑셀 파일을 output(없으면 임시 파일)에 쓰고, 임시 파일이면 처음 위치로 되감아 반환.
+    요약 시트와 평가 유형별 시트(항목별 점수를 숫자 컬럼으로)를 평가 행 한 번 순회로 만든다.
+    enrich(df, id_columns)는 직원 정보 컬럼을 붙이는 함수, cycle을 주면 보관된 지난 주기를 내보낸다.
+    progress(지금까지 쓴 행 수)는 청크를 쓸 때마다 호출된다"""
+    pd = startup.lazy_import('pandas')
+    openpyxl = startup.lazy_import('openpyxl')
+
+    if postgresql:
+        conn.autocommit = False
+    score_cursor = conn.cursor()
+    archived = cycle is not None
+    criteria_by_type = _export_criteria(score_cursor, cycle)
+
+    # write-only 시트는 만든 순서대로 저장되므로 요약 시트를 먼저 만들고 마지막에 채운다
+    workbook = openpyxl.Workbook(write_only=True)
+    summary = workbook.create_sheet(SUMMARY_SHEET)
+    sheets = {}
+    for evaluation_type in list(EVALUATION_TYPE_LABELS) + sorted(set(criteria_by_type) - set(EVALUATION_TYPE_LABELS)):
+        sheets[evaluation_type] = _TypeSheet(workbook, evaluation_type, criteria_by_type.get(evaluation_type, []))
+
+    if archived:
+        chunks = iter_chunks(conn, postgresql, 'archive_evaluation_export', (cycle,))
+    else:
+        chunks = iter_chunks(conn, postgresql, 'evaluation_export')
+    written = 0
+    for rows in chunks:
+        # DB 값(Decimal, datetime 등)을 그대로 엑셀에 쓰도록 object 컬럼으로 둔다
+        chunk = pd.DataFrame(rows, columns=['id', 'evaluator_id', 'evaluatee_id', 'evaluation_type', 'score',
+                                            'is_final', 'comments', 'created_at'], dtype=object)
+        chunk['evaluator_id'] = chunk['evaluator_id'].astype(str)
+        chunk['evaluatee_id'] = chunk['evaluatee_id'].astype(str)
+        # 청크 단위로 평가자/피평가자 정보를 사번 기준 merge로, 항목별 점수를 pivot으로 붙인다
+        chunk = enrich(chunk, {'evaluator_id': 'evaluator_', 'evaluatee_id': 'evaluatee_'})
+        criteria = _criteria_frame(pd, score_cursor, chunk['id'].tolist(), archived)
+        for evaluation_type, group in chunk.groupby('evaluation_type', sort=False):
+            type_sheet = sheets.get(evaluation_type)
+            if type_sheet is None:
+                type_sheet = sheets[evaluation_type] = _TypeSheet(workbook, evaluation_type, [])
+            values = criteria.reindex(index=group['id'], columns=type_sheet.criteria)
+            for criterion in type_sheet.criteria:
+                column = values[criterion].dropna()
+                type_sheet.criterion_totals[criterion][0] += len(column)
+                type_sheet.criterion_totals[criterion][1] += float(column.sum()) if len(column) else 0
+            values = values.astype(object).where(values.notna(), None)
+            for row, criterion_values in zip(group.itertuples(index=False), values.itertuples(index=False, name=None)):
+                score = scoring.to_number(row.score)
+                type_sheet.count += 1
+                if row.is_final:
+                    type_sheet.final_count += 1
+                if score is not None:
+                    type_sheet.add_score(score)
+                type_sheet.sheet.append([
+                    row.evaluator_id, row.evaluator_name, row.evaluator_team, row.evaluator_position,
+                    row.evaluatee_id, row.evaluatee_name, row.evaluatee_team, row.evaluatee_position, row.evaluatee_grade,
+                    score, *criterion_values,
+                    'Y' if row.is_final else 'N',
+                    row.comments if row.comments else '',
+                    row.created_at
+                ])
+        written += len(rows)
+        if progress is not None:
+            progress(written)
+    score_cursor.close()
+
+    summary.append(['평가 유형', '건수', '최종제출', '점수 입력', '평균 점수', '최저 점수', '최고 점수'])
+    for type_sheet in sheets.values():
+        summary.append(type_sheet.summary_row())
+    summary.append([])
+    summary.append(['평가 유형', '항목', '점수 입력', '평균 점수'])
+    for type_sheet in sheets.values():
+        for criterion, (count, total) in type_sheet.criterion_totals.items():
+            summary.append([type_sheet.label, criterion, count, round(total / count, 2) if count else None])
+
+    if output is not None:
+        workbook.save(output)
+        return output
+    output = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES, suffix='.xlsx')
+    workbook.save(output)
+    output.seek(0)
+    return output
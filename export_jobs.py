@@ -0,0 +1,275 @@
+"""엑셀 내보내기 작업 (백그라운드 생성 + 데이터 버전별 파일 캐시)
+
+관리자가 내보내기를 요청하면 요청을 처리한 워커의 백그라운드 스레드가 파일을 만들고,
+진행 상황과 결과는 EXPORT_DIR의 작업 파일({작업 id}.json)과 결과 파일({작업 id}.xlsx)에 남긴다.
+작업 id는 내보낼 데이터의 버전(평가/점수 집계, 주기, 명단 버전)을 해시한 값이라
+데이터가 바뀌지 않았으면 같은 id가 나오고, 이미 만든 파일을 바로 내려준다 (ETag로도 사용).
+작업 파일은 디스크에 있으므로 어느 워커가 상태/다운로드 요청을 받아도 같은 결과를 본다.
+
+    EXPORT_DIR          작업/결과 파일 디렉터리 (기본값: 프로젝트 루트의 exports)
+    EXPORT_CACHE_KEEP   보관할 결과 파일 수 (기본값: 20, 오래된 것부터 삭제)
+    EXPORT_MAX_RUNNING  워커당 동시에 만드는 파일 수 (기본값: 1, 나머지는 대기)
+    EXPORT_JOB_STALE    진행 상황이 이 시간(초) 동안 갱신되지 않으면 실패로 본다 (기본값: 600)
+    EXPORT_WAIT_SECONDS /download_excel이 파일을 기다리는 최대 시간(초), 넘으면 202로 작업 id를 알려준다
+                        (기본값: 20, gunicorn timeout보다 짧아야 한다)
+"""
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from datetime import datetime
+
+EXPORT_DIR = os.environ.get('EXPORT_DIR') or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'exports')
+CACHE_KEEP = max(1, int(os.environ.get('EXPORT_CACHE_KEEP', '20')))
+MAX_RUNNING = max(1, int(os.environ.get('EXPORT_MAX_RUNNING', '1')))
+STALE_SECONDS = float(os.environ.get('EXPORT_JOB_STALE', '600'))
+WAIT_SECONDS = float(os.environ.get('EXPORT_WAIT_SECONDS', '20'))
+# 대기 중인 작업도 이 간격으로 작업 파일을 갱신해 중단된 작업으로 보이지 않게 한다
+HEARTBEAT_SECONDS = max(1.0, min(30.0, STALE_SECONDS / 4))
+# 작업을 맡는 동안만 있는 claim 파일이 이보다 오래되었으면 맡던 프로세스가 종료된 것으로 본다
+CLAIM_STALE_SECONDS = 60
+# 파일 형식이 바뀌면 올려서 이전 형식의 캐시를 쓰지 않게 한다
+FORMAT_VERSION = 3
+
+_JOB_ID = re.compile(r'^[0-9a-f]{32}$')
+
+_build = None
+_lock = threading.Lock()
+_running = threading.BoundedSemaphore(MAX_RUNNING)
+_stats = {'started': 0, 'completed': 0, 'failed': 0, 'cache_hits': 0}
+
+
+def _reset_after_fork():
+    """fork된 자식은 부모의 작업 스레드를 이어받지 않는다"""
+    global _lock, _running
+    _lock = threading.Lock()
+    _running = threading.BoundedSemaphore(MAX_RUNNING)
+    for key in _stats:
+        _stats[key] = 0
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def configure(build):
+    """파일을 만드는 함수 등록: build(cycle, output, progress)는 output(바이너리 파일)에 엑셀을 쓰고
+    평가 행을 쓸 때마다 progress(지금까지 쓴 행 수)를 호출한다 (cycle이 None이면 활성 주기)"""
+    global _build
+    _build = build
+
+
+def job_id_for(data_version):
+    """데이터 버전 -> 작업 id (같은 데이터면 같은 id)"""
+    key = repr((FORMAT_VERSION, data_version)).encode('utf-8')
+    return hashlib.sha256(key).hexdigest()[:32]
+
+
+def is_job_id(value):
+    return bool(_JOB_ID.match(value or ''))
+
+
+def _job_path(job_id):
+    return os.path.join(EXPORT_DIR, f'{job_id}.json')
+
+
+def artifact_path(job_id):
+    """완성된 결과 파일 경로 (없으면 None)"""
+    path = os.path.join(EXPORT_DIR, f'{job_id}.xlsx')
+    return path if os.path.exists(path) else None
+
+
+def _write_status(job_id, status):
+    status['updated_at'] = time.time()
+    tmp_path = f'{_job_path(job_id)}.{os.getpid()}.{threading.get_ident()}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(status, f, ensure_ascii=False)
+    os.replace(tmp_path, _job_path(job_id))
+
+
+def _read_status(job_id):
+    try:
+        with open(_job_path(job_id), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def status(job_id):
+    """작업 상태 dict (queued/running/done/failed, 진행률 등). 없는 작업이면 None"""
+    if not is_job_id(job_id):
+        return None
+    job = _read_status(job_id)
+    if job is None:
+        return None
+    if job['status'] == 'done' and artifact_path(job_id) is None:
+        # 결과 파일이 정리되었으면 다시 만들어야 한다
+        job['status'] = 'expired'
+    elif job['status'] in ('queued', 'running') and time.time() - job['updated_at'] > STALE_SECONDS:
+        # 작업하던 워커가 종료된 경우
+        job['status'] = 'failed'
+        job['error'] = '내보내기 작업이 중단되었습니다.'
+    total = job.get('total_rows') or 0
+    job['progress'] = 100 if job['status'] == 'done' else (min(99, int(job['rows'] * 100 / total)) if total else 0)
+    return job
+
+
+def _claim(job_id, job):
+    """이 워커가 작업을 맡는다. 다른 워커가 진행 중이거나 같은 작업을 맡는 중이면 False.
+    O_EXCL로 만든 claim 파일을 가진 프로세스만 작업 파일을 확인하고 쓰므로
+    새 작업과 실패/만료된 작업을 다시 맡는 경우 모두 한 워커만 성공한다"""
+    os.makedirs(EXPORT_DIR, exist_ok=True)
+    claim_path = f'{_job_path(job_id)}.claim'
+    try:
+        fd = os.open(claim_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+    except FileExistsError:
+        try:
+            if time.time() - os.path.getmtime(claim_path) > CLAIM_STALE_SECONDS:
+                # 작업을 맡던 프로세스가 종료되어 남은 claim 파일
+                os.remove(claim_path)
+        except OSError:
+            pass
+        return False
+    os.close(fd)
+    try:
+        current = status(job_id)
+        if current is not None and current['status'] in ('queued', 'running', 'done'):
+            return False
+        # 새 작업 또는 실패/만료/깨진 작업 (작업 파일은 os.replace로 한 번에 바뀐다)
+        _write_status(job_id, job)
+        return True
+    finally:
+        os.remove(claim_path)
+
+
+def _prune():
+    """오래된 결과 파일과 작업 파일을 CACHE_KEEP개만 남기고 정리.
+    결과 파일 없이 남은 작업 파일(실패/중단된 작업)과 임시 파일도 STALE_SECONDS가 지나면 지운다"""
+    try:
+        names = os.listdir(EXPORT_DIR)
+    except OSError:
+        return
+    paths = sorted((os.path.join(EXPORT_DIR, name) for name in names if name.endswith('.xlsx')),
+                   key=os.path.getmtime, reverse=True)
+    removals = []
+    for path in paths[CACHE_KEEP:]:
+        removals.extend((path, path[:-len('.xlsx')] + '.json'))
+    artifacts = set(names)
+    cutoff = time.time() - STALE_SECONDS
+    for name in names:
+        orphaned = name.endswith('.json') and f'{name[:-len(".json")]}.xlsx' not in artifacts
+        if orphaned or name.endswith('.tmp') or name.endswith('.claim'):
+            path = os.path.join(EXPORT_DIR, name)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    removals.append(path)
+            except OSError:
+                pass
+    for stale in removals:
+        try:
+            os.remove(stale)
+        except OSError:
+            pass
+
+
+def _run(job_id, job):
+    """결과 파일 생성 (임시 파일에 쓴 뒤 이름을 바꿔 완성된 파일만 보이게 한다)"""
+    tmp_path = os.path.join(EXPORT_DIR, f'{job_id}.{os.getpid()}.xlsx.tmp')
+    while not _running.acquire(timeout=HEARTBEAT_SECONDS):
+        # 앞선 작업을 기다리는 동안에도 살아 있음을 남긴다
+        _write_status(job_id, job)
+    try:
+        job.update(status='running', started_at=datetime.now().isoformat(timespec='seconds'))
+        _write_status(job_id, job)
+
+        def progress(rows):
+            job['rows'] = rows
+            _write_status(job_id, job)
+
+        started = time.perf_counter()
+        try:
+            with open(tmp_path, 'wb') as output:
+                _build(job['cycle'], output, progress)
+            os.replace(tmp_path, os.path.join(EXPORT_DIR, f'{job_id}.xlsx'))
+        except Exception as e:
+            print(f"[export] 내보내기 실패 ({job_id}): {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            job.update(status='failed', error=str(e))
+            _write_status(job_id, job)
+            with _lock:
+                _stats['failed'] += 1
+            _prune()
+            return job
+    finally:
+        _running.release()
+    job.update(status='done', size=os.path.getsize(os.path.join(EXPORT_DIR, f'{job_id}.xlsx')),
+               duration_ms=round((time.perf_counter() - started) * 1000, 1),
+               finished_at=datetime.now().isoformat(timespec='seconds'))
+    _write_status(job_id, job)
+    with _lock:
+        _stats['completed'] += 1
+    print(f"[export] 내보내기 완료 ({job_id}): {job['rows']}건, {job['size']} bytes, {job['duration_ms']}ms")
+    _prune()
+    return job
+
+
+def _new_job(job_id, cycle, filename, total_rows):
+    return {
+        'job_id': job_id,
+        'status': 'queued',
+        'cycle': cycle,
+        'filename': filename,
+        'rows': 0,
+        'total_rows': total_rows,
+        'error': None,
+        'pid': os.getpid(),
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+    }
+
+
+def _status_or(job_id, job):
+    """작업 상태. 다른 워커가 작업 파일을 쓰기 전이면 job(대기 중인 자리표시)을 그대로 반환"""
+    current = status(job_id)
+    return current if current is not None else dict(job, progress=0)
+
+
+def start(job_id, cycle, filename, total_rows):
+    """백그라운드 작업 시작 (이미 만든 파일이 있거나 다른 워커가 진행 중이면 그 상태를 반환).
+    항상 상태 dict를 반환한다"""
+    current = status(job_id)
+    if current is not None and current['status'] == 'done':
+        with _lock:
+            _stats['cache_hits'] += 1
+        return current
+    job = _new_job(job_id, cycle, filename, total_rows)
+    if not _claim(job_id, job):
+        return _status_or(job_id, job)
+    with _lock:
+        _stats['started'] += 1
+    threading.Thread(target=_run, args=(job_id, job), name=f'export-{job_id[:8]}', daemon=True).start()
+    return _status_or(job_id, job)
+
+
+def wait(job_id, timeout=WAIT_SECONDS):
+    """작업이 끝나거나(done/failed/expired) timeout초가 지날 때까지 기다린 뒤 상태 반환.
+    다른 워커가 작업 파일을 아직 쓰지 않았으면 None일 수 있다"""
+    deadline = time.monotonic() + timeout
+    job = status(job_id)
+    while (job is None or job['status'] in ('queued', 'running')) and time.monotonic() < deadline:
+        time.sleep(0.5)
+        job = status(job_id)
+    return job
+
+
+def stats():
+    """내보내기 작업 현황 (워커 기준)"""
+    with _lock:
+        result = dict(_stats)
+    result['export_dir'] = EXPORT_DIR
+    result['pid'] = os.getpid()
+    return result
@@ -1,5 +1,7 @@
 """Gunicorn configuration file"""
 import os
+import subprocess
+import sys
 
 # Server socket
 bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
@@ -33,3 +35,26 @@ tmp_upload_dir = None
 keyfile = None
 certfile = None
 
+
+# Schema migrations run once in the master before workers start.
+# They run in a separate process so the master never imports the app;
+# workers inherit SCHEMA_MIGRATED=1 and skip the first-request check.
+def on_starting(server):
+    result = subprocess.run(
+        [sys.executable, '-m', 'flask', '--app', 'eva', 'migrate'],
+        capture_output=True, text=True,
+    )
+    print(result.stdout, end='')
+    if result.returncode == 0:
+        os.environ['SCHEMA_MIGRATED'] = '1'
+    else:
+        # Workers will retry on their first request
+        print(f"Schema migration failed: {result.stderr.strip()[-500:]}")
+
+
+# Write any evaluation saves still queued by the write-behind queue
+# (EVALUATION_WRITE_MODE=group/buffered) before the worker exits.
+def worker_exit(server, worker):
+    write_queue = sys.modules.get('write_queue')
+    if write_queue is not None:
+        write_queue.shutdown()
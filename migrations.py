@@ -0,0 +1,345 @@
+"""버전 관리되는 DB 스키마 마이그레이션 (SQLite / PostgreSQL)
+
+적용된 버전은 schema_version 테이블에 기록되고, 아직 적용되지 않은 마이그레이션만 순서대로 실행한다.
+여러 프로세스가 동시에 실행해도 한 번만 적용되도록 DB 잠금 안에서 실행한다
+(PostgreSQL: advisory lock, SQLite: BEGIN IMMEDIATE). 배포/기동 시 한 번 실행하며
+요청 처리 중에는 DDL을 실행하지 않는다.
+
+    flask --app eva migrate
+"""
+import cycles
+import scoring
+
+# pg_advisory_xact_lock 키 (임의의 고정값)
+MIGRATION_LOCK_KEY = 7301
+
+EVALUATION_DATA_UNIQUE_INDEX = 'ux_evaluation_data_evaluator_evaluatee_type'
+
+
+def _id_column(postgresql):
+    return 'SERIAL PRIMARY KEY' if postgresql else 'INTEGER PRIMARY KEY AUTOINCREMENT'
+
+
+def _query(sql, postgresql):
+    return sql.replace('?', '%s') if postgresql else sql
+
+
+def _has_column(cursor, postgresql, table, column):
+    if postgresql:
+        cursor.execute(
+            'SELECT 1 FROM information_schema.columns WHERE table_name = %s AND column_name = %s',
+            (table, column),
+        )
+        return cursor.fetchone() is not None
+    cursor.execute(f'PRAGMA table_info({table})')
+    return any(row[1] == column for row in cursor.fetchall())
+
+
+def _initial_schema(cursor, postgresql):
+    """실적/평가/조직도 테이블"""
+    id_column = _id_column(postgresql)
+
+    # 실적 데이터 테이블 (최대 10개 실적 지원)
+    cursor.execute(f'''
+        CREATE TABLE IF NOT EXISTS performance_data (
+            id {id_column},
+            employee_id TEXT NOT NULL,
+            performance_order INTEGER NOT NULL,
+            project_name TEXT NOT NULL,
+            performance TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            is_finalized BOOLEAN DEFAULT FALSE,
+            UNIQUE(employee_id, performance_order)
+        )
+    ''')
+
+    # 평가 데이터 테이블
+    cursor.execute(f'''
+        CREATE TABLE IF NOT EXISTS evaluation_data (
+            id {id_column},
+            evaluator_id TEXT NOT NULL,
+            evaluatee_id TEXT NOT NULL,
+            evaluation_type TEXT NOT NULL,
+            scores TEXT,
+            comments TEXT,
+            is_final INTEGER DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    # is_final 컬럼이 생기기 전에 만들어진 테이블
+    if not _has_column(cursor, postgresql, 'evaluation_data', 'is_final'):
+        cursor.execute('ALTER TABLE evaluation_data ADD COLUMN is_final INTEGER DEFAULT 0')
+
+    # 조직도 관련 테이블
+    parent_foreign_key = '' if postgresql else ',\n            FOREIGN KEY (parent_id) REFERENCES departments(id) ON DELETE SET NULL'
+    cursor.execute(f'''
+        CREATE TABLE IF NOT EXISTS departments (
+            id {id_column},
+            name TEXT NOT NULL,
+            leader_position TEXT,
+            parent_id INTEGER,
+            display_order INTEGER DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP{parent_foreign_key}
+        )
+    ''')
+
+    cursor.execute(f'''
+        CREATE TABLE IF NOT EXISTS department_employees (
+            id {id_column},
+            department_id INTEGER NOT NULL,
+            employee_id TEXT NOT NULL,
+            position TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (department_id) REFERENCES departments(id) ON DELETE CASCADE,
+            UNIQUE(department_id, employee_id)
+        )
+    ''')
+
+
+def _roster_tables(cursor, postgresql):
+    """직원 명단 / 평가자 배정 테이블 (import-roster 명령으로 CSV에서 적재)"""
+    id_column = _id_column(postgresql)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS employees (
+            employee_id TEXT PRIMARY KEY,
+            password TEXT,
+            name TEXT,
+            team TEXT,
+            position TEXT,
+            grade TEXT,
+            before_point INTEGER,
+            sort_order INTEGER DEFAULT 0,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    cursor.execute(f'''
+        CREATE TABLE IF NOT EXISTS evaluation_assignments (
+            id {id_column},
+            mapping_key TEXT NOT NULL,
+            evaluator_id TEXT NOT NULL,
+            evaluatee_id TEXT NOT NULL,
+            sort_order INTEGER DEFAULT 0,
+            UNIQUE(mapping_key, evaluator_id, evaluatee_id)
+        )
+    ''')
+
+    # import-roster 실행 이력 (MAX(id)가 명단 버전 역할)
+    cursor.execute(f'''
+        CREATE TABLE IF NOT EXISTS roster_imports (
+            id {id_column},
+            employee_count INTEGER,
+            assignment_count INTEGER,
+            imported_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    # UNIQUE 제약이 (mapping_key, evaluator_id) 조회를, 아래 인덱스가 역방향/조직 조회를 담당
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_evaluation_assignments_evaluatee ON evaluation_assignments (mapping_key, evaluatee_id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_department_employees_employee ON department_employees (employee_id)')
+
+
+def _evaluation_data_indexes(cursor, postgresql):
+    """evaluation_data 복합 인덱스와 (평가자, 피평가자, 평가 유형) UNIQUE 제약.
+    중복 행을 먼저 정리한다 (최종제출 > 최신 > 마지막 id 순으로 1건 유지)"""
+    cursor.execute('''
+        DELETE FROM evaluation_data WHERE id IN (
+            SELECT id FROM (
+                SELECT id, ROW_NUMBER() OVER (
+                    PARTITION BY evaluator_id, evaluatee_id, evaluation_type
+                    ORDER BY is_final DESC, created_at DESC, id DESC
+                ) AS duplicate_rank
+                FROM evaluation_data
+            ) ranked
+            WHERE duplicate_rank > 1
+        )
+    ''')
+    if cursor.rowcount and cursor.rowcount > 0:
+        print(f"evaluation_data 중복 평가 {cursor.rowcount}건 정리")
+    cursor.execute(f'''
+        CREATE UNIQUE INDEX IF NOT EXISTS {EVALUATION_DATA_UNIQUE_INDEX}
+        ON evaluation_data (evaluator_id, evaluatee_id, evaluation_type)
+    ''')
+    # 평가자별 임시저장/최종제출 조회 (get_saved_evaluation, check_final_submit_status, finalize_evaluation)
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_evaluation_data_evaluator_type ON evaluation_data (evaluator_id, evaluation_type, is_final)')
+    # 피평가자별 점수 조회 (팀장 점수 오버레이)
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_evaluation_data_evaluatee_type ON evaluation_data (evaluatee_id, evaluation_type)')
+
+
+def _structured_scores(cursor, postgresql):
+    """scores(JSON 문자열)를 숫자 score 컬럼과 항목별 evaluation_scores 테이블로 정규화하고 기존 행을 백필"""
+    if not _has_column(cursor, postgresql, 'evaluation_data', 'score'):
+        cursor.execute('ALTER TABLE evaluation_data ADD COLUMN score NUMERIC')
+    # SQLite는 foreign_keys를 켜지 않으므로 평가 삭제 시 항목 점수도 직접 지운다
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS evaluation_scores (
+            evaluation_id INTEGER NOT NULL REFERENCES evaluation_data(id) ON DELETE CASCADE,
+            criterion TEXT NOT NULL,
+            value NUMERIC,
+            PRIMARY KEY (evaluation_id, criterion)
+        )
+    ''')
+
+    _backfill_scores(cursor, postgresql, 'evaluation_data', 'evaluation_scores')
+
+
+def _backfill_scores(cursor, postgresql, data_table, scores_table):
+    """data_table의 scores(JSON)로 대표 점수(score)와 scores_table의 항목별 점수를 다시 만든다"""
+    cursor.execute(f'SELECT id, evaluatee_id, scores FROM {data_table}')
+    score_updates = []
+    criteria_rows = []
+    for evaluation_id, evaluatee_id, scores in cursor.fetchall():
+        score, criteria = scoring.normalize_scores(scores, evaluatee_id)
+        score_updates.append((score, evaluation_id))
+        criteria_rows.extend((evaluation_id, criterion, value) for criterion, value in criteria.items())
+    cursor.execute(f'DELETE FROM {scores_table}')
+    if score_updates:
+        cursor.executemany(_query(f'UPDATE {data_table} SET score = ? WHERE id = ?', postgresql), score_updates)
+    if criteria_rows:
+        cursor.executemany(
+            _query(f'INSERT INTO {scores_table} (evaluation_id, criterion, value) VALUES (?, ?, ?)', postgresql),
+            criteria_rows,
+        )
+    if score_updates:
+        print(f"{data_table} 점수 백필: {len(score_updates)}건")
+
+
+def _evaluation_cycles(cursor, postgresql):
+    """평가 주기(cycle) 테이블, evaluation_data/performance_data의 cycle 컬럼, 지난 주기 보관(archive) 테이블.
+    기존 행은 첫 주기(EVALUATION_CYCLE, 기본값: 올해)로 기록한다"""
+    initial_cycle = cycles.initial_cycle_name()
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS evaluation_cycles (
+            cycle TEXT PRIMARY KEY,
+            status TEXT NOT NULL DEFAULT 'active',
+            started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            closed_at TIMESTAMP
+        )
+    ''')
+    cursor.execute('SELECT COUNT(*) FROM evaluation_cycles')
+    if cursor.fetchone()[0] == 0:
+        cursor.execute(_query("INSERT INTO evaluation_cycles (cycle, status) VALUES (?, 'active')", postgresql), (initial_cycle,))
+
+    for table in ('evaluation_data', 'performance_data'):
+        if not _has_column(cursor, postgresql, table, 'cycle'):
+            cursor.execute(f'ALTER TABLE {table} ADD COLUMN cycle TEXT')
+        cursor.execute(_query(f'UPDATE {table} SET cycle = ? WHERE cycle IS NULL', postgresql), (initial_cycle,))
+
+    # 지난 주기 보관 테이블 (원래 id 유지, 활성 주기 테이블과 같은 컬럼)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS evaluation_data_archive (
+            id INTEGER PRIMARY KEY,
+            cycle TEXT NOT NULL,
+            evaluator_id TEXT NOT NULL,
+            evaluatee_id TEXT NOT NULL,
+            evaluation_type TEXT NOT NULL,
+            scores TEXT,
+            score NUMERIC,
+            comments TEXT,
+            is_final INTEGER DEFAULT 0,
+            created_at TIMESTAMP
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS evaluation_scores_archive (
+            evaluation_id INTEGER NOT NULL,
+            criterion TEXT NOT NULL,
+            value NUMERIC,
+            PRIMARY KEY (evaluation_id, criterion)
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS performance_data_archive (
+            id INTEGER PRIMARY KEY,
+            cycle TEXT NOT NULL,
+            employee_id TEXT NOT NULL,
+            performance_order INTEGER NOT NULL,
+            project_name TEXT NOT NULL,
+            performance TEXT NOT NULL,
+            created_at TIMESTAMP,
+            is_finalized BOOLEAN DEFAULT FALSE
+        )
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_evaluation_data_archive_cycle ON evaluation_data_archive (cycle, evaluation_type)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_performance_data_archive_cycle ON performance_data_archive (cycle, employee_id)')
+
+
+def _admin_filter_indexes(cursor, postgresql):
+    """관리자 목록 API 필터용 인덱스 (피평가자별 실적, 소속별 직원)"""
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_performance_data_employee ON performance_data (employee_id, is_finalized)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_employees_team ON employees (team)')
+
+
+def _normalized_criteria(cursor, postgresql):
+    """사번 접미사가 붙은 항목 이름(attitude_1_11230045)을 정규화하고, score/total이 없던 평가의
+    대표 점수를 항목 합계로 다시 계산 (활성 주기와 보관 테이블 모두)"""
+    _backfill_scores(cursor, postgresql, 'evaluation_data', 'evaluation_scores')
+    _backfill_scores(cursor, postgresql, 'evaluation_data_archive', 'evaluation_scores_archive')
+
+
+# (버전, 설명, 적용 함수). 이미 배포된 항목은 수정하지 말고 새 버전을 뒤에 추가한다
+MIGRATIONS = [
+    (1, 'initial schema', _initial_schema),
+    (2, 'roster tables', _roster_tables),
+    (3, 'evaluation_data unique key and indexes', _evaluation_data_indexes),
+    (4, 'structured evaluation scores', _structured_scores),
+    (5, 'evaluation cycles and archive tables', _evaluation_cycles),
+    (6, 'admin list filter indexes', _admin_filter_indexes),
+    (7, 'normalized criterion names and summed primary scores', _normalized_criteria),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def current_version(cursor):
+    """적용된 최신 스키마 버전 (schema_version 테이블이 없으면 0)"""
+    try:
+        cursor.execute('SELECT MAX(version) FROM schema_version')
+    except Exception:
+        return 0
+    row = cursor.fetchone()
+    return (row[0] or 0) if row else 0
+
+
+def migrate(conn, postgresql):
+    """잠금을 잡고 적용되지 않은 마이그레이션을 한 트랜잭션으로 실행. 적용한 버전 목록 반환"""
+    cursor = conn.cursor()
+    if postgresql:
+        conn.autocommit = False
+        # 트랜잭션이 끝나면 자동으로 풀리는 잠금
+        cursor.execute('SELECT pg_advisory_xact_lock(%s)', (MIGRATION_LOCK_KEY,))
+    else:
+        # 쓰기 잠금을 먼저 잡아 다른 워커가 동시에 마이그레이션하지 못하게 한다
+        conn.isolation_level = None
+        cursor.execute('BEGIN IMMEDIATE')
+    applied = []
+    try:
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS schema_version (
+                version INTEGER PRIMARY KEY,
+                description TEXT,
+                applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        version = current_version(cursor)
+        for migration_version, description, apply in MIGRATIONS:
+            if migration_version <= version:
+                continue
+            apply(cursor, postgresql)
+            cursor.execute(
+                _query('INSERT INTO schema_version (version, description) VALUES (?, ?)', postgresql),
+                (migration_version, description),
+            )
+            applied.append(migration_version)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        if not postgresql:
+            conn.isolation_level = ''
+    for migration_version in applied:
+        print(f"스키마 마이그레이션 적용: {migration_version}")
+    return applied
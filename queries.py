@@ -0,0 +1,477 @@
+"""이름 있는 SQL 문장 레지스트리
+
+eva.py의 쿼리를 이름으로 등록해 두고, 모듈을 불러올 때 SQLite/PostgreSQL용으로 한 번만 변환한다.
+요청마다 플레이스홀더를 바꾸거나 DB 종류를 환경변수로 확인하지 않는다.
+
+    queries.execute(cursor, 'evaluation_final_count', (evaluator_id, evaluation_type))
+
+PostgreSQL에서는 연결마다 처음 실행할 때 PREPARE로 서버에 준비해 두고 이후에는 EXECUTE로 재사용한다.
+IN 목록처럼 자리표시자 개수가 바뀌는 문장({in})은 개수별로 변환해 캐시하며 서버에 준비하지 않는다.
+선택 조건이 붙는 문장({where})은 FILTERS에 등록된 조건 중 값이 주어진 것만 AND로 묶어 같은 방식으로 캐시한다.
+문장은 SQLite 형식('?' 자리표시자)으로 작성한다.
+"""
+import re
+import sqlite3
+import weakref
+
+_WHITESPACE = re.compile(r'\s+')
+
+EMPLOYEE_SELECT = 'SELECT e.employee_id, e.password, e.name, e.team, e.position, e.grade, e.before_point FROM employees e'
+
+DEPARTMENT_EMPLOYEE_SELECT = 'SELECT de.id, de.employee_id, de.position FROM department_employees de'
+
+STATEMENTS = {
+    # 명단 (ROSTER_SOURCE=db)
+    'employee_by_id': EMPLOYEE_SELECT + ' WHERE e.employee_id = ?',
+    'evaluatees_for_evaluator': EMPLOYEE_SELECT + '''
+        JOIN evaluation_assignments a ON a.evaluatee_id = e.employee_id
+        WHERE a.mapping_key = ? AND a.evaluator_id = ?
+        ORDER BY a.sort_order
+    ''',
+    'evaluators_for_evaluatee': '''
+        SELECT evaluator_id FROM evaluation_assignments
+        WHERE mapping_key = ? AND evaluatee_id = ?
+        ORDER BY sort_order
+    ''',
+    'roster_version': 'SELECT MAX(id) FROM roster_imports',
+    'roster_clear_assignments': 'DELETE FROM evaluation_assignments',
+    'roster_clear_employees': 'DELETE FROM employees',
+    'roster_insert_employee': '''
+        INSERT INTO employees (employee_id, password, name, team, position, grade, before_point, sort_order)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ''',
+    'roster_insert_assignment': '''
+        INSERT INTO evaluation_assignments (mapping_key, evaluator_id, evaluatee_id, sort_order)
+        VALUES (?, ?, ?, ?)
+    ''',
+    'roster_insert_import': 'INSERT INTO roster_imports (employee_count, assignment_count) VALUES (?, ?)',
+
+    # 실적
+    'performance_draft_orders': 'SELECT performance_order FROM performance_data WHERE employee_id = ? AND is_finalized = FALSE',
+    'performance_update_draft': '''
+        UPDATE performance_data
+        SET project_name = ?, performance = ?, created_at = CURRENT_TIMESTAMP
+        WHERE employee_id = ? AND performance_order = ? AND is_finalized = FALSE
+    ''',
+    'performance_insert': '''
+        INSERT INTO performance_data (employee_id, performance_order, project_name, performance, cycle)
+        VALUES (?, ?, ?, ?, (SELECT cycle FROM evaluation_cycles WHERE status = 'active'))
+    ''',
+    'performance_by_employee': '''
+        SELECT performance_order, project_name, performance, created_at, is_finalized
+        FROM performance_data
+        WHERE employee_id = ?
+        ORDER BY performance_order
+    ''',
+    'performance_draft_count': 'SELECT COUNT(*) FROM performance_data WHERE employee_id = ? AND is_finalized = FALSE',
+    'performance_finalize': '''
+        UPDATE performance_data
+        SET is_finalized = TRUE
+        WHERE employee_id = ? AND is_finalized = FALSE
+    ''',
+    'performance_final_by_employee': '''
+        SELECT performance_order, project_name, performance, created_at
+        FROM performance_data
+        WHERE employee_id = ? AND is_finalized = TRUE
+        ORDER BY performance_order
+    ''',
+    'performance_delete_by_employee': 'DELETE FROM performance_data WHERE employee_id = ?',
+
+    # 평가
+    # 새 행은 활성 주기로 기록 (주기를 바꾸는 archive와 같은 트랜잭션 안에서 항상 최신 값)
+    'evaluation_upsert': '''
+        INSERT INTO evaluation_data (evaluator_id, evaluatee_id, evaluation_type, scores, score, comments, is_final, cycle)
+        VALUES (?, ?, ?, ?, ?, ?, 0, (SELECT cycle FROM evaluation_cycles WHERE status = 'active'))
+        ON CONFLICT (evaluator_id, evaluatee_id, evaluation_type) DO UPDATE
+        SET scores = excluded.scores, score = excluded.score, comments = excluded.comments,
+            is_final = 0, created_at = CURRENT_TIMESTAMP
+    ''',
+    'evaluation_ids_for_evaluatees': '''
+        SELECT id, evaluatee_id FROM evaluation_data
+        WHERE evaluator_id = ? AND evaluation_type = ? AND evaluatee_id IN ({in})
+    ''',
+    'evaluation_scores_delete': 'DELETE FROM evaluation_scores WHERE evaluation_id IN ({in})',
+    'evaluation_scores_insert': 'INSERT INTO evaluation_scores (evaluation_id, criterion, value) VALUES (?, ?, ?)',
+    'team_leader_scores': '''
+        SELECT evaluatee_id, evaluator_id, score FROM evaluation_data
+        WHERE evaluation_type = 'manager' AND evaluatee_id IN ({in})
+        ORDER BY created_at DESC
+    ''',
+    # 담당 팀장 여부를 배정 테이블 조인으로 판별 (ROSTER_SOURCE=db)
+    'team_leader_scores_assigned': '''
+        SELECT ed.evaluatee_id, ed.evaluator_id, ed.score FROM evaluation_data ed
+        JOIN evaluation_assignments a
+          ON a.mapping_key = 'team_leader_manager'
+         AND a.evaluator_id = ed.evaluator_id AND a.evaluatee_id = ed.evaluatee_id
+        WHERE ed.evaluation_type = 'manager' AND ed.evaluatee_id IN ({in})
+        ORDER BY ed.created_at DESC
+    ''',
+    'evaluation_finalize': '''
+        UPDATE evaluation_data
+        SET is_final = 1, created_at = CURRENT_TIMESTAMP
+        WHERE evaluator_id = ? AND evaluation_type = ? AND is_final = 0
+    ''',
+    'evaluation_final_count': '''
+        SELECT COUNT(*) FROM evaluation_data
+        WHERE evaluator_id = ? AND evaluation_type = ? AND is_final = 1
+    ''',
+    # 항목별 점수를 조인해 JSON 파싱 없이 scores dict를 만든다
+    'evaluation_saved': '''
+        SELECT ed.evaluatee_id, ed.comments, ed.created_at, s.criterion, s.value
+        FROM evaluation_data ed
+        LEFT JOIN evaluation_scores s ON s.evaluation_id = ed.id
+        WHERE ed.evaluator_id = ? AND ed.evaluation_type = ?
+        ORDER BY ed.created_at DESC
+    ''',
+    'evaluation_export': '''
+        SELECT ed.id, ed.evaluator_id, ed.evaluatee_id, ed.evaluation_type, ed.score, ed.is_final, ed.comments, ed.created_at
+        FROM evaluation_data ed
+        ORDER BY ed.created_at DESC
+    ''',
+    # 엑셀 캐시 키: 평가/항목 점수가 바뀌면 값이 달라지는 집계 (export_jobs)
+    'evaluation_export_version': '''
+        SELECT COUNT(*), MAX(ed.id), MAX(ed.created_at), SUM(ed.is_final), SUM(ed.score), SUM(LENGTH(ed.comments)),
+               (SELECT COUNT(*) FROM evaluation_scores), (SELECT SUM(value) FROM evaluation_scores)
+        FROM evaluation_data ed
+    ''',
+    # 엑셀 시트별 항목 컬럼 (평가 유형별로 쓰인 항목)
+    'evaluation_export_criteria': '''
+        SELECT DISTINCT ed.evaluation_type, s.criterion
+        FROM evaluation_scores s
+        JOIN evaluation_data ed ON ed.id = s.evaluation_id
+    ''',
+    'evaluation_score_summary': '''
+        SELECT evaluation_type, COUNT(*), SUM(CASE WHEN is_final = 1 THEN 1 ELSE 0 END),
+               COUNT(score), AVG(score), MIN(score), MAX(score)
+        FROM evaluation_data
+        GROUP BY evaluation_type
+        ORDER BY evaluation_type
+    ''',
+    'evaluation_scores_clear': 'DELETE FROM evaluation_scores',
+    'evaluation_clear': 'DELETE FROM evaluation_data',
+    'evaluation_scores_delete_by_evaluator': '''
+        DELETE FROM evaluation_scores
+        WHERE evaluation_id IN (SELECT id FROM evaluation_data WHERE evaluator_id = ?)
+    ''',
+    'evaluation_delete_by_evaluator': 'DELETE FROM evaluation_data WHERE evaluator_id = ?',
+
+    # 평가 주기 (활성 주기 행은 evaluation_data/performance_data, 지난 주기는 *_archive 테이블)
+    'cycle_active': "SELECT cycle FROM evaluation_cycles WHERE status = 'active'",
+    'cycle_all': 'SELECT cycle, status, started_at, closed_at FROM evaluation_cycles ORDER BY started_at, cycle',
+    'cycle_by_name': 'SELECT status FROM evaluation_cycles WHERE cycle = ?',
+    'cycle_close': "UPDATE evaluation_cycles SET status = 'archived', closed_at = CURRENT_TIMESTAMP WHERE cycle = ?",
+    'cycle_insert': "INSERT INTO evaluation_cycles (cycle, status) VALUES (?, 'active')",
+    'cycle_archive_evaluations': '''
+        INSERT INTO evaluation_data_archive
+            (id, cycle, evaluator_id, evaluatee_id, evaluation_type, scores, score, comments, is_final, created_at)
+        SELECT id, COALESCE(cycle, ?), evaluator_id, evaluatee_id, evaluation_type, scores, score, comments, is_final, created_at
+        FROM evaluation_data
+    ''',
+    'cycle_insert_archived': "INSERT INTO evaluation_cycles (cycle, status, closed_at) VALUES (?, 'archived', CURRENT_TIMESTAMP)",
+    'cycle_snapshot_evaluations': '''
+        INSERT INTO evaluation_data_archive
+            (id, cycle, evaluator_id, evaluatee_id, evaluation_type, scores, score, comments, is_final, created_at)
+        SELECT id, ?, evaluator_id, evaluatee_id, evaluation_type, scores, score, comments, is_final, created_at
+        FROM evaluation_data
+    ''',
+    'cycle_archive_scores': '''
+        INSERT INTO evaluation_scores_archive (evaluation_id, criterion, value)
+        SELECT evaluation_id, criterion, value FROM evaluation_scores
+    ''',
+    'cycle_archive_performance': '''
+        INSERT INTO performance_data_archive
+            (id, cycle, employee_id, performance_order, project_name, performance, created_at, is_finalized)
+        SELECT id, COALESCE(cycle, ?), employee_id, performance_order, project_name, performance, created_at, is_finalized
+        FROM performance_data
+    ''',
+    'performance_clear': 'DELETE FROM performance_data',
+    'cycle_active_summary': '''
+        SELECT COUNT(*), SUM(CASE WHEN is_final = 1 THEN 1 ELSE 0 END), AVG(score),
+               (SELECT COUNT(*) FROM performance_data)
+        FROM evaluation_data
+    ''',
+    'cycle_archive_summary': '''
+        SELECT c.cycle,
+               (SELECT COUNT(*) FROM evaluation_data_archive ed WHERE ed.cycle = c.cycle),
+               (SELECT SUM(CASE WHEN ed.is_final = 1 THEN 1 ELSE 0 END) FROM evaluation_data_archive ed WHERE ed.cycle = c.cycle),
+               (SELECT AVG(ed.score) FROM evaluation_data_archive ed WHERE ed.cycle = c.cycle),
+               (SELECT COUNT(*) FROM performance_data_archive pd WHERE pd.cycle = c.cycle)
+        FROM evaluation_cycles c
+        WHERE c.status = 'archived'
+    ''',
+    'archive_evaluation_export': '''
+        SELECT ed.id, ed.evaluator_id, ed.evaluatee_id, ed.evaluation_type, ed.score, ed.is_final, ed.comments, ed.created_at
+        FROM evaluation_data_archive ed
+        WHERE ed.cycle = ?
+        ORDER BY ed.created_at DESC
+    ''',
+    # 보관된 주기는 바뀌지 않으므로 건수만 확인
+    'archive_evaluation_export_version': 'SELECT COUNT(*), MAX(id) FROM evaluation_data_archive WHERE cycle = ?',
+    'archive_evaluation_export_criteria': '''
+        SELECT DISTINCT ed.evaluation_type, s.criterion
+        FROM evaluation_scores_archive s
+        JOIN evaluation_data_archive ed ON ed.id = s.evaluation_id
+        WHERE ed.cycle = ?
+    ''',
+    'archive_evaluation_scores_for_ids': '''
+        SELECT evaluation_id, criterion, value FROM evaluation_scores_archive
+        WHERE evaluation_id IN ({in})
+        ORDER BY evaluation_id, criterion
+    ''',
+    'archive_evaluation_score_summary': '''
+        SELECT evaluation_type, COUNT(*), SUM(CASE WHEN is_final = 1 THEN 1 ELSE 0 END),
+               COUNT(score), AVG(score), MIN(score), MAX(score)
+        FROM evaluation_data_archive
+        WHERE cycle = ?
+        GROUP BY evaluation_type
+        ORDER BY evaluation_type
+    ''',
+
+    # 관리자 대시보드 API (id 역순 keyset 페이지)
+    'admin_evaluations_page': '''
+        SELECT ed.id, ed.evaluator_id, ed.evaluatee_id, ed.evaluation_type, ed.score, ed.is_final, ed.created_at
+        FROM evaluation_data ed
+        WHERE {where}
+        ORDER BY ed.id DESC
+        LIMIT ?
+    ''',
+    'evaluation_scores_for_ids': '''
+        SELECT evaluation_id, criterion, value FROM evaluation_scores
+        WHERE evaluation_id IN ({in})
+        ORDER BY evaluation_id, criterion
+    ''',
+    # 실적 내용은 앞부분만 보내고 전체 내용은 performance_by_id로 조회
+    'admin_performances_page': '''
+        SELECT pd.id, pd.employee_id, pd.performance_order, pd.project_name,
+               SUBSTR(pd.performance, 1, 200), LENGTH(pd.performance), pd.created_at, pd.is_finalized
+        FROM performance_data pd
+        WHERE {where}
+        ORDER BY pd.id DESC
+        LIMIT ?
+    ''',
+    'performance_by_id': '''
+        SELECT id, employee_id, performance_order, project_name, performance, created_at, is_finalized
+        FROM performance_data
+        WHERE id = ?
+    ''',
+    # 화면/엑셀의 직원 정보 보강 (eva.enrich_employees)
+    'employees_by_ids': EMPLOYEE_SELECT + ' WHERE e.employee_id IN ({in})',
+    'employee_ids_by_team': 'SELECT employee_id FROM employees WHERE team = ?',
+    'employee_teams': 'SELECT DISTINCT team FROM employees WHERE team IS NOT NULL ORDER BY team',
+
+    # 조직도
+    'department_all': '''
+        SELECT id, name, leader_position, parent_id, display_order
+        FROM departments
+        ORDER BY display_order, name
+    ''',
+    'department_insert': '''
+        INSERT INTO departments (name, leader_position, parent_id, display_order)
+        VALUES (?, ?, ?, ?)
+    ''',
+    'department_update': '''
+        UPDATE departments
+        SET name = ?, leader_position = ?, parent_id = ?, display_order = ?, updated_at = CURRENT_TIMESTAMP
+        WHERE id = ?
+    ''',
+    'department_delete': 'DELETE FROM departments WHERE id = ?',
+    'department_id_by_name': 'SELECT id FROM departments WHERE name = ?',
+    'department_clear': 'DELETE FROM departments',
+    'department_employees': DEPARTMENT_EMPLOYEE_SELECT,
+    'department_employees_by_department': DEPARTMENT_EMPLOYEE_SELECT + ' WHERE de.department_id = ?',
+    'department_employee_unassign': 'DELETE FROM department_employees WHERE employee_id = ?',
+    'department_employee_assign': '''
+        INSERT INTO department_employees (department_id, employee_id, position)
+        VALUES (?, ?, ?)
+    ''',
+    'department_employee_delete': 'DELETE FROM department_employees WHERE id = ?',
+    'department_employees_clear': 'DELETE FROM department_employees',
+    'department_assigned_employee_ids': 'SELECT DISTINCT employee_id FROM department_employees',
+    # 배정 여부까지 한 번의 쿼리로 조회 (department_employees.employee_id 인덱스 사용)
+    'employees_with_assignment': '''
+        SELECT e.employee_id, e.name, e.team, e.position, e.grade,
+               EXISTS (SELECT 1 FROM department_employees de WHERE de.employee_id = e.employee_id)
+        FROM employees e
+        ORDER BY e.sort_order
+    ''',
+}
+
+# {where} 문장에 붙일 수 있는 선택 조건 (조건 이름 -> SQL). 값이 목록인 조건은 {in}으로 펼친다
+FILTERS = {
+    'admin_evaluations_page': {
+        'evaluator_id': 'ed.evaluator_id = ?',
+        'evaluatee_id': 'ed.evaluatee_id = ?',
+        'evaluation_type': 'ed.evaluation_type = ?',
+        'is_final': 'ed.is_final = ?',
+        'evaluatee_ids': 'ed.evaluatee_id IN ({in})',
+        'before_id': 'ed.id < ?',
+    },
+    'admin_performances_page': {
+        'employee_id': 'pd.employee_id = ?',
+        'is_finalized': 'pd.is_finalized = ?',
+        'employee_ids': 'pd.employee_id IN ({in})',
+        'before_id': 'pd.id < ?',
+    },
+}
+
+
+class Statement:
+    """한 문장을 한 DB 종류에 맞게 변환한 결과"""
+    __slots__ = ('name', 'sql', 'prepare_sql', 'execute_sql')
+
+    def __init__(self, name, sql, prepare_sql=None, execute_sql=None):
+        self.name = name
+        # 그대로 실행할 SQL (SQLite: '?', PostgreSQL: '%s')
+        self.sql = sql
+        # PostgreSQL 서버 측 준비 문장 (PREPARE / EXECUTE)
+        self.prepare_sql = prepare_sql
+        self.execute_sql = execute_sql
+
+
+def _to_postgresql(sql):
+    # psycopg2는 파라미터가 있을 때 %를 서식 문자로 해석한다
+    return sql.replace('%', '%%').replace('?', '%s')
+
+
+def _compile_sqlite(name, sql):
+    return Statement(name, sql)
+
+
+def _compile_postgresql(name, sql):
+    plain_sql = _to_postgresql(sql)
+    if '{in}' in sql or '{where}' in sql:
+        return Statement(name, plain_sql)
+    parts = sql.split('?')
+    numbered = parts[0] + ''.join(f'${index}{part}' for index, part in enumerate(parts[1:], 1))
+    prepared_name = f'eva_{name}'
+    arguments = ', '.join(['%s'] * (len(parts) - 1))
+    return Statement(
+        name,
+        plain_sql,
+        prepare_sql=f'PREPARE {prepared_name} AS {numbered}',
+        execute_sql=f'EXECUTE {prepared_name} ({arguments})' if arguments else f'EXECUTE {prepared_name}',
+    )
+
+
+def _compile_all():
+    compiled = {'sqlite': {}, 'postgresql': {}}
+    for name, sql in STATEMENTS.items():
+        sql = _WHITESPACE.sub(' ', sql).strip()
+        compiled['sqlite'][name] = _compile_sqlite(name, sql)
+        compiled['postgresql'][name] = _compile_postgresql(name, sql)
+    return compiled
+
+
+_compiled = _compile_all()
+# (DB 종류, 이름, 개수 또는 조건) -> IN 목록이나 {where}를 채운 SQL
+_expanded = {}
+# PostgreSQL executemany에서 한 번에 보내는 문장 수
+BATCH_PAGE_SIZE = 500
+# PostgreSQL 연결 -> 준비된 문장 이름 집합 (연결이 닫히면 함께 사라진다)
+_prepared = weakref.WeakKeyDictionary()
+
+
+def dialect(cursor):
+    """커서의 DB 종류 ('sqlite' 또는 'postgresql')"""
+    raw = getattr(cursor, 'raw', cursor)
+    return 'sqlite' if isinstance(raw, sqlite3.Cursor) else 'postgresql'
+
+
+def statement(name, db_dialect):
+    """변환된 문장"""
+    return _compiled[db_dialect][name]
+
+
+def _expand(name, db_dialect, count):
+    key = (db_dialect, name, count)
+    sql = _expanded.get(key)
+    if sql is None:
+        placeholder = '?' if db_dialect == 'sqlite' else '%s'
+        sql = _compiled[db_dialect][name].sql.replace('{in}', ','.join([placeholder] * count))
+        # 길이가 제각각인 IN 목록이 무한히 쌓이지 않도록 크기 제한
+        if len(_expanded) < 1000:
+            _expanded[key] = sql
+    return sql
+
+
+def _filtered(name, db_dialect, filters):
+    """값이 주어진 조건만 골라 {where}를 채운 SQL과 조건 값 목록"""
+    clauses = []
+    values = []
+    for key, clause in FILTERS[name].items():
+        value = filters.get(key)
+        if value is None:
+            continue
+        if '{in}' in clause:
+            value = tuple(value)
+            # 빈 목록은 아무 행도 고르지 않는다
+            clause = clause.replace('{in}', ','.join('?' * len(value)) or 'NULL')
+            values.extend(value)
+        else:
+            values.append(value)
+        clauses.append(clause)
+    where = ' AND '.join(clauses) or '1 = 1'
+    key = (db_dialect, name, where)
+    sql = _expanded.get(key)
+    if sql is None:
+        sql = _compiled['sqlite'][name].sql.replace('{where}', where)
+        if db_dialect == 'postgresql':
+            sql = _to_postgresql(sql)
+        if len(_expanded) < 1000:
+            _expanded[key] = sql
+    return sql, values
+
+
+def _prepare(cursor, compiled):
+    """PostgreSQL 연결에 문장을 준비하고 EXECUTE 문을 반환"""
+    conn = cursor.connection
+    prepared = _prepared.get(conn)
+    if prepared is None:
+        prepared = _prepared[conn] = set()
+    if compiled.name not in prepared:
+        cursor.execute(compiled.prepare_sql)
+        prepared.add(compiled.name)
+    return compiled.execute_sql
+
+
+def execute(cursor, name, params=(), in_values=None, filters=None):
+    """이름으로 문장을 실행. {in}이 있는 문장은 in_values를 IN 목록으로 펼쳐 params 뒤에 붙이고,
+    {where}가 있는 문장은 filters(조건 이름 -> 값, None은 생략)의 값을 params 앞에 붙인다"""
+    db_dialect = dialect(cursor)
+    if filters is not None:
+        sql, values = _filtered(name, db_dialect, filters)
+        cursor.execute(sql, tuple(values) + tuple(params))
+        return cursor
+    if in_values is not None:
+        in_values = tuple(in_values)
+        cursor.execute(_expand(name, db_dialect, len(in_values)), tuple(params) + in_values)
+        return cursor
+    compiled = _compiled[db_dialect][name]
+    if compiled.prepare_sql is None:
+        cursor.execute(compiled.sql, tuple(params))
+    else:
+        # 파라미터가 없으면 psycopg2가 %를 해석하지 않도록 None으로 넘긴다
+        cursor.execute(_prepare(cursor, compiled), tuple(params) or None)
+    return cursor
+
+
+def executemany(cursor, name, seq_of_params):
+    """이름으로 문장을 여러 파라미터에 대해 실행.
+    PostgreSQL은 psycopg2 executemany가 행마다 왕복하므로 execute_batch로 BATCH_PAGE_SIZE개씩 한 번에 보낸다"""
+    db_dialect = dialect(cursor)
+    compiled = _compiled[db_dialect][name]
+    if db_dialect == 'sqlite':
+        cursor.executemany(compiled.sql, seq_of_params)
+        return cursor
+    from psycopg2 import extras
+    sql = compiled.sql if compiled.prepare_sql is None else _prepare(cursor, compiled)
+    extras.execute_batch(cursor, sql, seq_of_params, page_size=BATCH_PAGE_SIZE)
+    return cursor
+
+
+def last_insert_id(cursor):
+    """직전 INSERT로 생성된 id (PostgreSQL: LASTVAL(), SQLite: lastrowid)"""
+    if dialect(cursor) == 'sqlite':
+        return cursor.lastrowid
+    cursor.execute('SELECT LASTVAL()')
+    return cursor.fetchone()[0]
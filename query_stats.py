@@ -0,0 +1,230 @@
+"""DB 쿼리 실행 시간 측정과 느린 쿼리 로그
+
+db_pool이 빌려주는 연결의 cursor()는 InstrumentedCursor를 반환한다. 모든 execute/executemany와
+fetch에 걸린 시간을 문장 지문(리터럴과 IN 목록을 ?로 바꾼 SQL)별로 집계하고,
+SLOW_QUERY_MS를 넘는 쿼리는 "[slow-query]" 로그로 출력한다.
+요청 단위로 실행한 쿼리 수를 라우트별로 집계해 N+1 패턴을 찾을 수 있게 한다
+(한 요청에서 QUERY_COUNT_WARN개를 넘으면 "[query-count]" 로그).
+집계는 워커 프로세스별이며 관리자 계정으로 /admin/query_stats에서 조회한다.
+
+    SLOW_QUERY_MS      느린 쿼리 기준 (ms, 기본값: 200, 0이면 로그 끔)
+    QUERY_COUNT_WARN   요청당 쿼리 수 경고 기준 (기본값: 50, 0이면 로그 끔)
+"""
+import os
+import re
+import threading
+import time
+
+SLOW_QUERY_MS = float(os.environ.get('SLOW_QUERY_MS', '200'))
+QUERY_COUNT_WARN = int(os.environ.get('QUERY_COUNT_WARN', '50'))
+# 조회 결과에 남길 상위 문장 수
+TOP_STATEMENTS = 30
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r'\b\d+(?:\.\d+)?\b')
+_PLACEHOLDER_LIST = re.compile(r'\(\s*(?:\?|%s)(?:\s*,\s*(?:\?|%s))+\s*\)')
+_WHITESPACE = re.compile(r'\s+')
+
+_lock = threading.Lock()
+# 요청별 상태: {'route', 'queries', 'duration_ms'}
+_local = threading.local()
+# 문장 지문 -> {'calls', 'total_ms', 'max_ms', 'rows', 'routes': {라우트: 호출 수}}
+_statements = {}
+# 라우트 -> {'requests', 'queries', 'max_queries', 'total_ms'}
+_routes = {}
+_fingerprints = {}
+
+
+def _reset_after_fork():
+    """fork된 자식 프로세스에서는 부모의 집계를 이어받지 않는다"""
+    global _lock, _local
+    _lock = threading.Lock()
+    _local = threading.local()
+    _statements.clear()
+    _routes.clear()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def fingerprint(sql):
+    """리터럴과 IN 목록을 ?로 바꾸고 공백을 정리한 문장 (같은 모양의 쿼리를 하나로 묶는다)"""
+    cached = _fingerprints.get(sql)
+    if cached is not None:
+        return cached
+    normalized = _STRING_LITERAL.sub('?', sql)
+    normalized = _NUMBER_LITERAL.sub('?', normalized)
+    normalized = _PLACEHOLDER_LIST.sub('(...)', normalized)
+    normalized = _WHITESPACE.sub(' ', normalized).strip().replace('%s', '?')
+    # 고정 문자열 SQL만 캐시 (IN 목록 길이가 다른 SQL이 무한히 쌓이지 않도록 크기 제한)
+    if len(_fingerprints) < 2000:
+        _fingerprints[sql] = normalized
+    return normalized
+
+
+def _current_route():
+    state = getattr(_local, 'state', None)
+    return state['route'] if state is not None else None
+
+
+def _record(statement, duration_ms, rows, route):
+    with _lock:
+        stats = _statements.get(statement)
+        if stats is None:
+            stats = _statements[statement] = {'calls': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'rows': 0, 'routes': {}}
+        stats['calls'] += 1
+        stats['total_ms'] += duration_ms
+        stats['max_ms'] = max(stats['max_ms'], duration_ms)
+        stats['rows'] += max(rows, 0)
+        route_key = route or '-'
+        stats['routes'][route_key] = stats['routes'].get(route_key, 0) + 1
+    state = getattr(_local, 'state', None)
+    if state is not None:
+        state['queries'] += 1
+        state['duration_ms'] += duration_ms
+    if SLOW_QUERY_MS and duration_ms >= SLOW_QUERY_MS:
+        print(f"[slow-query] {duration_ms:.1f}ms rows={rows} route={route or '-'} pid={os.getpid()}: {statement[:300]}")
+
+
+def _record_fetch(statement, duration_ms, rows):
+    # fetch 시간은 직전 execute의 문장에 더한다 (SQLite는 fetch 중에 실제로 실행된다)
+    with _lock:
+        stats = _statements.get(statement)
+        if stats is not None:
+            stats['total_ms'] += duration_ms
+            stats['rows'] += rows
+    state = getattr(_local, 'state', None)
+    if state is not None:
+        state['duration_ms'] += duration_ms
+
+
+class InstrumentedCursor:
+    """실행 시간/행 수를 기록하는 커서. 나머지 속성은 원래 커서에 위임"""
+    __slots__ = ('_cursor', '_statement')
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self._statement = None
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __setattr__(self, name, value):
+        # itersize, arraysize 등 드라이버 커서 설정은 원래 커서에 쓴다
+        if name in InstrumentedCursor.__slots__:
+            object.__setattr__(self, name, value)
+        else:
+            setattr(self._cursor, name, value)
+
+    @property
+    def raw(self):
+        """DB 드라이버의 원래 커서"""
+        return self._cursor
+
+    def __iter__(self):
+        return iter(self.fetchall())
+
+    def _run(self, method, sql, args):
+        route = _current_route()
+        started = time.perf_counter()
+        try:
+            return method(sql, *args)
+        finally:
+            self._statement = fingerprint(sql)
+            duration_ms = (time.perf_counter() - started) * 1000
+            _record(self._statement, duration_ms, getattr(self._cursor, 'rowcount', -1), route)
+
+    def execute(self, sql, *args):
+        self._run(self._cursor.execute, sql, args)
+        return self
+
+    def executemany(self, sql, *args):
+        self._run(self._cursor.executemany, sql, args)
+        return self
+
+    def _fetch(self, method, *args):
+        started = time.perf_counter()
+        result = method(*args)
+        if self._statement is not None:
+            if isinstance(result, list):
+                rows = len(result)
+            else:
+                rows = 0 if result is None else 1
+            _record_fetch(self._statement, (time.perf_counter() - started) * 1000, rows)
+        return result
+
+    def fetchone(self):
+        return self._fetch(self._cursor.fetchone)
+
+    def fetchmany(self, *args):
+        return self._fetch(self._cursor.fetchmany, *args)
+
+    def fetchall(self):
+        return self._fetch(self._cursor.fetchall)
+
+
+def begin_request(route):
+    """요청 시작: 이후 쿼리를 이 라우트로 집계"""
+    _local.state = {'route': route, 'queries': 0, 'duration_ms': 0.0}
+
+
+def end_request():
+    """요청 종료: 라우트별 쿼리 수를 집계하고 기준을 넘으면 로그"""
+    state = getattr(_local, 'state', None)
+    if state is None:
+        return
+    _local.state = None
+    route = state['route'] or '-'
+    with _lock:
+        stats = _routes.get(route)
+        if stats is None:
+            stats = _routes[route] = {'requests': 0, 'queries': 0, 'max_queries': 0, 'total_ms': 0.0}
+        stats['requests'] += 1
+        stats['queries'] += state['queries']
+        stats['max_queries'] = max(stats['max_queries'], state['queries'])
+        stats['total_ms'] += state['duration_ms']
+    if QUERY_COUNT_WARN and state['queries'] > QUERY_COUNT_WARN:
+        print(f"[query-count] route={route} queries={state['queries']} ({state['duration_ms']:.1f}ms) pid={os.getpid()}")
+
+
+def stats():
+    """문장별(총 소요 시간 상위 TOP_STATEMENTS개) / 라우트별 쿼리 집계"""
+    with _lock:
+        statements = [
+            {
+                'statement': statement,
+                'calls': item['calls'],
+                'total_ms': round(item['total_ms'], 1),
+                'avg_ms': round(item['total_ms'] / item['calls'], 2),
+                'max_ms': round(item['max_ms'], 1),
+                'rows': item['rows'],
+                'routes': dict(item['routes']),
+            }
+            for statement, item in _statements.items()
+        ]
+        routes = {
+            route: {
+                'requests': item['requests'],
+                'queries': item['queries'],
+                'avg_queries': round(item['queries'] / item['requests'], 1),
+                'max_queries': item['max_queries'],
+                'total_ms': round(item['total_ms'], 1),
+            }
+            for route, item in _routes.items()
+        }
+    statements.sort(key=lambda item: item['total_ms'], reverse=True)
+    return {
+        'pid': os.getpid(),
+        'slow_query_ms': SLOW_QUERY_MS,
+        'query_count_warn': QUERY_COUNT_WARN,
+        'statements': statements[:TOP_STATEMENTS],
+        'routes': routes,
+    }
+
+
+def reset():
+    """집계 초기화"""
+    with _lock:
+        _statements.clear()
+        _routes.clear()
@@ -0,0 +1,634 @@
+"""평가 명단 데이터(backdata, 평가자 매핑, Jikkeup) 공용 캐시
+
+워커 프로세스마다 CSV를 한 번만 읽고, 파일의 수정시각/크기가 바뀔 때만 다시 읽는다.
+반환되는 DataFrame은 캐시 원본을 공유하는 copy-on-write 뷰이므로
+호출 측에서 수정하더라도 캐시에는 영향을 주지 않는다.
+
+파싱 결과는 바이너리 스냅샷(roster_snapshot.pkl)에 인코딩/컬럼 타입과 함께 저장되어
+워커 부팅 시 CSV 파싱과 인코딩 추측 없이 바로 로드된다.
+
+명단은 세대(generation) 번호가 붙은 불변 상태로 관리된다. 각 워커는 조회 시
+최대 ROSTER_CHECK_INTERVAL초마다 원본 CSV와 스냅샷을 stat으로 확인하고, 바뀌었으면
+백그라운드 스레드에서 새 상태를 만든 뒤 참조만 교체한다 (요청은 이전 상태로 계속 처리).
+여러 워커가 동시에 변경을 감지해도 스냅샷 잠금 파일로 한 워커만 CSV를 다시 파싱하고,
+나머지는 그 워커가 저장한 스냅샷(세대 번호 +1)을 읽어 같은 데이터로 맞춘다.
+
+    python roster.py compile [추가 CSV 경로...]   # 스냅샷 수동 생성
+"""
+import os
+import pickle
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import fcntl
+except ImportError:
+    # Windows 등에서는 워커 간 잠금 없이 동작
+    fcntl = None
+
+import startup
+
+_pd = None
+
+
+def _pandas():
+    """pandas는 명단을 처음 읽을 때 import한다 (헬스체크 등은 pandas 없이 응답)"""
+    global _pd
+    if _pd is None:
+        pd = startup.lazy_import('pandas')
+        # 얕은 복사본을 수정해도 캐시 원본이 바뀌지 않도록 copy-on-write 활성화
+        pd.set_option('mode.copy_on_write', True)
+        _pd = pd
+    return _pd
+
+BACKDATA_FILE = 'backdata.csv'
+JIKKEUP_FILE = 'Jikkeup.csv'
+
+# 평가 유형 키 -> 평가자-피평가자 매핑 CSV
+MAPPING_FILES = {
+    'team_leader_employee': '평가자(팀장)_사원.csv',
+    'team_leader_manager': '평가자(팀장)_대리이상.csv',
+    'team_leader_general': '평가자(팀장)_일반직.csv',
+    'executive_team_leader': '평가자(임원)_팀장.csv',
+    'executive_manager': '평가자(임원)_팀원 관리직.csv',
+    'executive_general': '평가자(임원)_팀원 일반직.csv',
+}
+
+BACKDATA_COLUMNS = ['id', 'password', 'name', 'team', 'position', 'grade']
+MAPPING_COLUMNS = ['evaluaterid', 'evaluateeid']
+
+# 파일명 -> 문자열로 고정할 컬럼 위치 (사번/비밀번호가 Int64와 str로 섞여 비교되지 않도록)
+STRING_COLUMNS = {
+    BACKDATA_FILE: (0, 1),
+    **{path: (0, 1) for path in MAPPING_FILES.values()},
+}
+
+SNAPSHOT_PATH = os.environ.get(
+    'ROSTER_SNAPSHOT_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'roster_snapshot.pkl'),
+)
+# 스냅샷 구조가 바뀌면 올려서 이전 스냅샷을 무시하게 한다
+SNAPSHOT_FORMAT = 2
+
+# 원본 CSV/스냅샷 변경 확인 주기 (초)
+CHECK_INTERVAL = float(os.environ.get('ROSTER_CHECK_INTERVAL', '2'))
+
+# 기본으로 관리하는 테이블 (경로, 로그 라벨)
+DEFAULT_TABLES = (
+    (BACKDATA_FILE, 'backdata'),
+    (JIKKEUP_FILE, 'Jikkeup'),
+    *((path, key) for key, path in MAPPING_FILES.items()),
+)
+
+# 현재 명단 상태. 교체만 되고 수정되지 않는다:
+# {'generation', 'snapshot_signature', 'tables': {절대경로: 테이블 항목}, 'indexes': {}, 'version'}
+_state = None
+# 상태 로드/교체 및 인덱스 생성 보호
+_lock = threading.Lock()
+# 백그라운드 갱신이 동시에 두 번 돌지 않도록
+_refresh_lock = threading.Lock()
+_last_check = 0.0
+
+
+def _file_signature(path):
+    """파일 변경 감지용 (mtime_ns, size). 파일이 없으면 None"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def read_csv_with_fallback(path, string_columns=()):
+    """utf-8로 먼저 읽고 실패하면 cp949로 다시 읽는다. (DataFrame, 사용한 인코딩) 반환"""
+    pd = _pandas()
+    dtype = {position: str for position in string_columns} or None
+    try:
+        return pd.read_csv(path, encoding='utf-8', dtype=dtype), 'utf-8'
+    except Exception:
+        return pd.read_csv(path, encoding='cp949', dtype=dtype), 'cp949'
+
+
+def _string_columns(path):
+    return STRING_COLUMNS.get(os.path.basename(path), ())
+
+
+def _parse_table(path, signature, label):
+    """CSV를 파싱해 테이블 항목으로 만든다. 파일이 없거나 실패하면 df=None인 항목
+    (실패도 기록하여 파일이 바뀌기 전까지 재파싱하지 않는다)"""
+    entry = {
+        'signature': signature,
+        'label': label,
+        'encoding': None,
+        'string_columns': _string_columns(path),
+        'dtypes': {},
+        'df': None,
+    }
+    if signature is None:
+        print(f"{label} 로드 오류: {path} 파일이 없습니다")
+        return entry
+    try:
+        df, encoding = read_csv_with_fallback(path, entry['string_columns'])
+    except Exception as e:
+        print(f"{label} 로드 오류: {e}")
+        return entry
+    entry['encoding'] = encoding
+    entry['dtypes'] = {str(column): str(dtype) for column, dtype in df.dtypes.items()}
+    entry['df'] = df
+    return entry
+
+
+def _is_current(entry, path, signature):
+    """테이블 항목이 현재 원본 파일(시그니처)과 스키마에 맞는지"""
+    return (
+        entry is not None
+        and entry['signature'] == signature
+        and entry['string_columns'] == _string_columns(path)
+    )
+
+
+@contextmanager
+def _snapshot_file_lock():
+    """워커 간 스냅샷 재생성 잠금 (한 워커만 CSV를 파싱하도록)"""
+    if fcntl is None:
+        yield
+        return
+    try:
+        lock_file = open(f'{SNAPSHOT_PATH}.lock', 'a')
+    except OSError:
+        yield
+        return
+    with lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _read_snapshot():
+    """스냅샷 파일을 읽어 (시그니처, payload) 반환. 없거나 형식이 다르면 payload는 None"""
+    signature = _file_signature(SNAPSHOT_PATH)
+    if signature is None:
+        return None, None
+    # 스냅샷의 DataFrame을 풀기 전에 pandas 옵션(copy-on-write)을 적용
+    _pandas()
+    try:
+        with open(SNAPSHOT_PATH, 'rb') as f:
+            payload = pickle.load(f)
+    except Exception as e:
+        print(f"roster 스냅샷 로드 오류: {e}")
+        return signature, None
+    if payload.get('format') != SNAPSHOT_FORMAT:
+        return signature, None
+    return signature, payload
+
+
+def _write_snapshot(tables, generation):
+    """스냅샷을 임시 파일에 쓴 뒤 교체하여 다른 워커가 반쯤 쓰인 파일을 읽지 않게 한다.
+    저장된 스냅샷의 시그니처 반환 (실패 시 None)"""
+    tmp_path = f'{SNAPSHOT_PATH}.{os.getpid()}.tmp'
+    payload = {
+        'format': SNAPSHOT_FORMAT,
+        'generation': generation,
+        'created_at': datetime.now().isoformat(),
+        'tables': tables,
+    }
+    try:
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, SNAPSHOT_PATH)
+    except OSError as e:
+        # 읽기 전용 파일시스템 등에서는 메모리 상태만으로 동작
+        print(f"roster 스냅샷 저장 오류: {e}")
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        return None
+    return _file_signature(SNAPSHOT_PATH)
+
+
+def _new_state(generation, snapshot_signature, tables):
+    return {
+        'generation': generation,
+        'snapshot_signature': snapshot_signature,
+        'tables': tables,
+        'indexes': {},
+        'version': (generation, tuple(sorted((key, entry['signature']) for key, entry in tables.items()))),
+    }
+
+
+def _load_state(paths, force=False):
+    """paths(절대경로 -> 라벨)의 테이블로 새 상태를 만든다.
+    스냅샷에 최신 항목이 있으면 그대로 쓰고, 바뀐 테이블만 파싱해 스냅샷 세대를 올린다."""
+    with _snapshot_file_lock():
+        # 잠금을 기다리는 동안 다른 워커가 스냅샷을 갱신했을 수 있으므로 잠금 안에서 읽는다
+        snapshot_signature, payload = _read_snapshot()
+        snapshot_tables = payload['tables'] if payload else {}
+        generation = payload['generation'] if payload else 0
+
+        tables = {}
+        changed = False
+        for key, label in paths.items():
+            signature = _file_signature(key)
+            entry = snapshot_tables.get(key)
+            if force or not _is_current(entry, key, signature):
+                entry = _parse_table(key, signature, label)
+                changed = True
+            tables[key] = entry
+
+        if changed:
+            generation += 1
+            # 스냅샷에만 있는 다른 테이블(다른 앱이 쓰는 CSV 등)도 유지
+            written = _write_snapshot({**snapshot_tables, **tables}, generation)
+            if written is not None:
+                snapshot_signature = written
+    return _new_state(generation, snapshot_signature, tables)
+
+
+def _default_paths():
+    return {os.path.abspath(path): label for path, label in DEFAULT_TABLES}
+
+
+def _current_state():
+    """현재 상태 (최초 호출 시 동기 로드)"""
+    global _state
+    state = _state
+    if state is None:
+        with _lock:
+            if _state is None:
+                with startup.timed('roster 명단 로드'):
+                    _state = _load_state(_default_paths())
+            state = _state
+    return state
+
+
+def _needs_reload(state):
+    """원본 CSV 또는 스냅샷(다른 워커의 갱신)이 현재 상태와 다른지"""
+    if _file_signature(SNAPSHOT_PATH) != state['snapshot_signature']:
+        return True
+    return any(
+        not _is_current(entry, key, _file_signature(key))
+        for key, entry in state['tables'].items()
+    )
+
+
+def _reload_in_background():
+    global _state
+    if not _refresh_lock.acquire(blocking=False):
+        return
+    try:
+        state = _state
+        paths = {key: entry['label'] for key, entry in state['tables'].items()}
+        new_state = _load_state(paths)
+        # 요청이 인덱스 생성 비용을 치르지 않도록 교체 전에 미리 만든다
+        _warm_indexes(new_state)
+        with _lock:
+            _state = new_state
+        print(f"roster 갱신: 세대 {state['generation']} → {new_state['generation']}")
+    except Exception as e:
+        print(f"roster 갱신 오류: {e}")
+    finally:
+        _refresh_lock.release()
+
+
+def refresh(wait=False):
+    """CHECK_INTERVAL마다 변경을 확인하고, 바뀌었으면 백그라운드에서 새 상태로 교체한다.
+    wait=True이면 주기와 상관없이 확인하고 교체가 끝날 때까지 기다린다. 갱신을 시작했으면 True"""
+    global _last_check
+    now = time.monotonic()
+    if not wait and now - _last_check < CHECK_INTERVAL:
+        return False
+    _last_check = now
+    state = _state
+    if state is None or not _needs_reload(state):
+        return False
+    if wait:
+        _reload_in_background()
+    else:
+        threading.Thread(target=_reload_in_background, name='roster-refresh', daemon=True).start()
+    return True
+
+
+def _table(path, label):
+    """경로의 테이블 DataFrame (없거나 읽기 실패 시 None)"""
+    global _state
+    refresh()
+    state = _current_state()
+    key = os.path.abspath(path)
+    entry = state['tables'].get(key)
+    if entry is None:
+        # 기본 목록에 없는 CSV는 처음 요청될 때 상태에 추가
+        with _lock:
+            state = _state
+            entry = state['tables'].get(key)
+            if entry is None:
+                paths = {name: item['label'] for name, item in state['tables'].items()}
+                paths[key] = label
+                new_state = _load_state(paths)
+                new_state['indexes'].update(state['indexes'])
+                _state = new_state
+                entry = new_state['tables'][key]
+    return entry['df']
+
+
+def _derived(name, df, builder):
+    """현재 상태에서 builder(df)로 만든 파생 인덱스 (상태마다 한 번만 생성)"""
+    state = _current_state()
+    indexes = state['indexes']
+    cached = indexes.get(name)
+    if cached is not None and cached[0] is df:
+        return cached[1]
+    with _lock:
+        cached = indexes.get(name)
+        if cached is not None and cached[0] is df:
+            return cached[1]
+        index = builder(df)
+        indexes[name] = (df, index)
+        return index
+
+
+def normalize_id(value):
+    """사번을 비교용 문자열로 정규화 (11050121, '11050121', 11050121.0 → '11050121')"""
+    text = str(value).strip()
+    try:
+        return str(int(text))
+    except ValueError:
+        try:
+            return str(int(float(text)))
+        except ValueError:
+            return text
+
+
+class Employee:
+    """backdata 한 행의 직원 레코드 (A~F열, I열 직전 점수).
+    문자열 변환은 명단 적재 시 한 번만 하고, 팀/직위/직급은 intern하여 워커 안에서 공유한다."""
+    __slots__ = ('id', 'password', 'name', 'team', 'position', 'grade', 'before_point', 'row_index')
+
+    def __init__(self, id, password, name, team, position, grade, before_point=None, row_index=None):
+        self.id = id
+        self.password = password
+        self.name = name
+        self.team = team
+        self.position = position
+        self.grade = grade
+        self.before_point = before_point
+        # backdata DataFrame에서의 행 위치 (DB 명단에서 온 레코드는 None)
+        self.row_index = row_index
+
+    def __repr__(self):
+        return f'Employee({self.id!r}, {self.name!r}, {self.team!r})'
+
+
+def _to_int_or_none(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _build_employee_index(df):
+    """backdata -> (전체 직원 레코드 tuple(행 순서), 사번 -> 레코드). 중복 사번은 첫 행을 사용"""
+    employees = []
+    by_id = {}
+    has_before_point = df.shape[1] > 8
+    for row_index, row in enumerate(df.itertuples(index=False, name=None)):
+        employee = Employee(
+            sys.intern(normalize_id(row[0])),
+            str(row[1]),
+            str(row[2]),
+            sys.intern(str(row[3])),
+            sys.intern(str(row[4])),
+            sys.intern(str(row[5])),
+            _to_int_or_none(row[8]) if has_before_point else None,
+            row_index,
+        )
+        employees.append(employee)
+        by_id.setdefault(employee.id, employee)
+    return tuple(employees), by_id
+
+
+def _build_assignment_index(df):
+    """매핑 DataFrame -> (평가자 -> 피평가자 목록, 피평가자 -> 평가자 목록). CSV 행 순서 유지"""
+    by_evaluator = {}
+    by_evaluatee = {}
+    if 'evaluaterid' not in df.columns or 'evaluateeid' not in df.columns:
+        return {}, {}
+    isna = _pandas().isna
+    for evaluator_id, evaluatee_id in zip(df['evaluaterid'], df['evaluateeid']):
+        if isna(evaluator_id) or isna(evaluatee_id):
+            continue
+        # 같은 사번 문자열을 여러 인덱스가 공유하도록 intern
+        evaluator_key = sys.intern(normalize_id(evaluator_id))
+        evaluatee_key = sys.intern(normalize_id(evaluatee_id))
+        by_evaluator.setdefault(evaluator_key, []).append(evaluatee_key)
+        by_evaluatee.setdefault(evaluatee_key, []).append(evaluator_key)
+    # 호출 측에서 수정하지 못하도록 tuple로 고정
+    return (
+        {key: tuple(ids) for key, ids in by_evaluator.items()},
+        {key: tuple(ids) for key, ids in by_evaluatee.items()},
+    )
+
+
+def _employee_index():
+    df = _table(BACKDATA_FILE, 'backdata')
+    if df is None:
+        return (), {}
+    return _derived('employee', df, _build_employee_index)
+
+
+def _assignment_index(mapping_key):
+    df = _table(MAPPING_FILES[mapping_key], mapping_key)
+    if df is None:
+        return {}, {}
+    return _derived(f'assignments:{mapping_key}', df, _build_assignment_index)
+
+
+def _warm_indexes(state):
+    """새 상태의 사번/배정 인덱스를 미리 만든다"""
+    entry = state['tables'].get(os.path.abspath(BACKDATA_FILE))
+    if entry is not None and entry['df'] is not None:
+        state['indexes']['employee'] = (entry['df'], _build_employee_index(entry['df']))
+    for key, path in MAPPING_FILES.items():
+        entry = state['tables'].get(os.path.abspath(path))
+        if entry is not None and entry['df'] is not None:
+            state['indexes'][f'assignments:{key}'] = (entry['df'], _build_assignment_index(entry['df']))
+
+
+def _view(df):
+    """캐시 원본을 공유하는 읽기 전용(copy-on-write) 뷰"""
+    return df.copy(deep=False)
+
+
+def load_table(path, label=None):
+    """임의의 CSV를 캐시/스냅샷을 거쳐 로드 (없거나 읽기 실패 시 None)"""
+    df = _table(path, label or os.path.basename(path))
+    if df is None:
+        return None
+    return _view(df)
+
+
+def get_backdata():
+    """backdata.csv (없거나 읽기 실패 시 빈 DataFrame)"""
+    df = _table(BACKDATA_FILE, 'backdata')
+    if df is None:
+        # Railway 배포 시 CSV 파일이 없을 경우 빈 DataFrame 반환
+        return _pandas().DataFrame(columns=BACKDATA_COLUMNS)
+    return _view(df)
+
+
+def get_employee(employee_id):
+    """사번으로 직원 레코드(Employee)를 조회. 없으면 None"""
+    _, by_id = _employee_index()
+    return by_id.get(normalize_id(employee_id))
+
+
+def get_employees():
+    """backdata 행 순서대로 전체 직원 레코드(Employee) tuple"""
+    employees, _ = _employee_index()
+    return employees
+
+
+# enrich()가 사번 컬럼 옆에 붙이는 직원 정보
+EMPLOYEE_FIELDS = ('name', 'team', 'position', 'grade')
+
+
+def employee_frame(employees):
+    """직원 레코드 목록 -> 사번(employee_id)당 한 행의 DataFrame (EMPLOYEE_FIELDS 컬럼, 중복 사번은 첫 행)"""
+    frame = _pandas().DataFrame(
+        [(employee.id, str(employee.name), str(employee.team), str(employee.position), str(employee.grade))
+         for employee in employees],
+        columns=('employee_id',) + EMPLOYEE_FIELDS,
+    )
+    return frame.drop_duplicates('employee_id')
+
+
+def get_employee_frame():
+    """backdata 전체 직원 DataFrame (명단 상태마다 한 번만 생성)"""
+    df = _table(BACKDATA_FILE, 'backdata')
+    if df is None:
+        return employee_frame(())
+    employees, _ = _employee_index()
+    return _derived('employee_frame', df, lambda _: employee_frame(employees))
+
+
+def _id_keys(series):
+    """사번 컬럼을 normalize_id와 같은 문자열로 변환 (행 단위 호출 없이 벡터 연산)"""
+    return series.astype(str).str.strip().str.replace(r'\.0+$', '', regex=True)
+
+
+def enrich(df, id_columns, employees=None):
+    """df의 사번 컬럼마다 직원 정보 컬럼을 붙인 새 DataFrame (사번 기준 left merge, 행 순서 유지).
+    id_columns: {사번 컬럼: 붙일 컬럼 접두어}, employees: employee_frame() 결과 (기본값: backdata 전체)
+    명단에 없는 사번은 이름 '사번 {사번}', 나머지는 'Unknown'"""
+    if employees is None:
+        employees = get_employee_frame()
+    for column, prefix in id_columns.items():
+        right = employees.rename(columns={'employee_id': '_employee_key', **{field: prefix + field for field in EMPLOYEE_FIELDS}})
+        df = df.assign(_employee_key=_id_keys(df[column])).merge(right, how='left', on='_employee_key')
+        missing = df[prefix + 'name'].isna()
+        if missing.any():
+            df.loc[missing, prefix + 'name'] = '사번 ' + df.loc[missing, '_employee_key']
+            for field in EMPLOYEE_FIELDS[1:]:
+                df[prefix + field] = df[prefix + field].fillna('Unknown')
+        df = df.drop(columns='_employee_key')
+    return df
+
+
+def get_evaluatees(mapping_key, evaluator_id):
+    """평가자에게 배정된 피평가자 직원 레코드 목록 (배정 순서 유지, 명단에 없는 사번은 제외)"""
+    _, by_id = _employee_index()
+    evaluatees = []
+    for evaluatee_id in get_evaluatee_ids(mapping_key, evaluator_id):
+        employee = by_id.get(evaluatee_id)
+        if employee is not None:
+            evaluatees.append(employee)
+    return evaluatees
+
+
+def get_evaluation_mappings():
+    """평가 유형 키 -> 평가자-피평가자 매핑 DataFrame"""
+    mappings = {}
+    for key, path in MAPPING_FILES.items():
+        df = _table(path, key)
+        if df is None:
+            mappings[key] = _pandas().DataFrame(columns=MAPPING_COLUMNS)
+        else:
+            mappings[key] = _view(df)
+    return mappings
+
+
+def get_evaluatee_ids(mapping_key, evaluator_id):
+    """평가 유형 키와 평가자 사번으로 피평가자 사번(정규화된 문자열) tuple을 조회"""
+    by_evaluator, _ = _assignment_index(mapping_key)
+    return by_evaluator.get(normalize_id(evaluator_id), ())
+
+
+def get_evaluator_ids(mapping_key, evaluatee_id):
+    """평가 유형 키와 피평가자 사번으로 평가자 사번(정규화된 문자열) tuple을 조회"""
+    _, by_evaluatee = _assignment_index(mapping_key)
+    return by_evaluatee.get(normalize_id(evaluatee_id), ())
+
+
+def get_assignments(mapping_key):
+    """평가 유형 키의 전체 (평가자 사번, 피평가자 사번) 쌍 tuple"""
+    by_evaluator, _ = _assignment_index(mapping_key)
+    return tuple(
+        (evaluator_id, evaluatee_id)
+        for evaluator_id, evaluatee_ids in by_evaluator.items()
+        for evaluatee_id in evaluatee_ids
+    )
+
+
+def get_jikkeup():
+    """Jikkeup.csv (없거나 읽기 실패 시 None)"""
+    df = _table(JIKKEUP_FILE, 'Jikkeup')
+    if df is None:
+        return None
+    return _view(df)
+
+
+def get_version():
+    """현재 명단 상태의 버전 (세대 번호, 테이블별 원본 시그니처). 명단이 교체되면 값이 달라진다"""
+    refresh()
+    return _current_state()['version']
+
+
+def get_generation():
+    """현재 명단 상태의 세대 번호 (워커 간 공유되는 스냅샷 세대)"""
+    return _current_state()['generation']
+
+
+def clear_cache():
+    """캐시를 비워 다음 접근 시 모든 파일을 다시 읽게 한다"""
+    global _state
+    with _lock:
+        _state = None
+
+
+def compile_snapshot(extra_paths=()):
+    """모든 명단 CSV(및 extra_paths)를 새로 파싱해 스냅샷을 만든다. 생성된 테이블 목록 반환"""
+    global _state
+    paths = _default_paths()
+    for path in extra_paths:
+        paths[os.path.abspath(path)] = os.path.basename(path)
+    with _lock:
+        _state = _load_state(paths, force=True)
+        return _state['tables']
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2 or sys.argv[1] != 'compile':
+        print('사용법: python roster.py compile [추가 CSV 경로...]')
+        sys.exit(1)
+    compiled = compile_snapshot(sys.argv[2:])
+    for table_path, table in compiled.items():
+        if table['df'] is None:
+            print(f"{table_path}: 로드 실패")
+            continue
+        print(f"{table_path}: {len(table['df'])}행, encoding={table['encoding']}, dtypes={table['dtypes']}")
+    print(f"스냅샷 저장: {SNAPSHOT_PATH} (세대 {get_generation()})")
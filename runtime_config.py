@@ -0,0 +1,115 @@
+"""실행 중 설정(피평가자 제외 목록 등)을 한 번만 해석해 두는 런타임 설정
+
+코드 기본값 + config.json + 환경변수를 합쳐 frozenset으로 고정한 RuntimeConfig를 만들고,
+요청 처리 중에는 문자열 파싱 없이 집합 조회만 하도록 한다.
+관리자 엔드포인트(/admin/reload_config) 또는 SIGHUP 신호로 다시 읽을 수 있다.
+"""
+import json
+import os
+import signal
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+
+CONFIG_FILE = 'config.json'
+
+# 코드에 박힌 기본 제외 피평가자
+DEFAULT_EXCLUDED_EVALUATEE_IDS = frozenset({11160147, 11960038, 12140051})
+
+
+@dataclass(frozen=True)
+class RuntimeConfig:
+    excluded_evaluatee_ids: frozenset
+    excluded_evaluatee_names: frozenset
+    version: int
+    loaded_at: str
+
+
+_current = None
+# 신호 처리기가 락을 잡은 메인 스레드에서 실행될 수 있으므로 재진입 가능한 락 사용
+_lock = threading.RLock()
+
+
+def _parse_ids(values):
+    """사번 목록을 int 집합으로 변환 (잘못된 값은 무시)"""
+    ids = set()
+    for value in values:
+        try:
+            ids.add(int(str(value).strip()))
+        except ValueError:
+            pass
+    return ids
+
+
+def _parse_names(values):
+    return {str(value).strip() for value in values if str(value).strip()}
+
+
+def _split_env(name):
+    """콤마 구분 환경변수를 목록으로"""
+    return [part for part in os.environ.get(name, '').split(',') if part.strip()]
+
+
+def _load_config_file():
+    """config.json의 excluded_evaluatees 항목 (없거나 읽기 실패 시 빈 dict)"""
+    try:
+        with open(CONFIG_FILE, encoding='utf-8') as f:
+            return json.load(f).get('excluded_evaluatees', {})
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        print(f"{CONFIG_FILE} 로드 오류: {e}")
+        return {}
+
+
+def build_config(version):
+    """기본값 + config.json + 환경변수(EXCLUDED_EVALUATEE_IDS / EXCLUDED_EVALUATEE_NAMES)를 합친다"""
+    file_config = _load_config_file()
+    excluded_ids = (
+        set(DEFAULT_EXCLUDED_EVALUATEE_IDS)
+        | _parse_ids(file_config.get('ids', []))
+        | _parse_ids(_split_env('EXCLUDED_EVALUATEE_IDS'))
+    )
+    excluded_names = (
+        _parse_names(file_config.get('names', []))
+        | _parse_names(_split_env('EXCLUDED_EVALUATEE_NAMES'))
+    )
+    return RuntimeConfig(
+        excluded_evaluatee_ids=frozenset(excluded_ids),
+        excluded_evaluatee_names=frozenset(excluded_names),
+        version=version,
+        loaded_at=datetime.now().isoformat(),
+    )
+
+
+def get_config():
+    """현재 런타임 설정 (최초 호출 시 한 번 생성)"""
+    global _current
+    config = _current
+    if config is None:
+        with _lock:
+            if _current is None:
+                _current = build_config(1)
+            config = _current
+    return config
+
+
+def reload_config():
+    """설정을 다시 읽어 교체하고 새 설정을 반환 (진행 중인 요청은 이전 설정을 그대로 사용)"""
+    global _current
+    with _lock:
+        version = _current.version + 1 if _current is not None else 1
+        _current = build_config(version)
+        return _current
+
+
+def install_reload_signal():
+    """SIGHUP 수신 시 설정을 다시 읽는다 (지원하지 않는 플랫폼/스레드에서는 무시)"""
+    if not hasattr(signal, 'SIGHUP'):
+        return False
+    try:
+        signal.signal(signal.SIGHUP, lambda signum, frame: reload_config())
+    except ValueError:
+        # 메인 스레드가 아니면 신호 처리기를 등록할 수 없다
+        return False
+    return True
@@ -0,0 +1,57 @@
+"""평가 점수(scores) 정규화
+
+화면에서 받은 scores dict(예: {"score": 65})를 evaluation_data.score(대표 점수)와
+evaluation_scores 테이블의 항목별 점수로 나눈다. 원본 JSON은 evaluation_data.scores에 그대로 남긴다.
+사원 평가 화면은 항목 이름 뒤에 피평가자 사번을 붙여 보내므로(attitude_1_11230045) 저장할 때 떼어 내고,
+score/total 항목이 없으면 항목 점수의 합계를 대표 점수로 쓴다.
+"""
+import json
+from decimal import Decimal
+
+# 대표 점수로 쓰는 항목 (앞에 있는 것 우선)
+PRIMARY_CRITERIA = ('score', 'total')
+
+
+def to_number(value):
+    """DB에서 읽은 숫자(Decimal/float/int)를 정수면 int, 아니면 float으로. 숫자가 아니면 None"""
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float, Decimal)):
+        number = float(value)
+    else:
+        try:
+            number = float(str(value).strip())
+        except ValueError:
+            return None
+    return int(number) if number.is_integer() else number
+
+
+def criterion_name(criterion, evaluatee_id=None):
+    """항목 이름에서 '_{피평가자 사번}' 접미사를 뗀다 (attitude_1_11230045 -> attitude_1)"""
+    criterion = str(criterion)
+    if evaluatee_id is not None:
+        suffix = f'_{evaluatee_id}'
+        if criterion.endswith(suffix) and len(criterion) > len(suffix):
+            return criterion[:-len(suffix)]
+    return criterion
+
+
+def normalize_scores(scores, evaluatee_id=None):
+    """scores(dict 또는 JSON 문자열) -> (대표 점수 또는 None, {항목: 숫자 점수}). 숫자가 아닌 항목은 제외.
+    evaluatee_id를 주면 항목 이름의 사번 접미사를 떼고, 대표 점수 항목이 없으면 항목 점수 합계를 대표 점수로 한다"""
+    if isinstance(scores, str):
+        try:
+            scores = json.loads(scores) if scores else {}
+        except ValueError:
+            return None, {}
+    if not isinstance(scores, dict):
+        return None, {}
+    criteria = {}
+    for criterion, value in scores.items():
+        number = to_number(value)
+        if number is not None:
+            criteria[criterion_name(criterion, evaluatee_id)] = number
+    score = next((criteria[name] for name in PRIMARY_CRITERIA if name in criteria), None)
+    if score is None and criteria:
+        score = to_number(sum(criteria.values()))
+    return score, criteria
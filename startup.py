@@ -0,0 +1,61 @@
+"""기동 시간 측정과 무거운 모듈(pandas, psycopg2, openpyxl)의 지연 import
+
+eva.py가 가장 먼저 import하여 기준 시각을 잡고, 모듈 로드/DB 초기화/지연 import에
+걸린 시간을 기록한다. 기록은 로그로 출력되며 /health/startup에서 조회할 수 있다.
+"""
+import importlib
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+_started = time.perf_counter()
+# (항목, 소요 ms, 기동 후 경과 ms)
+_timings = []
+_lock = threading.Lock()
+
+
+def elapsed_ms():
+    """기동(이 모듈 import) 후 경과 시간 (ms)"""
+    return (time.perf_counter() - _started) * 1000
+
+
+def record(label, duration_ms):
+    """소요 시간 항목을 기록하고 로그로 출력"""
+    with _lock:
+        _timings.append((label, round(duration_ms, 1), round(elapsed_ms(), 1)))
+    print(f"[startup] {label}: {duration_ms:.1f}ms (pid {os.getpid()})")
+
+
+@contextmanager
+def timed(label):
+    """블록 실행 시간을 기록"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(label, (time.perf_counter() - started) * 1000)
+
+
+def lazy_import(name):
+    """모듈을 처음 필요할 때 import하고 걸린 시간을 기록. 이미 로드되었으면 그대로 반환"""
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    with timed(f'import {name}'):
+        return importlib.import_module(name)
+
+
+def report():
+    """기동 시간 보고서"""
+    with _lock:
+        timings = list(_timings)
+    return {
+        'pid': os.getpid(),
+        'uptime_ms': round(elapsed_ms(), 1),
+        'timings': [
+            {'label': label, 'duration_ms': duration, 'at_ms': at}
+            for label, duration, at in timings
+        ],
+    }
@@ -1,9 +1,14 @@
 from flask import Flask, render_template, request, redirect, url_for, session, flash, jsonify
 import pandas as pd
 import os
+import sys
 from datetime import datetime
 import json
 
+# 상위 디렉토리의 roster 모듈(명단 스냅샷 캐시) 사용
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import roster
+
 app = Flask(__name__)
 app.secret_key = 'your-secret-key-here'
 
@@ -14,9 +19,11 @@ def load_data():
     basedata_path = os.path.join(base_path, 'basedata.csv')
     jikkeup_path = os.path.join(base_path, 'Jikkeup.csv')
     
-    # 데이터 로드
-    basedata = pd.read_csv(basedata_path, encoding='utf-8')
-    jikkeup = pd.read_csv(jikkeup_path, encoding='utf-8')
+    # 데이터 로드 (roster 스냅샷 경유, 파일이 바뀔 때만 다시 파싱)
+    basedata = roster.load_table(basedata_path)
+    jikkeup = roster.load_table(jikkeup_path)
+    if basedata is None or jikkeup is None:
+        raise FileNotFoundError(basedata_path if basedata is None else jikkeup_path)
     
     return basedata, jikkeup
 
@@ -0,0 +1,249 @@
+"""평가 임시저장 쓰기 큐 (group commit)
+
+마감 직전처럼 임시저장 요청이 몰릴 때 요청마다 작은 트랜잭션을 커밋하지 않고,
+워커별 쓰기 스레드 하나가 FLUSH_INTERVAL_MS 동안 모인 저장을 한 트랜잭션으로 묶어 기록한다.
+같은 (평가자, 피평가자, 평가 유형)이 여러 번 들어오면 마지막 저장만 기록한다.
+
+    EVALUATION_WRITE_MODE   direct(기본): 요청 안에서 바로 저장 (이전 동작)
+                            group: 큐에 넣고 묶음 커밋이 끝날 때까지 기다린 뒤 응답 (커밋 후 응답)
+                            buffered: 큐에 넣자마자 응답 (커밋 전 응답, 워커 비정상 종료 시 유실 가능)
+    WRITE_FLUSH_INTERVAL_MS 묶음을 모으는 시간 (기본값: 5)
+    WRITE_MAX_BATCH         한 트랜잭션에 기록할 최대 저장 요청 수 (기본값: 500)
+    WRITE_MAX_PENDING       대기 중인 저장 요청이 이만큼 쌓이면 큐를 거치지 않고 바로 저장 (기본값: 10000)
+
+묶음 기록이 실패하면 요청별로 다시 기록해 실패한 요청만 오류로 돌려준다.
+프로세스 종료 시(atexit, Gunicorn worker_exit) 남은 저장을 모두 기록한다.
+"""
+import atexit
+import os
+import threading
+import time
+
+WRITE_MODES = ('direct', 'group', 'buffered')
+WRITE_MODE = os.environ.get('EVALUATION_WRITE_MODE', 'direct').lower()
+if WRITE_MODE not in WRITE_MODES:
+    WRITE_MODE = 'direct'
+FLUSH_INTERVAL_MS = float(os.environ.get('WRITE_FLUSH_INTERVAL_MS', '5'))
+MAX_BATCH = max(1, int(os.environ.get('WRITE_MAX_BATCH', '500')))
+MAX_PENDING = max(1, int(os.environ.get('WRITE_MAX_PENDING', '10000')))
+# group 모드에서 요청이 기록 완료를 기다리는 최대 시간(초)
+WAIT_TIMEOUT = 30
+
+
+class _Pending:
+    """큐에 들어간 저장 요청 하나"""
+    __slots__ = ('rows', 'done', 'error')
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.done = threading.Event()
+        self.error = None
+
+
+_cond = threading.Condition()
+_queue = []
+_writer = None
+_write_rows = None
+_stopping = False
+# 큐에 넣은 요청 수 / 기록을 마친 요청 수 (flush 대기 기준)
+_enqueued = 0
+_completed = 0
+_stats = {
+    'batches': 0,
+    'requests': 0,
+    'rows': 0,
+    'merged_rows': 0,
+    'batch_failures': 0,
+    'failed_requests': 0,
+    'direct_writes': 0,
+}
+
+
+def _reset_after_fork():
+    """fork된 자식은 부모의 큐와 쓰기 스레드를 이어받지 않는다 (부모가 기록한다)"""
+    global _cond, _queue, _writer, _stopping, _enqueued, _completed
+    _cond = threading.Condition()
+    _queue = []
+    _writer = None
+    _stopping = False
+    _enqueued = 0
+    _completed = 0
+    for key in _stats:
+        _stats[key] = 0
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def configure(write_rows):
+    """실제로 DB에 기록하는 함수 등록: write_rows(rows)는 rows를 한 트랜잭션으로 저장"""
+    global _write_rows
+    _write_rows = write_rows
+
+
+def _row_key(row):
+    evaluator_id, evaluatee_id, evaluation_type = row[:3]
+    return (str(evaluator_id), str(evaluatee_id), evaluation_type)
+
+
+def _merge(batch):
+    """같은 (평가자, 피평가자, 평가 유형)은 마지막 저장만 남긴다"""
+    merged = {}
+    for pending in batch:
+        for row in pending.rows:
+            key = _row_key(row)
+            merged.pop(key, None)
+            merged[key] = row
+    return list(merged.values())
+
+
+def _write_batch(batch):
+    """묶음을 한 트랜잭션으로 기록. 실패하면 요청별로 다시 기록해 실패한 요청만 표시"""
+    rows = _merge(batch)
+    try:
+        _write_rows(rows)
+    except Exception as e:
+        print(f"[write-queue] 묶음 저장 실패, 요청별로 다시 저장: {e}")
+        failed = 0
+        for pending in batch:
+            try:
+                _write_rows(pending.rows)
+            except Exception as row_error:
+                pending.error = row_error
+                failed += 1
+                print(f"[write-queue] 저장 실패 ({len(pending.rows)}건): {row_error}")
+        with _cond:
+            _stats['batch_failures'] += 1
+            _stats['failed_requests'] += failed
+    with _cond:
+        _stats['batches'] += 1
+        _stats['requests'] += len(batch)
+        _stats['rows'] += sum(len(pending.rows) for pending in batch)
+        _stats['merged_rows'] += len(rows)
+
+
+def _take_batch():
+    # _cond를 잡은 상태에서 호출
+    global _queue
+    batch, _queue = _queue[:MAX_BATCH], _queue[MAX_BATCH:]
+    return batch
+
+
+def _finish(batch):
+    global _completed
+    for pending in batch:
+        pending.done.set()
+    with _cond:
+        _completed += len(batch)
+        _cond.notify_all()
+
+
+def _writer_loop():
+    while True:
+        with _cond:
+            while not _queue and not _stopping:
+                _cond.wait()
+            if not _queue and _stopping:
+                return
+            # 첫 요청이 들어온 뒤 잠시 기다려 함께 기록할 요청을 모은다
+            deadline = time.monotonic() + FLUSH_INTERVAL_MS / 1000
+            while len(_queue) < MAX_BATCH and not _stopping:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                _cond.wait(remaining)
+            batch = _take_batch()
+        try:
+            _write_batch(batch)
+        finally:
+            _finish(batch)
+
+
+def _ensure_writer():
+    # _cond를 잡은 상태에서 호출
+    global _writer
+    if _writer is None or not _writer.is_alive():
+        _writer = threading.Thread(target=_writer_loop, name='evaluation-write-queue', daemon=True)
+        _writer.start()
+
+
+def submit(rows):
+    """평가 저장 요청. direct 모드이거나 큐가 가득 차면 바로 저장하고,
+    group 모드는 기록이 끝날 때까지 기다리며 buffered 모드는 바로 반환한다. 저장 실패 시 예외"""
+    global _enqueued
+    rows = list(rows)
+    if not rows:
+        return 0
+    with _cond:
+        direct = WRITE_MODE == 'direct' or _stopping or len(_queue) >= MAX_PENDING
+        if direct:
+            _stats['direct_writes'] += 1
+        else:
+            pending = _Pending(rows)
+            _queue.append(pending)
+            _enqueued += 1
+            _ensure_writer()
+            _cond.notify_all()
+    if direct:
+        _write_rows(rows)
+        return len(rows)
+    if WRITE_MODE == 'group':
+        if not pending.done.wait(WAIT_TIMEOUT):
+            raise RuntimeError(f'평가 저장 대기 시간 초과 ({WAIT_TIMEOUT}초)')
+        if pending.error is not None:
+            raise pending.error
+    return len(rows)
+
+
+def flush(timeout=WAIT_TIMEOUT):
+    """지금까지 큐에 들어온 저장이 모두 기록될 때까지 대기 (최종제출/조회 전에 호출). 모두 기록되면 True"""
+    with _cond:
+        target = _enqueued
+        if _completed >= target:
+            return True
+        if _writer is None or not _writer.is_alive():
+            # 쓰기 스레드가 없으면 (종료 중 등) 호출한 스레드에서 직접 기록
+            batches = []
+            while _queue:
+                batches.append(_take_batch())
+        else:
+            batches = None
+    if batches is not None:
+        for batch in batches:
+            try:
+                _write_batch(batch)
+            finally:
+                _finish(batch)
+    with _cond:
+        return _cond.wait_for(lambda: _completed >= target, timeout)
+
+
+def shutdown():
+    """남은 저장을 모두 기록하고 쓰기 스레드를 종료"""
+    global _stopping
+    with _cond:
+        if not _queue and _writer is None:
+            return
+        _stopping = True
+        _cond.notify_all()
+        writer = _writer
+    if writer is not None and writer.is_alive():
+        writer.join(WAIT_TIMEOUT)
+    flush()
+
+
+atexit.register(shutdown)
+
+
+def stats():
+    """쓰기 큐 현황 (워커 기준)"""
+    with _cond:
+        result = dict(_stats)
+        result['pending'] = len(_queue)
+    result['mode'] = WRITE_MODE
+    result['flush_interval_ms'] = FLUSH_INTERVAL_MS
+    result['max_batch'] = MAX_BATCH
+    result['average_batch'] = round(result['requests'] / result['batches'], 1) if result['batches'] else 0
+    result['pid'] = os.getpid()
+    return result